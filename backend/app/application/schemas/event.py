@@ -3,6 +3,7 @@ from typing import Any, Union, Literal, Dict, Optional, List
 import time
 import logging
 from app.domain.models.plan import ExecutionStatus
+from app.domain.models.usage import TokenUsage
 
 
 class BaseData(BaseModel):
@@ -26,6 +27,18 @@ class StepData(BaseData):
 
 class PlanData(BaseData):
     steps: List[StepData]
+    # Plan version in the stream, set when plan deltas are requested
+    version: Optional[int] = None
+
+class PlanStepChange(BaseModel):
+    op: Literal["add", "remove", "status", "description"]
+    id: str
+    status: Optional[ExecutionStatus] = None
+    description: Optional[str] = None
+
+class PlanDeltaData(BaseData):
+    version: int
+    changes: List[PlanStepChange]
 
 class ErrorData(BaseData):
     error: str
@@ -33,9 +46,25 @@ class ErrorData(BaseData):
 class TitleData(BaseData):
     title: str
 
+class DoneData(BaseData):
+    # Token usage of the agent so far
+    usage: Optional[TokenUsage] = None
+
 class SSEEvent(BaseModel):
     event: str
     data: Optional[Union[str, BaseData]]
+    # Agent event ID, used by clients to resume with Last-Event-ID
+    id: Optional[str] = None
+
+    def data_json(self) -> Optional[str]:
+        """Serialize data to JSON
+        
+        Data built from domain objects is not validated, so it is always dumped by pydantic,
+        which applies field serializers, aliases and exclusions.
+        """
+        if self.data is None or isinstance(self.data, str):
+            return self.data
+        return self.data.model_dump_json()
 
 class MessageSSEEvent(SSEEvent):
     event: Literal["message"] = "message"
@@ -47,7 +76,7 @@ class ToolSSEEvent(SSEEvent):
 
 class DoneSSEEvent(SSEEvent):
     event: Literal["done"] = "done"
-    data: BaseData
+    data: DoneData
 
 class ErrorSSEEvent(SSEEvent):
     event: Literal["error"] = "error"
@@ -64,3 +93,7 @@ class TitleSSEEvent(SSEEvent):
 class PlanSSEEvent(SSEEvent):
     event: Literal["plan"] = "plan"
     data: PlanData
+
+class PlanDeltaSSEEvent(SSEEvent):
+    event: Literal["plan_delta"] = "plan_delta"
+    data: PlanDeltaData
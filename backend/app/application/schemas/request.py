@@ -3,6 +3,8 @@ from pydantic import BaseModel
 class ChatRequest(BaseModel):
     timestamp: int
     message: str
+    # Receive plan changes as plan_delta events instead of full plan snapshots
+    plan_delta: bool = False
 
 class FileViewRequest(BaseModel):
     file: str
@@ -1,5 +1,6 @@
-from typing import Any, Generic, Optional, TypeVar, List
+from typing import Any, Dict, Generic, Optional, TypeVar, List
 from pydantic import BaseModel
+from app.domain.models.usage import TokenUsage
 
 
 T = TypeVar('T')
@@ -38,3 +39,21 @@ class ShellViewResponse(BaseModel):
 class FileViewResponse(BaseModel):
     content: str
     file: str
+
+class SandboxStatsResponse(BaseModel):
+    cpu_usage_seconds: float
+    cpu_percent: Optional[float] = None
+    cpu_limit: Optional[float] = None
+    memory_used_bytes: int
+    memory_limit_bytes: Optional[int] = None
+    disk_used_bytes: int
+    disk_total_bytes: int
+    process_count: int
+    pids_limit: Optional[int] = None
+
+class AgentUsageResponse(BaseModel):
+    agent_id: str
+    total: TokenUsage
+    by_call_site: Dict[str, TokenUsage]
+    # Steps of the current plan by step ID
+    by_step: Dict[str, TokenUsage]
@@ -1,4 +1,9 @@
-from typing import AsyncGenerator, Dict, Any, Optional, Generator
+from typing import AsyncGenerator, AsyncIterator, Dict, Any, Optional, Generator, Set
+from contextlib import asynccontextmanager
+import os
+import uuid
+import socket
+import asyncio
 import logging
 
 from app.application.schemas.event import (
@@ -7,13 +12,22 @@ from app.application.schemas.event import (
     ToolData, ToolSSEEvent,
     StepSSEEvent, ErrorSSEEvent,
     TitleData, TitleSSEEvent,
-    BaseData,
+    DoneData,
     StepData, ErrorData,
-    PlanData, PlanSSEEvent
+    PlanSSEEvent
 )
-from app.application.schemas.response import ShellViewResponse, FileViewResponse
+from app.application.schemas.response import ShellViewResponse, FileViewResponse, SandboxStatsResponse, AgentUsageResponse
+from app.application.services.plan_delta import PlanDeltaEncoder, plan_to_data
 from app.domain.models.agent import Agent
 from app.domain.services.agent import AgentDomainService
+from app.domain.services.flows.update_policy import create_plan_update_policy, PlanUpdatePolicy
+from app.domain.services.agents.output_budget import ToolOutputBudget
+from app.domain.services.agents.compaction import MemoryCompaction
+from app.domain.external.checkpoint import CheckpointStore
+from app.domain.external.sandbox import Sandbox
+from app.domain.external.registry import AgentRegistry
+from app.domain.external.event_bus import EventBus
+from app.domain.models.cluster import AgentRegistration, AgentCommand
 from app.domain.models.event import (
     PlanCreatedEvent,
     ToolCallingEvent,
@@ -28,21 +42,57 @@ from app.domain.models.event import (
     DoneEvent
 )
 from app.application.schemas.exceptions import NotFoundError
-from app.infrastructure.external.llm.openai_llm import OpenAILLM
+from app.infrastructure.external.llm.router import OpenAILLMRouter
+from app.infrastructure.external.llm.scripted_llm import LLMScript, ScriptedLLMRouter
+from app.domain.external.llm import LLMRouter
+from app.domain.external.browser import Browser
+from app.domain.models.llm import LLMCallSite
 from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.infrastructure.external.sandbox.fake_sandbox import FakeSandbox
 from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+from app.infrastructure.external.browser.fake_browser import FakeBrowser
 from app.infrastructure.external.search.google_search import GoogleSearchEngine
+from app.infrastructure.external.checkpoint.sqlite_checkpoint_store import SQLiteCheckpointStore
+from app.infrastructure.external.cluster.local_cluster import LocalAgentRegistry, LocalEventBus
 from app.infrastructure.config import get_settings
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
 class AgentService:
-    def __init__(self):
+    def __init__(self, agent_registry: Optional[AgentRegistry] = None, event_bus: Optional[EventBus] = None,
+                 worker_id: Optional[str] = None):
+        """Initialize agent service
+        
+        Args:
+            agent_registry: Registry of agent owners, created from configuration if not provided
+            event_bus: Bus between workers, created from configuration if not provided
+            worker_id: ID of this worker, defaults to the configured ID or hostname and process ID
+        """
         logger.info("Initializing AgentService")
-        self.agent_domain_service = AgentDomainService()  # Single domain service instance
         self.settings = get_settings()
-        self.llm = OpenAILLM()
+        self.worker_id = worker_id or self.settings.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        if agent_registry is None or event_bus is None:
+            default_registry, default_bus = self._create_cluster()
+            agent_registry = agent_registry or default_registry
+            event_bus = event_bus or default_bus
+        self.agent_registry: AgentRegistry = agent_registry
+        self.event_bus: EventBus = event_bus
+        self._cluster_tasks: Set[asyncio.Task] = set()
+        # Agents being evicted, already unregistered, their registration must not be refreshed
+        self._evicting: Set[str] = set()
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        if self.settings.checkpoint_store == "sqlite":
+            self.checkpoint_store = SQLiteCheckpointStore(self.settings.checkpoint_sqlite_path)
+        # Single domain service instance
+        self.agent_domain_service = AgentDomainService(
+            self.checkpoint_store,
+            self.settings.event_log_size,
+            self.settings.event_backpressure_threshold
+        )
+        self.llm_router = self._create_llm_router()
+        # Sandbox implementation, providing create, attach and from_state
+        self.sandbox_cls = FakeSandbox if self.settings.sandbox_provider == "fake" else DockerSandbox
         self.search_engine: Optional[GoogleSearchEngine] = None
         
         # Initialize search engine only if both API key and engine ID are set
@@ -55,30 +105,257 @@ class AgentService:
         else:
             logger.warning("Google Search Engine not initialized: missing API key or engine ID")
 
+    def _create_cluster(self) -> tuple[AgentRegistry, EventBus]:
+        if self.settings.cluster_backend == "redis":
+            # Imported here so single worker deployments do not need redis
+            from redis.asyncio import Redis
+            from app.infrastructure.external.cluster.redis_cluster import RedisAgentRegistry, RedisEventBus
+            logger.info(f"Using redis cluster backend at {self.settings.redis_url}")
+            redis = Redis.from_url(self.settings.redis_url)
+            return RedisAgentRegistry(redis, ttl=self.settings.agent_registration_ttl), RedisEventBus(redis)
+        return LocalAgentRegistry(), LocalEventBus()
+
+    def _create_llm_router(self) -> LLMRouter:
+        if self.settings.llm_provider == "scripted":
+            logger.warning("Using the scripted LLM, agents will not call a model")
+            return ScriptedLLMRouter(LLMScript(steps=self.settings.stub_plan_steps, latency=self.settings.stub_llm_latency))
+        return OpenAILLMRouter()
+
+    def _create_browser(self, sandbox: Sandbox) -> Browser:
+        if self.settings.sandbox_provider == "fake":
+            return FakeBrowser(latency=self.settings.stub_sandbox_latency)
+        return PlaywrightBrowser(self.llm_router.get_llm(LLMCallSite.BROWSER_EXTRACTOR), sandbox.get_cdp_url())
+
+    async def start(self) -> None:
+        """Start serving commands from other workers and restore checkpointed agents"""
+        logger.info(f"Starting agent service worker {self.worker_id}")
+        self._spawn(self._serve_commands())
+        self._spawn(self._refresh_registrations())
+        self._spawn(self._manage_lifecycle())
+        await self.restore_agents()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        # Keep a reference so background tasks are not garbage collected
+        task = asyncio.create_task(coro)
+        self._cluster_tasks.add(task)
+        task.add_done_callback(self._cluster_tasks.discard)
+        return task
+
+    async def _serve_commands(self) -> None:
+        """Execute commands handed over by other workers for agents owned by this worker"""
+        try:
+            async with self.event_bus.subscribe_commands(self.worker_id) as commands:
+                async for command in commands:
+                    logger.debug(f"Worker {self.worker_id} received {command.type} command for agent {command.agent_id}")
+                    if command.type == "chat":
+                        self._spawn(self._serve_chat(command))
+                    elif command.type == "close":
+                        self._spawn(self.destroy_agent(command.agent_id))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception(f"Worker {self.worker_id} stopped serving commands: {str(e)}")
+
+    async def _serve_chat(self, command: AgentCommand) -> None:
+        """Run a chat forwarded by another worker and publish its events on the bus"""
+        events = self.agent_domain_service.chat(command.agent_id, command.message, command.timestamp, command.last_event_id)
+        async for event in events:
+            await self.event_bus.publish_event(command.reply_to, event)
+
+    async def _refresh_registrations(self) -> None:
+        """Keep the registrations of agents owned by this worker alive"""
+        interval = max(1, self.settings.agent_registration_ttl // 3)
+        while True:
+            await asyncio.sleep(interval)
+            for agent_id in self.agent_domain_service.get_agent_ids():
+                if agent_id in self._evicting:
+                    continue
+                try:
+                    sandbox = self.agent_domain_service.get_sandbox(agent_id)
+                    if not await self.agent_registry.refresh(self._registration(agent_id, sandbox)):
+                        # The registration expired and another worker restored the agent, it must run only there
+                        logger.warning(f"Agent {agent_id} was taken over by another worker, dropping it")
+                        await self.agent_domain_service.drop_agent(agent_id)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh registration of agent {agent_id}: {str(e)}")
+
+    async def _manage_lifecycle(self) -> None:
+        """Keep sandboxes of active agents alive and evict agents that have been idle for too long"""
+        interval = self.settings.agent_lifecycle_interval
+        while True:
+            await asyncio.sleep(interval)
+            # A failed check must not end the task, nothing would restart it
+            try:
+                # Agents active since the last check postpone the sandbox's own shutdown timer
+                for agent_id in self.agent_domain_service.get_active_agent_ids(interval):
+                    sandbox = self.agent_domain_service.get_sandbox(agent_id)
+                    try:
+                        await sandbox.extend_timeout(self.settings.sandbox_ttl_minutes)
+                    except Exception as e:
+                        logger.warning(f"Failed to extend sandbox timeout of agent {agent_id}: {str(e)}")
+                if self.settings.agent_idle_timeout:
+                    for agent_id in self.agent_domain_service.get_idle_agent_ids(self.settings.agent_idle_timeout):
+                        await self._evict_agent(agent_id)
+                if self.settings.agent_evict_memory_ratio:
+                    await self._evict_memory_heavy_agents(interval)
+            except Exception as e:
+                logger.exception(f"Failed to manage agent lifecycle: {str(e)}")
+
+    async def _evict_memory_heavy_agents(self, idle_seconds: float) -> None:
+        """Evict idle agents whose sandbox holds most of its memory limit, to free their host early"""
+        agent_ids = self.agent_domain_service.get_idle_agent_ids(idle_seconds)
+        sandboxes = [self.agent_domain_service.get_sandbox(agent_id) for agent_id in agent_ids]
+        results = await asyncio.gather(*(sandbox.get_stats() for sandbox in sandboxes), return_exceptions=True)
+        for agent_id, result in zip(agent_ids, results):
+            if isinstance(result, Exception) or not result.success:
+                continue
+            try:
+                stats = SandboxStatsResponse(**result.data)
+                if not stats.memory_limit_bytes:
+                    continue
+                usage = stats.memory_used_bytes / stats.memory_limit_bytes
+                if usage >= self.settings.agent_evict_memory_ratio:
+                    logger.info(f"Idle agent {agent_id} uses {usage:.0%} of its sandbox memory limit")
+                    await self._evict_agent(agent_id)
+            except Exception as e:
+                logger.exception(f"Failed to check sandbox memory of agent {agent_id}: {str(e)}")
+
+    async def _evict_agent(self, agent_id: str) -> None:
+        """Release an idle Agent
+        
+        With a checkpoint store the Agent is checkpointed and its sandbox is left to shut down by its own
+        timer, so the Agent can still be restored on its next request until then. Otherwise the Agent and
+        its sandbox are destroyed.
+        """
+        logger.info(f"Evicting idle agent {agent_id}")
+        self._evicting.add(agent_id)
+        try:
+            await self.agent_registry.unregister(agent_id)
+            if self.checkpoint_store:
+                await self.agent_domain_service.detach_agent(agent_id)
+            else:
+                await self.agent_domain_service.close_agent(agent_id)
+        except Exception as e:
+            logger.exception(f"Failed to evict agent {agent_id}: {str(e)}")
+        finally:
+            self._evicting.discard(agent_id)
+
+    def _registration(self, agent_id: str, sandbox: Sandbox) -> AgentRegistration:
+        return AgentRegistration(agent_id=agent_id, worker_id=self.worker_id, sandbox=sandbox.get_state())
+
+    async def _register(self, agent_id: str, sandbox: Sandbox) -> bool:
+        return await self.agent_registry.register(self._registration(agent_id, sandbox))
+
     async def create_agent(self) -> Agent:
         logger.info("Creating new agent")
         # Create a new Docker container as sandbox
-        sandbox = await DockerSandbox.create()
+        sandbox = await self.sandbox_cls.create()
         cdp_url = sandbox.get_cdp_url()
         logger.info(f"Created sandbox with CDP URL: {cdp_url}")
         
-        self.browser = PlaywrightBrowser(self.llm, cdp_url)
-        logger.info("Initialized Playwright browser")
+        self.browser = self._create_browser(sandbox)
+        logger.info(f"Initialized {type(self.browser).__name__}")
         
         # Create and initialize Agent and its resources
         agent = self.agent_domain_service.create_agent(
             model_name=self.settings.model_name,
-            llm=self.llm, 
+            llm_router=self.llm_router, 
             sandbox=sandbox, 
             browser=self.browser, 
             search_engine=self.search_engine,
             temperature=self.settings.temperature,  # Get temperature parameter from configuration
-            max_tokens=self.settings.max_tokens     # Get max tokens from configuration
+            max_tokens=self.settings.max_tokens,    # Get max tokens from configuration
+            plan_update_policy=self._create_plan_update_policy(),
+            max_parallel_steps=self.settings.max_parallel_steps,
+            tool_output_budget=self._create_tool_output_budget(),
+            memory_compaction=self._create_memory_compaction(),
+            step_scoped_memory=self.settings.execution_memory == "step"
         )
         
+        await self._register(agent.id, sandbox)
         logger.info(f"Agent created successfully with ID: {agent.id}")
         return agent
 
+    def _create_plan_update_policy(self) -> PlanUpdatePolicy:
+        return create_plan_update_policy(
+            self.settings.plan_update_policy,
+            interval=self.settings.plan_update_interval,
+            max_result_length=self.settings.plan_update_result_length
+        )
+
+    def _create_tool_output_budget(self) -> Optional[ToolOutputBudget]:
+        if not self.settings.tool_output_budget and not self.settings.tool_output_budgets:
+            return None
+        return ToolOutputBudget(
+            default_chars=self.settings.tool_output_budget,
+            tool_chars=self.settings.tool_output_budgets
+        )
+
+    def _create_memory_compaction(self) -> Optional[MemoryCompaction]:
+        if self.settings.memory_compaction == "off":
+            return None
+        return MemoryCompaction(
+            max_chars=self.settings.memory_compaction_threshold,
+            keep_steps=self.settings.memory_compaction_keep_steps,
+            summarizer=self.settings.memory_compaction
+        )
+
+    async def restore_agents(self) -> None:
+        """Restore checkpointed Agents whose sandboxes are still running"""
+        if not self.checkpoint_store:
+            return
+        agent_ids = await self.checkpoint_store.list_agent_ids()
+        logger.info(f"Restoring {len(agent_ids)} agents from checkpoints")
+        for agent_id in agent_ids:
+            await self._restore_agent(agent_id)
+
+    async def _restore_agent(self, agent_id: str) -> bool:
+        """Restore a checkpointed Agent if its sandbox is still running
+        
+        Returns:
+            Whether the Agent is now owned by this worker
+        """
+        try:
+            checkpoint = await self.checkpoint_store.load(agent_id)
+            if not checkpoint:
+                return False
+            sandbox = await self.sandbox_cls.attach(checkpoint.sandbox)
+            if not sandbox:
+                logger.warning(f"Sandbox of agent {agent_id} is gone, dropping its checkpoint")
+                await self.checkpoint_store.delete(agent_id)
+                return False
+            if not await self._register(agent_id, sandbox):
+                # Another worker sharing the checkpoint store, or a concurrent request, restored it first
+                logger.info(f"Agent {agent_id} is already owned by another worker")
+                await sandbox.close()
+                return self.agent_domain_service.has_agent(agent_id)
+            browser = self._create_browser(sandbox)
+            self.agent_domain_service.restore_agent(
+                checkpoint=checkpoint,
+                llm_router=self.llm_router,
+                sandbox=sandbox,
+                browser=browser,
+                search_engine=self.search_engine,
+                plan_update_policy=self._create_plan_update_policy(),
+                max_parallel_steps=self.settings.max_parallel_steps,
+                tool_output_budget=self._create_tool_output_budget(),
+                memory_compaction=self._create_memory_compaction(),
+                step_scoped_memory=self.settings.execution_memory == "step"
+            )
+            logger.info(f"Agent restored successfully with ID: {agent_id}")
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to restore agent {agent_id}: {str(e)}")
+            return False
+
+    async def _ensure_reachable(self, agent_id: str) -> None:
+        """Restore an Agent evicted after being idle when no worker owns it anymore"""
+        if self.agent_domain_service.has_agent(agent_id) or not self.checkpoint_store:
+            return
+        if await self.agent_registry.get(agent_id):
+            return
+        await self._restore_agent(agent_id)
+
     async def get_agent(self, agent_id: str) -> Optional[Agent]:
         logger.info(f"Retrieving agent with ID: {agent_id}")
         # Use domain service method to get the Agent
@@ -89,21 +366,20 @@ class AgentService:
             logger.warning(f"Agent not found: {agent_id}")
         return agent
 
-    def _to_sse_event(self, event: AgentEvent) -> Generator[SSEEvent, None, None]:
+    @staticmethod
+    def _to_sse_event(event: AgentEvent, plan_encoder: Optional[PlanDeltaEncoder] = None) -> Generator[SSEEvent, None, None]:
         if isinstance(event, (PlanCreatedEvent, PlanUpdatedEvent, PlanCompletedEvent)):
             if isinstance(event, PlanCreatedEvent):
                 if event.plan.title:
-                    yield TitleSSEEvent(data=TitleData(title=event.plan.title))
-                yield MessageSSEEvent(data=MessageData(content=event.plan.message))
-            if len(event.plan.steps) > 0:
-                yield PlanSSEEvent(data=PlanData(steps=[StepData(
-                    status=step.status,
-                    id=step.id, 
-                    description=step.description
-                ) for step in event.plan.steps]))
+                    yield TitleSSEEvent(data=TitleData.model_construct(title=event.plan.title))
+                yield MessageSSEEvent(data=MessageData.model_construct(content=event.plan.message))
+            if len(event.plan.steps) > 0 and plan_encoder:
+                yield from plan_encoder.encode(event.plan)
+            elif len(event.plan.steps) > 0:
+                yield PlanSSEEvent(data=plan_to_data(event.plan))
         elif isinstance(event, ToolCallingEvent):
             if event.tool_name in ["browser", "file", "shell", "message"]:
-                yield ToolSSEEvent(data=ToolData(
+                yield ToolSSEEvent(data=ToolData.model_construct(
                     name=event.tool_name,
                     status="calling",
                     function=event.function_name,
@@ -111,7 +387,7 @@ class AgentService:
                 ))
         elif isinstance(event, ToolCalledEvent):
             if event.tool_name in ["search"]:
-                yield ToolSSEEvent(data=ToolData(
+                yield ToolSSEEvent(data=ToolData.model_construct(
                     name=event.tool_name,
                     function=event.function_name,
                     args=event.function_args,
@@ -119,28 +395,102 @@ class AgentService:
                     result=event.function_result
                 ))
         elif isinstance(event, (StepStartedEvent, StepCompletedEvent, StepFailedEvent)):
-            yield StepSSEEvent(data=StepData(
+            yield StepSSEEvent(data=StepData.model_construct(
                 status=event.step.status,
                 id=event.step.id,
                 description=event.step.description
             ))
             if event.step.error:
-                yield ErrorSSEEvent(data=ErrorData(error=event.step.error))
+                yield ErrorSSEEvent(data=ErrorData.model_construct(error=event.step.error))
             if event.step.result:
-                yield MessageSSEEvent(data=MessageData(content=event.step.result))
+                yield MessageSSEEvent(data=MessageData.model_construct(content=event.step.result))
         elif isinstance(event, DoneEvent):
-            yield DoneSSEEvent(data=BaseData())
+            yield DoneSSEEvent(data=DoneData.model_construct(usage=event.usage))
         elif isinstance(event, ErrorEvent):
-            yield ErrorSSEEvent(data=ErrorData(error=event.error))
+            yield ErrorSSEEvent(data=ErrorData.model_construct(error=event.error))
 
-    async def chat(self, agent_id: str, message: str, timestamp: int) -> AsyncGenerator[SSEEvent, None]:
+    async def chat(self, agent_id: str, message: str, timestamp: int,
+                   last_event_id: Optional[int] = None, plan_delta: bool = False) -> AsyncGenerator[SSEEvent, None]:
+        """Chat with an Agent and stream its events as SSE events
+        
+        Args:
+            agent_id: Agent ID
+            message: User message
+            timestamp: Message timestamp, used to ignore a resent message
+            last_event_id: Resume after this event ID
+            plan_delta: Send plan changes as deltas after a first full plan snapshot
+        """
         logger.info(f"Starting chat with agent {agent_id}: {message[:50]}...")
-        # Directly use the domain service's chat method, which will check if the agent exists
-        async for event in self.agent_domain_service.chat(agent_id, message, timestamp):
+        plan_encoder = PlanDeltaEncoder() if plan_delta else None
+        await self._ensure_reachable(agent_id)
+        if self.agent_domain_service.has_agent(agent_id):
+            # Directly use the domain service's chat method for agents owned by this worker
+            events = self.agent_domain_service.chat(agent_id, message, timestamp, last_event_id)
+        else:
+            events = self._forward_chat(agent_id, message, timestamp, last_event_id)
+        async for event in events:
             logger.debug(f"Received event: {event}")
-            for sse_event in self._to_sse_event(event):
+            sse_events = list(self._to_sse_event(event, plan_encoder))
+            if sse_events and event.id is not None:
+                # Only the last SSE event carries the ID, so a client resumes after all of them
+                sse_events[-1].id = str(event.id)
+            for sse_event in sse_events:
                 yield sse_event
 
+    async def _forward_chat(self, agent_id: str, message: str, timestamp: int,
+                            last_event_id: Optional[int] = None) -> AsyncGenerator[AgentEvent, None]:
+        """Hand a chat over to the worker owning the agent and stream its events back"""
+        registration = await self.agent_registry.get(agent_id)
+        if not registration:
+            logger.warning(f"Attempted to chat with non-existent Agent {agent_id}")
+            yield ErrorEvent(error="Agent not initialized")
+            return
+        logger.info(f"Forwarding chat with agent {agent_id} to worker {registration.worker_id}")
+        # Each forwarded chat gets its own event stream, subscribed before sending the command so no event is missed
+        stream_id = uuid.uuid4().hex
+        async with self.event_bus.subscribe_events(stream_id) as events:
+            await self.event_bus.send_command(registration.worker_id, AgentCommand(
+                type="chat",
+                agent_id=agent_id,
+                message=message,
+                timestamp=timestamp,
+                last_event_id=last_event_id,
+                reply_to=stream_id
+            ))
+            # Check the owning worker is still alive whenever it stays silent for a registration TTL
+            check_interval = max(1, self.settings.agent_registration_ttl)
+            forward_timeout = self.settings.agent_forward_timeout
+            silent = 0
+            next_event = asyncio.ensure_future(events.__anext__())
+            try:
+                while True:
+                    # Waiting does not cancel the pending read, so no event is lost on a timeout
+                    done, _ = await asyncio.wait({next_event}, timeout=check_interval)
+                    if not done:
+                        silent += check_interval
+                        error = None
+                        current = await self.agent_registry.get(agent_id)
+                        if not current or current.worker_id != registration.worker_id:
+                            error = f"Worker {registration.worker_id} owning the agent stopped responding"
+                        elif forward_timeout and silent >= forward_timeout:
+                            error = f"No events from worker {registration.worker_id} for {silent}s"
+                        if error:
+                            logger.warning(f"Ending forwarded chat with agent {agent_id}: {error}")
+                            yield ErrorEvent(error=error)
+                            return
+                        continue
+                    try:
+                        event = next_event.result()
+                    except StopAsyncIteration:
+                        return
+                    silent = 0
+                    yield event
+                    if isinstance(event, DoneEvent):
+                        break
+                    next_event = asyncio.ensure_future(events.__anext__())
+            finally:
+                next_event.cancel()
+
     async def destroy_agent(self, agent_id: str) -> bool:
         """Destroy the specified Agent and its associated sandbox
         
@@ -152,8 +502,18 @@ class AgentService:
         """
         logger.info(f"Attempting to destroy agent: {agent_id}")
         try:
+            if not self.agent_domain_service.has_agent(agent_id):
+                registration = await self.agent_registry.get(agent_id)
+                if not registration or registration.worker_id == self.worker_id:
+                    logger.warning(f"Failed to destroy agent: {agent_id}")
+                    return False
+                # The owning worker destroys the agent and its sandbox
+                await self.event_bus.send_command(registration.worker_id, AgentCommand(type="close", agent_id=agent_id))
+                logger.info(f"Handed destruction of agent {agent_id} over to worker {registration.worker_id}")
+                return True
             # Destroy Agent resources through the domain service
             result = await self.agent_domain_service.close_agent(agent_id)
+            await self.agent_registry.unregister(agent_id)
             if result:
                 logger.info(f"Agent destroyed successfully: {agent_id}")
             else:
@@ -164,13 +524,25 @@ class AgentService:
             return False
 
     async def close(self):
+        for task in list(self._cluster_tasks):
+            task.cancel()
+        # Release ownership so other workers can restore or report the agents
+        for agent_id in self.agent_domain_service.get_agent_ids():
+            await self.agent_registry.unregister(agent_id)
+        if self.checkpoint_store:
+            # Keep sandboxes running so the agents can be restored by the next process
+            logger.info("Checkpointing and detaching all agents")
+            await self.agent_domain_service.detach_all()
+            await self.checkpoint_store.close()
+            logger.info("All agents detached successfully")
+            return
         logger.info("Closing all agents and cleaning up resources")
         # Clean up all Agents and their associated sandboxes
         await self.agent_domain_service.close_all()
         logger.info("All agents closed successfully")
 
     async def agent_exists(self, agent_id: str) -> bool:
-        """Check if an Agent exists
+        """Check if an Agent exists on any worker
         
         Args:
             agent_id: Agent ID
@@ -178,8 +550,37 @@ class AgentService:
         Returns:
             bool: Returns True if the Agent exists, False otherwise
         """
-        agent = self.agent_domain_service.get_agent(agent_id)
-        return agent is not None
+        await self._ensure_reachable(agent_id)
+        if self.agent_domain_service.has_agent(agent_id):
+            return True
+        return await self.agent_registry.get(agent_id) is not None
+
+    @asynccontextmanager
+    async def _use_sandbox(self, agent_id: str) -> AsyncIterator[Sandbox]:
+        """Get the sandbox of an Agent, connecting directly to it when the Agent is owned by another worker
+        
+        Raises:
+            NotFoundError: When Agent or Sandbox does not exist
+        """
+        await self._ensure_reachable(agent_id)
+        sandbox = self.agent_domain_service.get_sandbox(agent_id)
+        if sandbox:
+            yield sandbox
+            return
+        
+        registration = await self.agent_registry.get(agent_id)
+        if not registration:
+            logger.warning(f"Agent not found: {agent_id}")
+            raise NotFoundError(f"Agent not found: {agent_id}")
+        if not registration.sandbox:
+            logger.warning(f"Sandbox not found: {agent_id}")
+            raise NotFoundError(f"Sandbox not found: {agent_id}")
+        
+        sandbox = self.sandbox_cls.from_state(registration.sandbox)
+        try:
+            yield sandbox
+        finally:
+            await sandbox.close()
 
     async def shell_view(self, agent_id: str, session_id: str) -> ShellViewResponse:
         """View shell session output
@@ -197,16 +598,8 @@ class AgentService:
         """
         logger.info(f"Viewing shell output for agent {agent_id} in session {session_id}")
         
-        if not self.agent_exists(agent_id):
-            logger.warning(f"Agent not found: {agent_id}")
-            raise NotFoundError(f"Agent not found: {agent_id}")
-        
-        sandbox = self.agent_domain_service.get_sandbox(agent_id)
-        if not sandbox:
-            logger.warning(f"Sandbox not found: {agent_id}")
-            raise NotFoundError(f"Sandbox not found: {agent_id}")
-            
-        result = await sandbox.view_shell(session_id)
+        async with self._use_sandbox(agent_id) as sandbox:
+            result = await sandbox.view_shell(session_id)
         return ShellViewResponse(**result.data)
 
     async def get_vnc_url(self, agent_id: str) -> str:
@@ -223,16 +616,55 @@ class AgentService:
         """
         logger.info(f"Getting sandbox host for agent {agent_id}")
         
-        if not await self.agent_exists(agent_id):
-            logger.warning(f"Agent not found: {agent_id}")
-            raise NotFoundError(f"Agent not found: {agent_id}")
+        async with self._use_sandbox(agent_id) as sandbox:
+            return sandbox.get_vnc_url()
+
+    def get_agent_states(self) -> Dict[str, int]:
+        """Get the number of Agents of this worker in each flow state"""
+        return self.agent_domain_service.get_agent_states()
+
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Get the number of messages waiting to be processed by each Agent of this worker"""
+        return self.agent_domain_service.get_queue_depths()
+
+    async def get_sandbox_stats(self, agent_id: str) -> SandboxStatsResponse:
+        """Get resource usage of the Agent sandbox
         
-        sandbox = self.agent_domain_service.get_sandbox(agent_id)
-        if not sandbox:
-            logger.warning(f"Sandbox not found: {agent_id}")
-            raise NotFoundError(f"Sandbox not found: {agent_id}")
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            CPU, memory, disk and process usage and limits of the sandbox
+            
+        Raises:
+            ResourceNotFoundError: When Agent or Sandbox does not exist
+        """
+        async with self._use_sandbox(agent_id) as sandbox:
+            result = await sandbox.get_stats()
+        return SandboxStatsResponse(**result.data)
+
+    async def get_usage(self, agent_id: str) -> AgentUsageResponse:
+        """Get token usage and cost of the Agent's LLM calls
         
-        return sandbox.get_vnc_url()
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            Usage in total, by call site and by step of the current plan
+            
+        Raises:
+            NotFoundError: When Agent does not exist
+        """
+        await self._ensure_reachable(agent_id)
+        agent = self.agent_domain_service.get_agent(agent_id)
+        if not agent and self.checkpoint_store and await self.agent_registry.get(agent_id):
+            # Owned by another worker, its usage as of its last checkpoint
+            checkpoint = await self.checkpoint_store.load(agent_id)
+            agent = checkpoint.agent if checkpoint else None
+        if not agent:
+            logger.warning(f"Agent not found: {agent_id}")
+            raise NotFoundError(f"Agent not found: {agent_id}")
+        return AgentUsageResponse(agent_id=agent_id, **agent.usage.model_dump())
 
     async def file_view(self, agent_id: str, path: str) -> FileViewResponse:
         """View file content
@@ -250,15 +682,7 @@ class AgentService:
         """
         logger.info(f"Viewing file content for agent {agent_id}, file path: {path}")
         
-        if not self.agent_exists(agent_id):
-            logger.warning(f"Agent not found: {agent_id}")
-            raise NotFoundError(f"Agent not found: {agent_id}")
-        
-        sandbox = self.agent_domain_service.get_sandbox(agent_id)
-        if not sandbox:
-            logger.warning(f"Sandbox not found: {agent_id}")
-            raise NotFoundError(f"Sandbox not found: {agent_id}")
-            
-        result = await sandbox.file_read(path)
+        async with self._use_sandbox(agent_id) as sandbox:
+            result = await sandbox.file_read(path)
         logger.info(f"File read successfully: {path}")
         return FileViewResponse(**result.data)
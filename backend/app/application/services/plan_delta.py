@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+import time
+from app.domain.models.plan import Plan, ExecutionStatus
+from app.application.schemas.event import (
+    SSEEvent,
+    PlanSSEEvent, PlanData, StepData,
+    PlanDeltaSSEEvent, PlanDeltaData, PlanStepChange
+)
+
+
+def plan_to_data(plan: Plan, version: Optional[int] = None) -> PlanData:
+    """Convert a plan to SSE plan data
+    
+    The plan is a trusted domain object, so the data is constructed without validation
+    and all steps share one timestamp.
+    """
+    timestamp = int(time.time())
+    return PlanData.model_construct(timestamp=timestamp, version=version, steps=[
+        StepData.model_construct(timestamp=timestamp, status=step.status, id=step.id, description=step.description)
+        for step in plan.steps
+    ])
+
+
+class PlanDeltaEncoder:
+    """Encode plan changes of one event stream as deltas against the last plan sent
+    
+    The first plan of a stream is sent as a full snapshot, as is any change the deltas
+    cannot express, like reordered steps. Each plan event sent increments the version.
+    """
+
+    def __init__(self):
+        self.version = 0
+        # Step ID to (status, description) of the last plan sent, in step order
+        self._steps: Optional[Dict[str, Tuple[ExecutionStatus, str]]] = None
+
+    def encode(self, plan: Plan) -> List[SSEEvent]:
+        """Encode the plan as a full snapshot or a delta
+        
+        Args:
+            plan: Current plan
+            
+        Returns:
+            SSE events to send, empty if the plan did not change
+        """
+        steps = {step.id: (step.status, step.description) for step in plan.steps}
+        if self._steps is None:
+            return [self._snapshot(plan, steps)]
+        
+        kept = [step_id for step_id in self._steps if step_id in steps]
+        if kept != [step_id for step_id in steps if step_id in self._steps]:
+            return [self._snapshot(plan, steps)]
+        
+        changes: List[PlanStepChange] = []
+        for step_id in self._steps:
+            if step_id not in steps:
+                changes.append(PlanStepChange.model_construct(op="remove", id=step_id))
+        for step_id, (status, description) in steps.items():
+            previous = self._steps.get(step_id)
+            if previous is None:
+                changes.append(PlanStepChange.model_construct(op="add", id=step_id, status=status, description=description))
+                continue
+            if previous[0] != status:
+                changes.append(PlanStepChange.model_construct(op="status", id=step_id, status=status))
+            if previous[1] != description:
+                changes.append(PlanStepChange.model_construct(op="description", id=step_id, description=description))
+        if not changes:
+            return []
+        
+        # Added steps must keep their position, otherwise send a snapshot
+        if any(change.op == "add" for change in changes) and list(steps)[:len(kept)] != kept:
+            return [self._snapshot(plan, steps)]
+        
+        self._steps = steps
+        self.version += 1
+        return [PlanDeltaSSEEvent(data=PlanDeltaData.model_construct(version=self.version, changes=changes))]
+
+    def _snapshot(self, plan: Plan, steps: Dict[str, Tuple[ExecutionStatus, str]]) -> SSEEvent:
+        self._steps = steps
+        self.version += 1
+        return PlanSSEEvent(data=plan_to_data(plan, self.version))
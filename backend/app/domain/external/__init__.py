@@ -1,6 +1,10 @@
-from app.domain.external.llm import LLM
+from app.domain.external.llm import LLM, LLMRouter
 from app.domain.external.sandbox import Sandbox
 from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
+from app.domain.external.checkpoint import CheckpointStore
+from app.domain.external.registry import AgentRegistry
+from app.domain.external.event_bus import EventBus
+from app.domain.external.tracing import SpanExporter
 
-__all__ = ['LLM', 'Sandbox', 'Browser', 'SearchEngine'] 
\ No newline at end of file
+__all__ = ['LLM', 'LLMRouter', 'Sandbox', 'Browser', 'SearchEngine', 'CheckpointStore', 'AgentRegistry', 'EventBus', 'SpanExporter'] 
\ No newline at end of file
@@ -0,0 +1,40 @@
+from typing import List, Optional, Protocol
+from app.domain.models.checkpoint import AgentCheckpoint
+
+class CheckpointStore(Protocol):
+    """Agent checkpoint persistence gateway interface"""
+    
+    async def save(self, checkpoint: AgentCheckpoint) -> None:
+        """Save checkpoint, replacing the previous checkpoint of the same agent
+        
+        Args:
+            checkpoint: Agent checkpoint
+        """
+        ...
+    
+    async def load(self, agent_id: str) -> Optional[AgentCheckpoint]:
+        """Load the latest checkpoint of an agent
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            Agent checkpoint, or None if the agent has no checkpoint
+        """
+        ...
+    
+    async def delete(self, agent_id: str) -> None:
+        """Delete the checkpoint of an agent
+        
+        Args:
+            agent_id: Agent ID
+        """
+        ...
+    
+    async def list_agent_ids(self) -> List[str]:
+        """List IDs of all checkpointed agents
+        
+        Returns:
+            Agent ID list
+        """
+        ...
@@ -0,0 +1,49 @@
+from typing import AsyncContextManager, AsyncIterator, Protocol
+from app.domain.models.event import AgentEvent
+from app.domain.models.cluster import AgentCommand
+
+class EventBus(Protocol):
+    """Message bus between backend workers, carrying agent events and commands"""
+    
+    async def publish_event(self, stream_id: str, event: AgentEvent) -> None:
+        """Publish an agent event to the subscribers of an event stream
+        
+        Args:
+            stream_id: Event stream ID
+            event: Agent event
+        """
+        ...
+    
+    def subscribe_events(self, stream_id: str) -> AsyncContextManager[AsyncIterator[AgentEvent]]:
+        """Subscribe to an event stream
+        
+        The subscription is active once the context is entered, so no event published
+        after entering is missed.
+        
+        Args:
+            stream_id: Event stream ID
+            
+        Returns:
+            Context manager yielding the event stream
+        """
+        ...
+    
+    async def send_command(self, worker_id: str, command: AgentCommand) -> None:
+        """Send a command to a worker
+        
+        Args:
+            worker_id: ID of the worker owning the agent
+            command: Agent command
+        """
+        ...
+    
+    def subscribe_commands(self, worker_id: str) -> AsyncContextManager[AsyncIterator[AgentCommand]]:
+        """Subscribe to the commands sent to a worker
+        
+        Args:
+            worker_id: Worker ID
+            
+        Returns:
+            Context manager yielding the command stream
+        """
+        ...
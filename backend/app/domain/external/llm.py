@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional, Protocol
+from app.domain.models.llm import LLMCallSite
 
 class LLM(Protocol):
     """AI service gateway interface for interacting with AI services"""
@@ -19,4 +20,18 @@ class LLM(Protocol):
         Returns:
             Response message from AI service
         """
-        pass 
\ No newline at end of file
+        pass 
+
+class LLMRouter(Protocol):
+    """LLM routing gateway interface, selecting the LLM used by each call site"""
+
+    def get_llm(self, call_site: LLMCallSite) -> LLM:
+        """Get the LLM configured for a call site
+        
+        Args:
+            call_site: Place in the agent loop issuing the call
+            
+        Returns:
+            LLM for the call site, falling back to the default model
+        """
+        ...
@@ -0,0 +1,46 @@
+from typing import Optional, Protocol
+from app.domain.models.cluster import AgentRegistration
+
+class AgentRegistry(Protocol):
+    """Registry of which backend worker owns each agent"""
+    
+    async def register(self, registration: AgentRegistration) -> bool:
+        """Register an agent owner, unless the agent is already owned by a worker
+        
+        Args:
+            registration: Agent ownership record
+            
+        Returns:
+            Whether the registration was stored
+        """
+        ...
+    
+    async def refresh(self, registration: AgentRegistration) -> bool:
+        """Keep the registration of an owned agent alive, registering it again if it expired
+        
+        Args:
+            registration: Agent ownership record
+            
+        Returns:
+            Whether the agent is still owned by the registration's worker
+        """
+        ...
+    
+    async def get(self, agent_id: str) -> Optional[AgentRegistration]:
+        """Get the ownership record of an agent
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            Agent ownership record, or None if no worker owns the agent
+        """
+        ...
+    
+    async def unregister(self, agent_id: str) -> None:
+        """Remove the ownership record of an agent
+        
+        Args:
+            agent_id: Agent ID
+        """
+        ...
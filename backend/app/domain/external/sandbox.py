@@ -222,6 +222,33 @@ class Sandbox(Protocol):
         """
         ...
     
+    def get_state(self) -> Dict[str, Any]:
+        """Get the information needed to reattach to this sandbox after a restart
+        
+        Returns:
+            Serializable sandbox state
+        """
+        ...
+    
+    async def extend_timeout(self, minutes: Optional[int] = None) -> ToolResult:
+        """Postpone the automatic shutdown of the sandbox
+        
+        Args:
+            minutes: Minutes from now until shutdown, None to use the sandbox's default timeout
+            
+        Returns:
+            Timeout status
+        """
+        ...
+    
+    async def get_stats(self) -> ToolResult:
+        """Get CPU, memory, disk and process usage of the sandbox and its limits
+        
+        Returns:
+            Resource usage
+        """
+        ...
+    
     async def destroy(self) -> bool:
         """Destroy current sandbox instance
         
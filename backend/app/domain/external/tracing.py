@@ -0,0 +1,18 @@
+from typing import Protocol
+from app.domain.models.trace import Span
+
+
+class SpanExporter(Protocol):
+    """Span exporter gateway interface"""
+
+    def export(self, span: Span) -> None:
+        """Export a finished span, must not block
+        
+        Args:
+            span: Finished span
+        """
+        ...
+
+    async def shutdown(self) -> None:
+        """Export pending spans and release resources"""
+        ...
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from app.domain.models.memory import Memory
+from app.domain.models.usage import AgentUsage
+from app.domain.models.scratchpad import Scratchpad
 import uuid
 
 class Agent(BaseModel):
@@ -10,3 +12,6 @@ class Agent(BaseModel):
     model_name: str
     temperature: float = 0.7
     max_tokens: Optional[int] = None
+    usage: AgentUsage = Field(default_factory=AgentUsage)
+    # Written by execution agents when each step starts from fresh memory
+    scratchpad: Scratchpad = Field(default_factory=Scratchpad)
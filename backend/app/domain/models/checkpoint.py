@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+import time
+from app.domain.models.agent import Agent
+from app.domain.models.plan import Plan
+
+
+class AgentCheckpoint(BaseModel):
+    """Persisted agent state, used to resume an agent after a backend restart"""
+    agent: Agent
+    plan: Optional[Plan] = None
+    flow_status: str = "idle"
+    # Information needed to reattach to the agent's sandbox
+    sandbox: Dict[str, Any] = {}
+    updated_at: int = Field(default_factory=lambda: int(time.time()))
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Literal, Optional
+
+
+class AgentRegistration(BaseModel):
+    """Ownership record of an agent, shared by all backend workers"""
+    agent_id: str
+    worker_id: str
+    # Information needed by other workers to reach the agent's sandbox
+    sandbox: Dict[str, Any] = {}
+
+
+class AgentCommand(BaseModel):
+    """Command handed over to the worker that owns an agent"""
+    type: Literal["chat", "close"]
+    agent_id: str
+    message: Optional[str] = None
+    timestamp: Optional[int] = None
+    last_event_id: Optional[int] = None
+    # Event stream the owning worker publishes the chat events to
+    reply_to: Optional[str] = None
@@ -1,12 +1,15 @@
-from pydantic import BaseModel
-from typing import Dict, Any, Literal
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Literal, Optional, Union, Annotated
 import logging
 from app.domain.models.plan import Plan, Step
+from app.domain.models.usage import TokenUsage
 
 
 class AgentEvent(BaseModel):
     """Base class for agent events"""
     type: str
+    # Assigned when the event is appended to the agent's event log
+    id: Optional[int] = None
 
 class ErrorEvent(AgentEvent):
     """Error event"""
@@ -69,3 +72,20 @@ class MessageEvent(AgentEvent):
 class DoneEvent(AgentEvent):
     """Done event"""
     type: Literal["done"] = "done"
+    # Token usage of the agent so far, set when the event is published
+    usage: Optional[TokenUsage] = None
+
+# Any concrete agent event, used to parse serialized events by their type
+AnyAgentEvent = Annotated[Union[
+    ErrorEvent,
+    PlanCreatedEvent,
+    PlanUpdatedEvent,
+    ToolCallingEvent,
+    ToolCalledEvent,
+    StepStartedEvent,
+    StepFailedEvent,
+    StepCompletedEvent,
+    PlanCompletedEvent,
+    MessageEvent,
+    DoneEvent
+], Field(discriminator="type")]
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class LLMCallSite(str, Enum):
+    """Places in the agent loop that issue LLM calls, each of which can be routed to its own model"""
+    PLANNER = "planner"
+    UPDATER = "updater"
+    EXECUTOR = "executor"
+    BROWSER_EXTRACTOR = "browser_extractor"
+    SUMMARIZER = "summarizer"
@@ -14,6 +14,8 @@ class Step(BaseModel):
     status: ExecutionStatus = ExecutionStatus.PENDING
     result: Optional[str] = None
     error: Optional[str] = None
+    # Ids of steps that must be done before this step, None means it depends on all previous steps
+    dependencies: Optional[List[str]] = None
 
     def is_done(self) -> bool:
         return self.status == ExecutionStatus.COMPLETED or self.status == ExecutionStatus.FAILED
@@ -36,3 +38,22 @@ class Plan(BaseModel):
             if not step.is_done():
                 return step
         return None
+
+    def get_ready_steps(self, limit: Optional[int] = None) -> List[Step]:
+        """Get pending steps whose dependencies are all done, in plan order"""
+        done_ids = {step.id for step in self.steps if step.is_done()}
+        known_ids = {step.id for step in self.steps}
+        ready_steps = []
+        for index, step in enumerate(self.steps):
+            if step.status != ExecutionStatus.PENDING:
+                continue
+            if step.dependencies is None:
+                dependencies = [previous.id for previous in self.steps[:index]]
+            else:
+                # Dependencies on unknown steps are ignored
+                dependencies = [dependency for dependency in step.dependencies if dependency in known_ids]
+            if all(dependency in done_ids for dependency in dependencies):
+                ready_steps.append(step)
+                if limit is not None and len(ready_steps) >= limit:
+                    break
+        return ready_steps
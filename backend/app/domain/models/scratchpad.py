@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class Scratchpad(BaseModel):
+    """Key facts and artifacts written down by execution agents, shared by all steps of an agent"""
+    entries: Dict[str, str] = {}
+
+    def write(self, key: str, content: str) -> None:
+        self.entries[key] = content
+
+    def delete(self, key: str) -> bool:
+        return self.entries.pop(key, None) is not None
+
+    def render(self) -> str:
+        """Render entries for a prompt, one per line"""
+        if not self.entries:
+            return "(empty)"
+        return "\n".join(f"- {key}: {content}" for key, content in self.entries.items())
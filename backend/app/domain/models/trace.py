@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+import time
+
+
+@dataclass
+class Span:
+    """A timed operation of a trace, with OpenTelemetry compatible IDs and timestamps"""
+    name: str
+    trace_id: str  # 32 hex characters
+    span_id: str  # 16 hex characters
+    parent_id: Optional[str] = None
+    start_time: int = field(default_factory=time.time_ns)  # Unix time in nanoseconds
+    end_time: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        """Set span attributes"""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, None while the span is running"""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
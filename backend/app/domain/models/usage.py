@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+
+class TokenUsage(BaseModel):
+    """Tokens and cost of one or more LLM calls"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    total_tokens: int = 0
+    cost: float = 0.0  # USD, 0 for models without a configured price
+
+    def add(self, usage: "TokenUsage") -> None:
+        """Add the counts of another usage to this one"""
+        self.calls += usage.calls
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.total_tokens += usage.total_tokens
+        self.cost += usage.cost
+
+
+class AgentUsage(BaseModel):
+    """Token usage of an agent's LLM calls, in total and by the call site and plan step making them"""
+    total: TokenUsage = Field(default_factory=TokenUsage)
+    by_call_site: Dict[str, TokenUsage] = {}
+    # Steps of the current plan by step ID, calls made outside a step only count towards the other totals
+    by_step: Dict[str, TokenUsage] = {}
+
+    def add(self, usage: TokenUsage, call_site: str, step_id: Optional[str] = None) -> None:
+        """Attribute the usage of an LLM call to the agent"""
+        self.total.add(usage)
+        self.by_call_site.setdefault(call_site, TokenUsage()).add(usage)
+        if step_id is not None:
+            self.by_step.setdefault(step_id, TokenUsage()).add(usage)
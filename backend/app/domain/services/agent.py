@@ -1,19 +1,30 @@
-from typing import Optional, AsyncGenerator, Dict
+from typing import Optional, AsyncGenerator, Dict, List
+import time
 import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from app.domain.models.memory import Memory
 from app.domain.models.agent import Agent
-from app.domain.external.llm import LLM
+from app.domain.external.llm import LLMRouter
 from app.domain.external.sandbox import Sandbox
 from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
+from app.domain.external.checkpoint import CheckpointStore
+from app.domain.models.checkpoint import AgentCheckpoint
 from app.domain.models.event import (
     AgentEvent,
     ErrorEvent,
-    DoneEvent
+    DoneEvent,
+    PlanCreatedEvent,
+    PlanUpdatedEvent,
+    StepCompletedEvent,
+    StepFailedEvent
 )
-from app.domain.services.flows.plan_act import PlanActFlow
+from app.domain.services.flows.plan_act import PlanActFlow, AgentStatus
+from app.domain.services.flows.update_policy import PlanUpdatePolicy
+from app.domain.services.agents.output_budget import ToolOutputBudget
+from app.domain.services.agents.compaction import MemoryCompaction
+from app.domain.services.event_log import AgentEventLog
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -25,10 +36,12 @@ class AgentContext:
     flow: PlanActFlow
     sandbox: Sandbox
     msg_queue: asyncio.Queue
-    event_queue: asyncio.Queue
+    event_log: AgentEventLog
     task: Optional[asyncio.Task] = None
     last_message: Optional[str] = None
     last_message_time: Optional[int] = None
+    # Monotonic time of the last chat or event
+    last_activity: float = field(default_factory=time.monotonic)
 
 
 class AgentDomainService:
@@ -36,15 +49,27 @@ class AgentDomainService:
     Agent domain service, responsible for coordinating the work of planning agent and execution agent
     """
     
-    def __init__(self):
+    # Events after which the agent state is checkpointed
+    CHECKPOINT_EVENTS = (PlanCreatedEvent, PlanUpdatedEvent, StepCompletedEvent, StepFailedEvent, DoneEvent)
+    
+    def __init__(self, checkpoint_store: Optional[CheckpointStore] = None, event_log_size: int = 1000,
+                 event_backpressure_threshold: Optional[int] = None):
         # Store and manage Agent and related resources, key is agent_id, value is resource collection
         self._contexts: Dict[str, AgentContext] = {}
+        self._checkpoint_store = checkpoint_store
+        self._event_log_size = event_log_size
+        self._event_backpressure_threshold = event_backpressure_threshold
         logger.info("AgentDomainService initialization completed")
     
-    def create_agent(self, model_name: str, llm: LLM, sandbox: Sandbox, browser: Browser, 
+    def create_agent(self, model_name: str, llm_router: LLMRouter, sandbox: Sandbox, browser: Browser, 
                      search_engine: Optional[SearchEngine] = None, 
                      temperature: float = 0.7, 
-                     max_tokens: Optional[int] = None) -> Agent:
+                     max_tokens: Optional[int] = None,
+                     plan_update_policy: Optional[PlanUpdatePolicy] = None,
+                     max_parallel_steps: int = 1,
+                     tool_output_budget: Optional[ToolOutputBudget] = None,
+                     memory_compaction: Optional[MemoryCompaction] = None,
+                     step_scoped_memory: bool = False) -> Agent:
         """Create and initialize Agent, including related agents and resources"""
         # Create Agent instance, ID will be generated automatically
         agent = Agent(
@@ -63,24 +88,63 @@ class AgentDomainService:
             logger.error(f"Agent with ID {agent_id} already exists")
             raise ValueError(f"Agent with ID {agent_id} already exists")
         
-        flow = PlanActFlow(agent, llm, sandbox, browser, search_engine)
+        flow = PlanActFlow(agent, llm_router, sandbox, browser, search_engine, plan_update_policy, max_parallel_steps,
+                           tool_output_budget, memory_compaction, step_scoped_memory)
+        self._add_context(agent, flow, sandbox)
+        return agent
+    
+    def restore_agent(self, checkpoint: AgentCheckpoint, llm_router: LLMRouter, sandbox: Sandbox, browser: Browser,
+                      search_engine: Optional[SearchEngine] = None,
+                      plan_update_policy: Optional[PlanUpdatePolicy] = None,
+                      max_parallel_steps: int = 1,
+                      tool_output_budget: Optional[ToolOutputBudget] = None,
+                      memory_compaction: Optional[MemoryCompaction] = None,
+                      step_scoped_memory: bool = False) -> Agent:
+        """Rehydrate an Agent from a checkpoint, resuming its flow if it was running"""
+        agent = checkpoint.agent
+        if agent.id in self._contexts:
+            logger.error(f"Agent with ID {agent.id} already exists")
+            raise ValueError(f"Agent with ID {agent.id} already exists")
         
-        # Create resource collection
+        flow = PlanActFlow(agent, llm_router, sandbox, browser, search_engine, plan_update_policy, max_parallel_steps,
+                           tool_output_budget, memory_compaction, step_scoped_memory)
+        flow.restore(checkpoint.plan, AgentStatus(checkpoint.flow_status))
+        logger.info(f"Restored Agent {agent.id} from checkpoint, flow status: {flow.status}")
+        self._add_context(agent, flow, sandbox, resume=not flow.is_idle())
+        return agent
+    
+    def _add_context(self, agent: Agent, flow: PlanActFlow, sandbox: Sandbox, resume: bool = False) -> None:
+        """Create the resource collection of an Agent and start its task"""
+        agent_id = agent.id
         self._contexts[agent_id] = AgentContext(
             agent=agent,
             flow=flow,
             sandbox=sandbox,
             msg_queue=asyncio.Queue(),
-            event_queue=asyncio.Queue()
+            event_log=AgentEventLog(self._event_log_size, self._event_backpressure_threshold)
         )
         
         # Create and start task
         self._contexts[agent_id].task = asyncio.create_task(
-            self._run_flow_task(agent_id)
+            self._run_flow_task(agent_id, resume)
         )
         logger.info(f"Agent {agent_id} initialization completed and task started")
-        
-        return agent
+    
+    async def _save_checkpoint(self, agent_id: str) -> None:
+        """Checkpoint the Agent, its memories, plan and flow status"""
+        context = self._contexts.get(agent_id)
+        if not self._checkpoint_store or not context:
+            return
+        try:
+            await self._checkpoint_store.save(AgentCheckpoint(
+                agent=context.agent,
+                plan=context.flow.plan,
+                flow_status=context.flow.status.value,
+                sandbox=context.sandbox.get_state()
+            ))
+            logger.debug(f"Saved checkpoint for Agent {agent_id}")
+        except Exception as e:
+            logger.exception(f"Failed to save checkpoint for Agent {agent_id}: {str(e)}")
     
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         """Get specified ID Agent instance"""
@@ -89,6 +153,10 @@ class AgentDomainService:
             logger.warning(f"Attempted to get non-existent Agent: {agent_id}")
         return context.agent if context else None
     
+    def get_agent_ids(self) -> List[str]:
+        """Get IDs of all Agents managed by this service"""
+        return list(self._contexts.keys())
+    
     def has_agent(self, agent_id: str) -> bool:
         """Check if specified ID Agent exists"""
         exists = agent_id in self._contexts
@@ -138,51 +206,73 @@ class AgentDomainService:
                 self._run_flow_task(agent_id)
             )
 
-    async def chat(self, agent_id: str, message: Optional[str] = None, timestamp: Optional[int] = None) -> AsyncGenerator[AgentEvent, None]:
+    async def chat(self, agent_id: str, message: Optional[str] = None, timestamp: Optional[int] = None,
+                   last_event_id: Optional[int] = None) -> AsyncGenerator[AgentEvent, None]:
         """
-        Complete business process for handling user messages, using asynchronous tasks and queues:
+        Complete business process for handling user messages, using asynchronous tasks and the agent's event log:
         1. Create plan
         2. Execute plan
+        
+        A new message streams the events it produces. Without a new message, events after last_event_id
+        are replayed, or all retained events if last_event_id is not given, and the stream follows the
+        running flow until it is done. Any number of chats can follow the same agent concurrently.
         """
         if agent_id not in self._contexts:
             logger.error(f"Attempted to chat with non-existent Agent {agent_id}")
             yield ErrorEvent(error="Agent not initialized")
             return
         context = self._contexts[agent_id]
+        context.last_activity = time.monotonic()
         
         
         # Put message into queue
         if message and not (context.last_message == message and context.last_message_time == timestamp):
             logger.debug(f"Putting message into Agent {agent_id}'s message queue: {message[:50]}...")
+            after_id = context.event_log.last_id
             await context.msg_queue.put(message)
             context.last_message = message
             context.last_message_time = timestamp
         else:
-            if context.flow.is_idle():
+            after_id = last_event_id or 0
+            if context.flow.is_idle() and context.msg_queue.empty() and context.event_log.last_id <= after_id:
                 logger.info(f"Agent {agent_id} flow is idle")
-                yield DoneEvent()
+                yield DoneEvent(usage=context.agent.usage.total.model_copy())
                 return
         
         
-        # Ensure task and queue are initialized
+        # Ensure task is initialized
         self._ensure_task(agent_id)
 
-        # Get events from event queue and yield to caller
-        while True:
-            event = await context.event_queue.get()
-            logger.debug(f"Got event from Agent {agent_id}'s event queue: {type(event).__name__}")
+        # Follow the event log and yield to caller
+        async for event in context.event_log.read(after_id):
+            logger.debug(f"Got event {event.id} from Agent {agent_id}'s event log: {type(event).__name__}")
             yield event
-            context.event_queue.task_done()
             
-            # If done event is received, end generation
-            if isinstance(event, DoneEvent):
+            # If the latest done event is received, end generation
+            if isinstance(event, DoneEvent) and event.id == context.event_log.last_id:
                 logger.debug(f"Agent {agent_id} received done event, ending generation")
                 break
     
-    async def _run_flow_task(self, agent_id: str) -> None:
-        """Process specified agent's message queue"""
+    async def _publish(self, agent_id: str, context: AgentContext, event: AgentEvent) -> None:
+        """Append an event to the Agent's event log, checkpointing the Agent after state changes"""
+        context.last_activity = time.monotonic()
+        if isinstance(event, DoneEvent) and event.usage is None:
+            event.usage = context.agent.usage.total.model_copy()
+        await context.event_log.append(event)
+        if isinstance(event, self.CHECKPOINT_EVENTS):
+            await self._save_checkpoint(agent_id)
+    
+    async def _run_flow_task(self, agent_id: str, resume: bool = False) -> None:
+        """Process specified agent's message queue, optionally resuming a restored flow first"""
         try:
             logger.info(f"Agent {agent_id} message processing task started")
+            context = self._contexts.get(agent_id)
+            if resume and context:
+                async for event in context.flow.resume():
+                    await self._publish(agent_id, context, event)
+                    if not context.msg_queue.empty():
+                        break
+            
             while True:
                 context = self._contexts.get(agent_id)
                 
@@ -196,7 +286,7 @@ class AgentDomainService:
                 
                 # Call original chat method to process message, and put event into queue
                 async for event in self._run_flow(agent_id, message):
-                    await context.event_queue.put(event)
+                    await self._publish(agent_id, context, event)
                     if not context.msg_queue.empty():
                         break
                 
@@ -211,8 +301,8 @@ class AgentDomainService:
             logger.exception(f"Agent {agent_id} task encountered exception: {str(e)}")
             context = self._contexts.get(agent_id)
             if context:
-                await context.event_queue.put(ErrorEvent(error=f"Task error: {str(e)}"))
-                await context.event_queue.put(DoneEvent())
+                await self._publish(agent_id, context, ErrorEvent(error=f"Task error: {str(e)}"))
+                await self._publish(agent_id, context, DoneEvent())
         
     async def _clear_queue(self, queue: asyncio.Queue) -> None:
         """Empty specified queue"""
@@ -244,30 +334,109 @@ class AgentDomainService:
             except asyncio.CancelledError:
                 pass
         
-        # 2. Clean up queue resources
+        # 2. Clean up queue resources and stop event readers
         logger.debug(f"Clearing Agent {agent_id}'s message queue")
         await self._clear_queue(context.msg_queue)
-        logger.debug(f"Clearing Agent {agent_id}'s event queue")
-        await self._clear_queue(context.event_queue)
+        context.event_log.close()
         
         # 3. Destroy sandbox environment
         if context.sandbox:
             logger.debug(f"Destroying Agent {agent_id}'s sandbox environment")
             await context.sandbox.destroy()
         
-        # 4. Remove resource collection
+        # 4. Remove resource collection and checkpoint
         self._contexts.pop(agent_id, None)
+        if self._checkpoint_store:
+            await self._checkpoint_store.delete(agent_id)
         logger.info(f"Agent {agent_id} has been fully closed and resources cleared")
         return True
             
+    async def drop_agent(self, agent_id: str) -> bool:
+        """Release an Agent another worker took over, leaving its sandbox and checkpoint to the new owner"""
+        context = self._contexts.pop(agent_id, None)
+        if not context:
+            return False
+        if context.task and not context.task.done():
+            context.task.cancel()
+            try:
+                await context.task
+            except asyncio.CancelledError:
+                pass
+        await self._clear_queue(context.msg_queue)
+        context.event_log.close()
+        if context.sandbox:
+            await context.sandbox.close()
+        logger.info(f"Agent {agent_id} has been dropped")
+        return True
+
     async def close_all(self) -> None:
         """Clean up all Agent's resources"""
         logger.info(f"Starting to close all Agents, currently {len(self._contexts)} in total")
-        # Close resources of each agent one by one
-        for agent_id in list(self._contexts.keys()):
-            await self.close_agent(agent_id)
+        # Close agents concurrently, sandbox teardown dominates and is independent per agent
+        results = await asyncio.gather(
+            *(self.close_agent(agent_id) for agent_id in list(self._contexts.keys())),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed to close Agent: {str(result)}")
         logger.info("All Agents have been closed")
     
+    async def detach_agent(self, agent_id: str) -> bool:
+        """Checkpoint and release an Agent while keeping its sandbox running, so it can be restored"""
+        context = self._contexts.get(agent_id)
+        if not context:
+            logger.warning(f"Attempted to detach non-existent Agent {agent_id}")
+            return False
+        if context.task and not context.task.done():
+            context.task.cancel()
+            try:
+                await context.task
+            except asyncio.CancelledError:
+                pass
+        await self._save_checkpoint(agent_id)
+        context.event_log.close()
+        if context.sandbox:
+            await context.sandbox.close()
+        self._contexts.pop(agent_id, None)
+        logger.info(f"Agent {agent_id} has been detached")
+        return True
+    
+    async def detach_all(self) -> None:
+        """Checkpoint and release all Agents while keeping their sandboxes running, so they can be restored"""
+        logger.info(f"Starting to detach all Agents, currently {len(self._contexts)} in total")
+        for agent_id in list(self._contexts.keys()):
+            await self.detach_agent(agent_id)
+        logger.info("All Agents have been detached")
+    
+    def get_idle_agent_ids(self, idle_seconds: float) -> List[str]:
+        """Get IDs of Agents whose flow is idle and that had no activity for the given time"""
+        now = time.monotonic()
+        return [
+            agent_id for agent_id, context in self._contexts.items()
+            if context.flow.is_idle() and context.msg_queue.empty() and now - context.last_activity >= idle_seconds
+        ]
+    
+    def get_active_agent_ids(self, within_seconds: float) -> List[str]:
+        """Get IDs of Agents whose flow is running or that had activity within the given time"""
+        now = time.monotonic()
+        return [
+            agent_id for agent_id, context in self._contexts.items()
+            if not context.flow.is_idle() or now - context.last_activity < within_seconds
+        ]
+    
+    def get_agent_states(self) -> Dict[str, int]:
+        """Get the number of Agents in each flow state"""
+        states: Dict[str, int] = {}
+        for context in self._contexts.values():
+            state = context.flow.status.value
+            states[state] = states.get(state, 0) + 1
+        return states
+    
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Get the number of messages waiting to be processed by each Agent"""
+        return {agent_id: context.msg_queue.qsize() for agent_id, context in self._contexts.items()}
+    
     def get_sandbox(self, agent_id: str) -> Optional[Sandbox]:
         """Get specified agent's sandbox"""
         context = self._contexts.get(agent_id)
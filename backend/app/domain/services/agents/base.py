@@ -5,8 +5,9 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, AsyncGenerator
 from app.domain.external.llm import LLM
 from app.domain.models.memory import Memory
-from app.domain.services.tools.base import BaseTool
+from app.domain.services.tools.base import BaseTool, ToolArgumentError
 from app.domain.models.tool_result import ToolResult
+from app.domain.services.tracing import tracer
 from app.domain.models.event import (
     AgentEvent,
     ToolCallingEvent,
@@ -33,41 +34,62 @@ class BaseAgent(ABC):
         self.memory.add_message({
             "role": "system", "content": self.system_prompt,
         })
-        self.tools = tools
+        self.tools: List[BaseTool] = []
+        # Tool of each function name and schemas of all functions, kept up to date by add_tool
+        self._function_tools: Dict[str, BaseTool] = {}
+        self._tool_schemas: List[Dict[str, Any]] = []
+        for tool in tools:
+            self.add_tool(tool)
+    
+    def add_tool(self, tool: BaseTool) -> None:
+        """Make a tool's functions available to the agent"""
+        self.tools.append(tool)
+        for function_name in tool.get_function_names():
+            self._function_tools[function_name] = tool
+        self._tool_schemas.extend(tool.get_tools())
     
     def get_available_tools(self) -> Optional[List[Dict[str, Any]]]:
         """Get all available tools list"""
-        available_tools = []
-        for tool in self.tools:
-            available_tools.extend(tool.get_tools())
-        return available_tools
+        return self._tool_schemas
     
     def get_tool(self, function_name: str) -> BaseTool:
         """Get specified tool"""
-        for tool in self.tools:
-            if tool.has_function(function_name):
-                return tool
-        raise ValueError(f"Unknown tool: {function_name}")
+        tool = self._function_tools.get(function_name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {function_name}")
+        return tool
+
+    def prepare_tool_arguments(self, tool: BaseTool, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Adjust tool call arguments before the call is announced and executed"""
+        return arguments
+
+    async def format_tool_result(self, tool: BaseTool, function_name: str, result: ToolResult) -> str:
+        """Render a tool result as the content of the tool message kept in memory"""
+        return result.model_dump_json()
 
     async def execute_tool(self, tool: BaseTool, function_name: str, arguments: Dict[str, Any]) -> ToolResult:
         """Execute specified tool, with retry mechanism"""
 
-        retries = 0
-        while retries <= self.max_retries:
-            try:
-                return await tool.invoke_function(function_name, **arguments)
-            except Exception as e:
-                last_error = str(e)
-                retries += 1
-                if retries <= self.max_retries:
-                    await asyncio.sleep(self.retry_interval)
-                else:
-                    break
-        
-        raise ValueError(f"Tool execution failed, retried {self.max_retries} times: {last_error}")
+        with tracer.span("tool.execute", **{"tool.name": tool.name, "tool.function": function_name}) as span:
+            retries = 0
+            while retries <= self.max_retries:
+                try:
+                    result = await tool.invoke_function(function_name, **arguments)
+                    span.set(**{"tool.retries": retries, "tool.success": result.success})
+                    return result
+                except Exception as e:
+                    last_error = str(e)
+                    retries += 1
+                    if retries <= self.max_retries:
+                        await asyncio.sleep(self.retry_interval)
+                    else:
+                        break
+            
+            span.set(**{"tool.retries": self.max_retries})
+            raise ValueError(f"Tool execution failed, retried {self.max_retries} times: {last_error}")
     
-    async def execute(self, request: str) -> AsyncGenerator[AgentEvent, None]:
-        message = await self.ask(request, self.format)
+    async def execute(self, request: str, llm: Optional[LLM] = None) -> AsyncGenerator[AgentEvent, None]:
+        message = await self.ask(request, self.format, llm)
         for _ in range(self.max_iterations):
             if not message.tool_calls:
                 break
@@ -78,6 +100,13 @@ class BaseAgent(ABC):
                 tool_call_id = tool_call.id
                 
                 tool = self.get_tool(function_name)
+                # Invalid arguments are reported back to the model instead of being retried
+                try:
+                    tool.validate_arguments(function_name, function_args)
+                    argument_error = None
+                except ToolArgumentError as e:
+                    argument_error = str(e)
+                function_args = self.prepare_tool_arguments(tool, function_name, function_args)
 
                 # Generate event before tool call
                 yield ToolCallingEvent(
@@ -86,7 +115,10 @@ class BaseAgent(ABC):
                     function_args=function_args
                 )
 
-                result = await self.execute_tool(tool, function_name, function_args)
+                if argument_error:
+                    result = ToolResult(success=False, message=f"Invalid arguments for {function_name}: {argument_error}")
+                else:
+                    result = await self.execute_tool(tool, function_name, function_args)
                 
                 # Generate event after tool call
                 yield ToolCalledEvent(
@@ -99,24 +131,27 @@ class BaseAgent(ABC):
                 tool_response = {
                     "role": "tool",
                     "tool_call_id": tool_call_id,
-                    "content": result.model_dump_json()
+                    "content": await self.format_tool_result(tool, function_name, result)
                 }
                 tool_responses.append(tool_response)
 
-            message = await self.ask_with_messages(tool_responses)
+            message = await self.ask_with_messages(tool_responses, llm=llm)
         else:
             yield ErrorEvent(error="Maximum iteration count reached, failed to complete the task")
         
         yield MessageEvent(message=message.content)
     
-    async def ask_with_messages(self, messages: List[Dict[str, Any]], format: Optional[str] = None) -> Dict[str, Any]:
+    async def ask_with_messages(self, messages: List[Dict[str, Any]], format: Optional[str] = None,
+                                llm: Optional[LLM] = None) -> Dict[str, Any]:
+        """Ask the LLM with new messages, using the agent's default LLM unless another one is given"""
         self.memory.add_messages(messages)
+        llm = llm or self.llm
 
         response_format = None
         if format:
             response_format = {"type": format}
 
-        message = await self.llm.ask(self.memory.get_messages(), 
+        message = await llm.ask(self.memory.get_messages(), 
                                      tools=self.get_available_tools(), 
                                      response_format=response_format)
         if message.tool_calls:
@@ -124,12 +159,12 @@ class BaseAgent(ABC):
         self.memory.add_message(message)
         return message
 
-    async def ask(self, request: str, format: Optional[str] = None) -> Dict[str, Any]:
+    async def ask(self, request: str, format: Optional[str] = None, llm: Optional[LLM] = None) -> Dict[str, Any]:
         return await self.ask_with_messages([
             {
                 "role": "user", "content": request
             }
-        ], format)
+        ], format, llm)
     
     def roll_back(self):
         self.memory.roll_back()
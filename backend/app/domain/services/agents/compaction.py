@@ -0,0 +1,206 @@
+import json
+import uuid
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Literal, Optional, Tuple
+from app.domain.external.llm import LLM
+from app.domain.external.sandbox import Sandbox
+from app.domain.models.memory import Memory
+from app.domain.services.tracing import tracer
+from app.domain.services.agents.output_budget import CHARS_PER_TOKEN
+from app.domain.services.prompts.compaction import COMPACTION_SYSTEM_PROMPT, COMPACTION_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Start of the message replacing compacted steps, also marks it when it is compacted again
+SUMMARY_HEADER = "Summary of earlier steps"
+
+
+@dataclass
+class MemoryCompaction:
+    """When and how the execution memory is compacted between steps"""
+    max_chars: int = 60000  # Memory size above which earlier steps are summarized
+    keep_steps: int = 1  # Most recent steps kept verbatim
+    summarizer: Literal["rules", "llm"] = "rules"  # llm has the summarizer call site write the summary
+    transcript_dir: str = "/tmp/transcripts"  # Sandbox directory transcripts of compacted steps are saved to
+
+
+def _field(message: Any, name: str) -> Any:
+    return message.get(name) if isinstance(message, dict) else getattr(message, name, None)
+
+
+def _tool_calls(message: Any) -> List[Tuple[str, str, str]]:
+    """ID, function name and arguments of each tool call of a message"""
+    calls = []
+    for tool_call in _field(message, "tool_calls") or []:
+        function = _field(tool_call, "function")
+        calls.append((_field(tool_call, "id"), _field(function, "name"), _field(function, "arguments") or ""))
+    return calls
+
+
+def message_chars(message: Any) -> int:
+    """Characters a message adds to every LLM request made with it"""
+    return len(str(_field(message, "content") or "")) + sum(len(arguments) for _, _, arguments in _tool_calls(message))
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class MemoryCompactor:
+    """Replace earlier steps in an execution memory by a summary once the memory grows too large
+
+    Steps start at the user message asking for them, so cutting memory at user messages keeps
+    every tool call next to its result. The raw transcript of the compacted steps is saved to a
+    file in the sandbox and linked from the summary, so the agent can still read the details.
+    """
+
+    def __init__(self, compaction: MemoryCompaction, sandbox: Sandbox, llm: Optional[LLM] = None):
+        self.compaction = compaction
+        self.sandbox = sandbox
+        self.llm = llm
+        self.compactions = 0
+        self.chars_saved = 0
+
+    @staticmethod
+    def _split_steps(messages: List[Any]) -> Tuple[List[Any], List[List[Any]]]:
+        """Split messages into the leading system messages and one block per step"""
+        head: List[Any] = []
+        steps: List[List[Any]] = []
+        for message in messages:
+            if _field(message, "role") == "user":
+                steps.append([message])
+            elif steps:
+                steps[-1].append(message)
+            else:
+                head.append(message)
+        return head, steps
+
+    @staticmethod
+    def _render_transcript(steps: List[List[Any]]) -> str:
+        lines = []
+        for message in (message for step in steps for message in step):
+            role = _field(message, "role")
+            lines.append(f"[{role}]")
+            if _field(message, "content"):
+                lines.append(str(_field(message, "content")))
+            for _, name, arguments in _tool_calls(message):
+                lines.append(f"call {name}({arguments})")
+            lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _summarize_step(step: List[Any]) -> str:
+        """Summarize a step by rules: its description, tool calls with their outcome and its result"""
+        request = str(_field(step[0], "content") or "")
+        if request.startswith(SUMMARY_HEADER):
+            # Summary of an earlier compaction, kept without its header
+            return request.split("\n\n", 1)[-1]
+
+        calls = {}
+        actions = []
+        result = ""
+        for message in step[1:]:
+            role = _field(message, "role")
+            if role == "assistant":
+                for call_id, name, arguments in _tool_calls(message):
+                    calls[call_id] = (name, arguments)
+                if _field(message, "content") and not _tool_calls(message):
+                    result = str(_field(message, "content"))
+            elif role == "tool":
+                name, arguments = calls.get(_field(message, "tool_call_id"), ("unknown", ""))
+                try:
+                    outcome = json.loads(_field(message, "content"))
+                    status = "ok" if outcome.get("success") else f"failed: {_shorten(outcome.get('message') or '', 100)}"
+                except (TypeError, ValueError, AttributeError):
+                    status = "done"
+                actions.append(f"{name}({_shorten(arguments, 120)}) {status}")
+
+        description = request.rsplit("Step:", 1)[-1]
+        summary = f"Step: {_shorten(description, 300)}"
+        if actions:
+            summary += "\nActions: " + "; ".join(actions)
+        if result:
+            summary += f"\nResult: {_shorten(result, 600)}"
+        return summary
+
+    def _summarize_by_rules(self, steps: List[List[Any]]) -> str:
+        # Step summaries hold no blank lines, so an earlier summary splits into its steps again
+        summaries = "\n\n".join(self._summarize_step(step) for step in steps).split("\n\n")
+        # Keep the summary well below the limit so it does not trigger compaction by itself
+        omitted = 0
+        while len(summaries) > 1 and sum(len(summary) for summary in summaries) > self.compaction.max_chars // 4:
+            summaries.pop(0)
+            omitted += 1
+        if omitted:
+            summaries.insert(0, f"[{omitted} earlier steps omitted, they are in the transcript]")
+        return "\n\n".join(summaries)
+
+    async def _summarize_with_llm(self, transcript: str) -> Optional[str]:
+        # Bound the summary request like any request made with the memory
+        if len(transcript) > self.compaction.max_chars:
+            half = self.compaction.max_chars // 2
+            transcript = f"{transcript[:half]}\n... [log shortened] ...\n{transcript[-half:]}"
+        try:
+            message = await self.llm.ask([
+                {"role": "system", "content": COMPACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": COMPACTION_PROMPT.format(transcript=transcript)},
+            ])
+            return message.content
+        except Exception as e:
+            logger.warning(f"Failed to summarize memory with LLM, summarizing by rules: {str(e)}")
+            return None
+
+    async def _save_transcript(self, transcript: str) -> Optional[str]:
+        path = f"{self.compaction.transcript_dir}/steps-{uuid.uuid4().hex[:8]}.md"
+        try:
+            result = await self.sandbox.file_write(path, transcript)
+            if result.success:
+                return path
+            logger.warning(f"Failed to save transcript of compacted steps: {result.message}")
+        except Exception as e:
+            logger.warning(f"Failed to save transcript of compacted steps: {str(e)}")
+        return None
+
+    async def compact(self, memory: Memory) -> bool:
+        """Summarize the earlier steps of a memory if it exceeds the size limit
+
+        Args:
+            memory: Execution memory, compacted in place
+
+        Returns:
+            Whether the memory was compacted
+        """
+        chars = sum(message_chars(message) for message in memory.messages)
+        if chars <= self.compaction.max_chars:
+            return False
+        head, steps = self._split_steps(memory.messages)
+        keep = max(0, self.compaction.keep_steps)
+        compacted, kept = (steps[:-keep], steps[-keep:]) if keep else (steps, [])
+        if not compacted or (len(compacted) == 1 and str(_field(compacted[0][0], "content")).startswith(SUMMARY_HEADER)):
+            return False
+
+        with tracer.span("memory.compact", **{"memory.chars": chars, "memory.steps": len(compacted)}) as span:
+            transcript = self._render_transcript(compacted)
+            path = await self._save_transcript(transcript)
+            summary = None
+            if self.compaction.summarizer == "llm" and self.llm:
+                summary = await self._summarize_with_llm(transcript)
+            if not summary:
+                summary = self._summarize_by_rules(compacted)
+            note = (f"{SUMMARY_HEADER}, the full transcript is saved to {path}, use file_read on it if details are needed:"
+                    if path else f"{SUMMARY_HEADER}:")
+            memory.messages = head + [{"role": "user", "content": f"{note}\n\n{summary}"}] + [
+                message for step in kept for message in step
+            ]
+
+            saved = chars - sum(message_chars(message) for message in memory.messages)
+            span.set(**{"memory.chars_saved": saved})
+        self.compactions += 1
+        self.chars_saved += saved
+        logger.info(
+            f"Compacted {len(compacted)} steps of execution memory from {chars} characters, "
+            f"~{saved // CHARS_PER_TOKEN} tokens saved"
+        )
+        return True
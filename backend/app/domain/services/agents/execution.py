@@ -1,4 +1,4 @@
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Dict, Any
 import json
 from app.domain.models.plan import Plan, Step, ExecutionStatus
 from app.domain.services.agents.base import BaseAgent
@@ -7,7 +7,7 @@ from app.domain.external.llm import LLM
 from app.domain.external.sandbox import Sandbox
 from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
-from app.domain.services.prompts.execution import EXECUTION_SYSTEM_PROMPT, EXECUTION_PROMPT
+from app.domain.services.prompts.execution import EXECUTION_SYSTEM_PROMPT, EXECUTION_PROMPT, STEP_SCOPED_EXECUTION_PROMPT
 from app.domain.models.event import (
     AgentEvent,
     StepFailedEvent,
@@ -21,6 +21,18 @@ from app.domain.services.tools.browser import BrowserTool
 from app.domain.services.tools.search import SearchTool
 from app.domain.services.tools.file import FileTool
 from app.domain.services.tools.message import MessageTool
+from app.domain.services.tools.scratchpad import ScratchpadTool
+from app.domain.services.tools.base import BaseTool
+from app.domain.services.agents.leases import ResourceLeases
+from app.domain.services.agents.output_budget import ToolOutputBudget, ToolOutputGovernor
+from app.domain.services.agents.compaction import MemoryCompaction, MemoryCompactor
+from app.domain.services.usage import usage_meter
+from app.domain.models.tool_result import ToolResult
+from app.domain.models.scratchpad import Scratchpad
+
+
+# Characters of each earlier step result in the prompt of a step started from fresh memory
+STEP_RESULT_CHARS = 1000
 
 
 class ExecutionAgent(BaseAgent):
@@ -37,6 +49,11 @@ class ExecutionAgent(BaseAgent):
         sandbox: Sandbox,
         browser: Browser,
         search_engine: Optional[SearchEngine] = None,
+        resource_leases: Optional[ResourceLeases] = None,
+        output_budget: Optional[ToolOutputBudget] = None,
+        memory_compaction: Optional[MemoryCompaction] = None,
+        summarizer_llm: Optional[LLM] = None,
+        scratchpad: Optional[Scratchpad] = None,
     ):
         super().__init__(memory, llm, [   
             ShellTool(sandbox),
@@ -47,23 +64,95 @@ class ExecutionAgent(BaseAgent):
         
         # Only add search tool when search_engine is not None
         if search_engine:
-            self.tools.append(SearchTool(search_engine))
+            self.add_tool(SearchTool(search_engine))
+
+        # With a scratchpad, each step starts from fresh memory and earlier steps pass on facts through it
+        self.scratchpad = scratchpad
+        if scratchpad is not None:
+            self.add_tool(ScratchpadTool(scratchpad))
+
+        # Leases shared with agents executing other steps concurrently, if any
+        self.resource_leases = resource_leases
+        self.current_step: Optional[Step] = None
+        self.output_governor = ToolOutputGovernor(output_budget, sandbox) if output_budget else None
+        self.memory_compactor = MemoryCompactor(memory_compaction, sandbox, summarizer_llm) if memory_compaction else None
+
+    async def compact_memory(self) -> bool:
+        """Summarize earlier steps once the memory grows past the compaction limit"""
+        if not self.memory_compactor:
+            return False
+        return await self.memory_compactor.compact(self.memory)
+
+    def prepare_tool_arguments(self, tool: BaseTool, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        # Keep shell sessions of concurrently executed steps apart
+        if self.resource_leases and self.current_step and tool.name == "shell" and "id" in arguments:
+            prefix = f"step-{self.current_step.id}-"
+            if not str(arguments["id"]).startswith(prefix):
+                arguments = {**arguments, "id": f"{prefix}{arguments['id']}"}
+        return arguments
+
+    async def format_tool_result(self, tool: BaseTool, function_name: str, result: ToolResult) -> str:
+        if self.output_governor:
+            return await self.output_governor.format(tool.name, function_name, result)
+        return await super().format_tool_result(tool, function_name, result)
+
+    async def execute_tool(self, tool: BaseTool, function_name: str, arguments: Dict[str, Any]) -> ToolResult:
+        # The browser page is stateful, only one concurrently executed step may drive it
+        if self.resource_leases and self.current_step and tool.name == "browser":
+            await self.resource_leases.acquire(tool.name, self.current_step.id)
+        return await super().execute_tool(tool, function_name, arguments)
     
+    @property
+    def step_scoped(self) -> bool:
+        """Whether each step starts from fresh memory"""
+        return self.scratchpad is not None
+
+    @staticmethod
+    def _render_completed_steps(plan: Plan, current: Step) -> str:
+        lines = []
+        for step in plan.steps:
+            if step is current or not step.is_done():
+                continue
+            outcome = step.result if step.status == ExecutionStatus.COMPLETED else f"Failed: {step.error or ''}"
+            outcome = " ".join((outcome or "").split())
+            if len(outcome) > STEP_RESULT_CHARS:
+                outcome = outcome[:STEP_RESULT_CHARS] + "..."
+            lines.append(f"- Step {step.id}: {step.description}\n  Result: {outcome}")
+        return "\n".join(lines) or "(none)"
+
     async def execute_step(self, plan: Plan, step: Step) -> AsyncGenerator[AgentEvent, None]:
-        message = EXECUTION_PROMPT.format(goal=plan.goal, step=step.description)
+        if self.step_scoped:
+            # Bound the prompt by the plan's results instead of every tool call made for it
+            self.memory.clear_messages()
+            self.memory.add_message({"role": "system", "content": self.system_prompt})
+            message = STEP_SCOPED_EXECUTION_PROMPT.format(
+                goal=plan.goal,
+                completed_steps=self._render_completed_steps(plan, step),
+                scratchpad=self.scratchpad.render(),
+                step=step.description
+            )
+        else:
+            message = EXECUTION_PROMPT.format(goal=plan.goal, step=step.description)
         step.status = ExecutionStatus.RUNNING
+        self.current_step = step
         yield StepStartedEvent(step=step, plan=plan)
-        async for event in self.execute(message):
-            if isinstance(event, ErrorEvent):
-                step.status = ExecutionStatus.FAILED
-                step.error = event.error
-                yield StepFailedEvent(step=step, plan=plan)
-                return
-            
-            if isinstance(event, MessageEvent):
-                step.status = ExecutionStatus.COMPLETED
-                step.result = event.message
-                yield StepCompletedEvent(step=step, plan=plan)
-            yield event
-        step.status = ExecutionStatus.COMPLETED
+        try:
+            with usage_meter.step(step.id):
+                async for event in self.execute(message):
+                    if isinstance(event, ErrorEvent):
+                        step.status = ExecutionStatus.FAILED
+                        step.error = event.error
+                        yield StepFailedEvent(step=step, plan=plan)
+                        return
+                    
+                    if isinstance(event, MessageEvent):
+                        step.status = ExecutionStatus.COMPLETED
+                        step.result = event.message
+                        yield StepCompletedEvent(step=step, plan=plan)
+                    yield event
+            step.status = ExecutionStatus.COMPLETED
+        finally:
+            if self.resource_leases:
+                self.resource_leases.release_all(step.id)
+            self.current_step = None
 
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Dict
+
+
+class ResourceLeases:
+    """Exclusive resources shared by concurrently executed steps
+
+    A step acquires a resource on first use and holds it until the step finishes, so
+    stateful resources such as the browser page are never interleaved between steps.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, str] = {}
+
+    async def acquire(self, resource: str, holder: str) -> None:
+        """Acquire a resource for a holder, waiting until other holders release it"""
+        if self._holders.get(resource) == holder:
+            return
+        lock = self._locks.setdefault(resource, asyncio.Lock())
+        await lock.acquire()
+        self._holders[resource] = holder
+
+    def release_all(self, holder: str) -> None:
+        """Release all resources held by a holder"""
+        for resource, current_holder in list(self._holders.items()):
+            if current_holder == holder:
+                del self._holders[resource]
+                self._locks[resource].release()
@@ -0,0 +1,124 @@
+import json
+import uuid
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from app.domain.external.sandbox import Sandbox
+from app.domain.models.tool_result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, to report the context saved by truncation
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class ToolOutputBudget:
+    """Maximum size of tool results kept in agent memory"""
+    default_chars: int = 8000  # Budget of tools without their own, 0 to keep results whole
+    tool_chars: Dict[str, int] = field(default_factory=dict)  # Budgets by tool name, e.g. shell or browser
+    spill_dir: str = "/tmp/tool_outputs"  # Sandbox directory full outputs of truncated results are saved to
+
+    def get_limit(self, tool_name: str) -> int:
+        return self.tool_chars.get(tool_name, self.default_chars)
+
+
+class ToolOutputGovernor:
+    """Keep oversized tool results out of agent memory
+
+    A result larger than its tool's budget is saved whole to a file in the sandbox and replaced in
+    memory by its head and tail, with the file path so the agent can page through the rest with
+    the file tools.
+    """
+
+    def __init__(self, budget: ToolOutputBudget, sandbox: Sandbox):
+        self.budget = budget
+        self.sandbox = sandbox
+        self.truncated_results = 0
+        self.chars_saved = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated tokens kept out of memory, and so out of every later LLM request"""
+        return self.chars_saved // CHARS_PER_TOKEN
+
+    @staticmethod
+    def _to_text(data: Any) -> str:
+        """Render result data with its strings unescaped, so the saved file can be read by line"""
+        if isinstance(data, str):
+            return data
+        if isinstance(data, dict):
+            return "\n".join(
+                f"[{key}]\n{value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=2, default=str)}"
+                for key, value in data.items()
+            )
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str)
+
+    @staticmethod
+    def _head_tail(text: str, head_chars: int, tail_chars: int) -> str:
+        """Keep the beginning and end of a text, cut at line boundaries where possible"""
+        head = text[:head_chars]
+        cut = head.rfind("\n")
+        if cut > head_chars // 2:
+            head = head[:cut]
+        tail = text[-tail_chars:] if tail_chars else ""
+        cut = tail.find("\n")
+        if 0 <= cut < tail_chars // 2:
+            tail = tail[cut + 1:]
+        omitted = len(text) - len(head) - len(tail)
+        return f"{head}\n... [{omitted} characters omitted] ...\n{tail}"
+
+    async def _spill(self, function_name: str, text: str) -> Optional[str]:
+        path = f"{self.budget.spill_dir}/{function_name}-{uuid.uuid4().hex[:8]}.txt"
+        try:
+            result = await self.sandbox.file_write(path, text)
+            if result.success:
+                return path
+            logger.warning(f"Failed to save full output of {function_name}: {result.message}")
+        except Exception as e:
+            logger.warning(f"Failed to save full output of {function_name}: {str(e)}")
+        return None
+
+    async def format(self, tool_name: str, function_name: str, result: ToolResult) -> str:
+        """Render a tool result as the content of its tool message
+
+        Args:
+            tool_name: Name of the tool
+            function_name: Name of the called function
+            result: Tool result
+
+        Returns:
+            Result JSON, truncated to the tool's budget
+        """
+        content = result.model_dump_json()
+        limit = self.budget.get_limit(tool_name)
+        if not limit or len(content) <= limit:
+            return content
+
+        text = self._to_text(result.data)
+        path = await self._spill(function_name, text)
+        # Leave room for the success flag, message and truncation note within the budget
+        room = max(limit - len(result.message or "") - 400, limit // 4)
+        truncated = {
+            "success": result.success,
+            "message": result.message,
+            "data": self._head_tail(text, room * 2 // 3, room // 3),
+            "truncated": {
+                "total_chars": len(text),
+                "total_lines": text.count("\n") + 1,
+                "full_output_file": path,
+                "note": (f"Output truncated, the full output is saved to {path}. "
+                         "Use file_read with start_line and end_line to view other parts of it."
+                         if path else "Output truncated, the full output could not be saved.")
+            }
+        }
+        governed = json.dumps(truncated, ensure_ascii=False)
+
+        saved = len(content) - len(governed)
+        self.truncated_results += 1
+        self.chars_saved += saved
+        logger.info(
+            f"Truncated {function_name} result from {len(content)} to {len(governed)} characters, "
+            f"~{saved // CHARS_PER_TOKEN} tokens saved, ~{self.tokens_saved} in total"
+        )
+        return governed
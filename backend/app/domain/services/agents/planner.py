@@ -34,8 +34,11 @@ class PlannerAgent(BaseAgent):
         self,
         memory: Memory,
         llm: LLM,
+        update_llm: Optional[LLM] = None,
     ):
         super().__init__(memory, llm)
+        # Plan updates can be routed to a cheaper model than plan creation
+        self.update_llm = update_llm or llm
 
 
     async def create_plan(self, message: Optional[str] = None) -> AsyncGenerator[AgentEvent, None]:
@@ -44,35 +47,53 @@ class PlannerAgent(BaseAgent):
             if isinstance(event, MessageEvent):
                 logger.info(event.message)
                 parsed_response = json.loads(event.message)
-                steps = [Step(id=step["id"], description=step["description"]) for step in parsed_response["steps"]]
+                steps = [Step(id=step["id"], description=step["description"], dependencies=step.get("dependencies")) for step in parsed_response["steps"]]
                 plan = Plan(id=f"plan_{len(steps)}", goal=parsed_response["goal"], title=parsed_response["title"], steps=steps, message=parsed_response["message"], todo=parsed_response.get("todo", ""))
                 yield PlanCreatedEvent(plan=plan)
             else:
                 yield event
 
     async def update_plan(self, plan: Plan) -> AsyncGenerator[AgentEvent, None]:
-        message = UPDATE_PLAN_PROMPT.format(plan=plan.model_dump_json(include={"steps"}), goal=plan.goal)
-        async for event in self.execute(message):
+        completed = ", ".join(step.id for step in plan.steps if step.is_done()) or "none"
+        message = UPDATE_PLAN_PROMPT.format(plan=plan.model_dump_json(include={"steps"}), goal=plan.goal, completed=completed)
+        async for event in self.execute(message, self.update_llm):
             if isinstance(event, MessageEvent):
                 parsed_response = json.loads(event.message)
-                new_steps = [Step(id=step["id"], description=step["description"]) for step in parsed_response["steps"]]
-                
-                # Find the index of the first pending step
-                first_pending_index = None
-                for i, step in enumerate(plan.steps):
-                    if not step.is_done():
-                        first_pending_index = i
-                        break
-                
-                # If there are pending steps, replace all pending steps
-                if first_pending_index is not None:
-                    # Keep completed steps
-                    updated_steps = plan.steps[:first_pending_index]
-                    # Add new steps
-                    updated_steps.extend(new_steps)
-                    # Update steps in plan
-                    plan.steps = updated_steps
-                
+                new_steps = [Step(id=step["id"], description=step["description"], dependencies=step.get("dependencies")) for step in parsed_response["steps"]]
+                plan.steps = self._merge_steps(plan.steps, new_steps)
                 yield PlanUpdatedEvent(plan=plan)
             else:
-                yield event
\ No newline at end of file
+                yield event
+
+    @staticmethod
+    def _merge_steps(steps: List[Step], new_steps: List[Step]) -> List[Step]:
+        """Merge the steps of a plan update into the plan's steps
+
+        Steps can complete out of order, so done steps are kept wherever they are and steps of the
+        update reusing the id of a done step are dropped. Pending steps are replaced by the step of
+        the update with their id, or removed if the update left them out. Steps the update added
+        are inserted after the step preceding them in the update.
+
+        Args:
+            steps: Current steps of the plan
+            new_steps: Uncompleted steps returned by the plan update
+
+        Returns:
+            Updated steps of the plan
+        """
+        done_ids = {step.id for step in steps if step.is_done()}
+        new_steps = [step for step in new_steps if step.id not in done_ids]
+        replacements = {step.id: step for step in new_steps}
+        merged = [step if step.is_done() else replacements[step.id] for step in steps
+                  if step.is_done() or step.id in replacements]
+        merged_ids = [step.id for step in merged]
+        # Added steps without a preceding step in the update go after the last done step
+        position = max((index + 1 for index, step in enumerate(merged) if step.is_done()), default=0)
+        for step in new_steps:
+            if step.id in merged_ids:
+                position = merged_ids.index(step.id) + 1
+                continue
+            merged.insert(position, step)
+            merged_ids.insert(position, step.id)
+            position += 1
+        return merged
@@ -0,0 +1,178 @@
+import asyncio
+import bisect
+import itertools
+import logging
+from typing import AsyncGenerator, Dict, List, Optional, Set
+from app.domain.models.event import (
+    AgentEvent,
+    PlanUpdatedEvent,
+    StepStartedEvent,
+    StepCompletedEvent,
+    StepFailedEvent,
+    ToolCallingEvent,
+    ToolCalledEvent
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AgentEventLog:
+    """Append-only, bounded log of an agent's events with monotonically increasing IDs
+
+    Any number of readers can follow the log concurrently, and a reader that reconnects
+    can resume after the last event it has seen, as long as that event is still retained.
+
+    To keep memory flat, superseded events are coalesced: an older plan update is dropped
+    when a newer one is appended, a step's started event is dropped once the step finishes,
+    and while no reader is attached only the latest of consecutive tool events is kept.
+    When an attached reader falls too far behind, appending waits for it to catch up. A reader
+    that does not catch up in time no longer holds back appends until it has caught up again,
+    reading on from the last event it consumed.
+    """
+
+    def __init__(self, max_size: int = 1000, backpressure_threshold: Optional[int] = None,
+                 backpressure_timeout: float = 30):
+        """Initialize event log
+
+        Args:
+            max_size: Maximum number of retained events, older events are dropped first
+            backpressure_threshold: Number of unread events after which appending waits for slow
+                readers, defaults to half of max_size
+            backpressure_timeout: Maximum seconds an append waits for slow readers
+        """
+        self.max_size = max_size
+        self.backpressure_threshold = backpressure_threshold or max(1, max_size // 2)
+        self.backpressure_timeout = backpressure_timeout
+        self._events: List[AgentEvent] = []
+        self._last_id = 0
+        self._closed = False
+        # Position of each attached reader, the ID of the last event it consumed
+        self._readers: Dict[int, int] = {}
+        self._reader_ids = itertools.count()
+        # Readers that did not catch up within the backpressure timeout, appends do not wait for them
+        self._stalled_readers: Set[int] = set()
+        # Replaced on every change, waiters are woken by setting the previous one
+        self._appended = asyncio.Event()
+        self._read = asyncio.Event()
+
+    @property
+    def last_id(self) -> int:
+        """ID of the latest event, 0 if no event has been appended"""
+        return self._last_id
+
+    @property
+    def first_id(self) -> int:
+        """ID of the oldest retained event"""
+        return self._events[0].id if self._events else self._last_id + 1
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @staticmethod
+    def _notify(event: asyncio.Event) -> asyncio.Event:
+        event.set()
+        return asyncio.Event()
+
+    def _coalesce(self, event: AgentEvent) -> None:
+        """Drop retained events superseded by the event about to be appended"""
+        if isinstance(event, PlanUpdatedEvent):
+            self._events = [e for e in self._events if not isinstance(e, PlanUpdatedEvent)]
+        elif isinstance(event, (StepCompletedEvent, StepFailedEvent)):
+            self._events = [
+                e for e in self._events
+                if not (isinstance(e, StepStartedEvent) and e.step.id == event.step.id)
+            ]
+        elif isinstance(event, (ToolCallingEvent, ToolCalledEvent)) and not self._readers:
+            # Nobody is watching, intermediate tool events are not worth keeping for replay.
+            # Message tool events carry messages to the user and are always kept.
+            previous = self._events[-1] if self._events else None
+            if (isinstance(previous, (ToolCallingEvent, ToolCalledEvent))
+                    and previous.tool_name != "message" and event.tool_name != "message"):
+                self._events.pop()
+
+    def _lagging_readers(self) -> List[int]:
+        return [
+            reader_id for reader_id, position in self._readers.items()
+            if self._last_id - position >= self.backpressure_threshold and reader_id not in self._stalled_readers
+        ]
+
+    async def append(self, event: AgentEvent) -> int:
+        """Append an event, assigning it the next ID
+
+        Waits while an attached reader has more than the backpressure threshold of unread events,
+        at most once per stall of a reader.
+
+        Args:
+            event: Agent event
+
+        Returns:
+            Event ID
+        """
+        if self._lagging_readers():
+            logger.debug("Event log reader is lagging behind, applying backpressure")
+            try:
+                await asyncio.wait_for(self._wait_for_readers(), self.backpressure_timeout)
+            except asyncio.TimeoutError:
+                stalled = self._lagging_readers()
+                logger.warning(f"{len(stalled)} event log readers did not catch up within {self.backpressure_timeout}s")
+                self._stalled_readers.update(stalled)
+
+        self._coalesce(event)
+        self._last_id += 1
+        event.id = self._last_id
+        self._events.append(event)
+        if len(self._events) > self.max_size:
+            del self._events[:len(self._events) - self.max_size]
+        self._appended = self._notify(self._appended)
+        return event.id
+
+    async def _wait_for_readers(self) -> None:
+        while self._lagging_readers() and not self._closed:
+            await self._read.wait()
+
+    def close(self) -> None:
+        """Stop all readers once they have read the retained events"""
+        self._closed = True
+        self._appended = self._notify(self._appended)
+        self._read = self._notify(self._read)
+
+    def _advance(self, reader_id: int, position: int) -> None:
+        self._readers[reader_id] = position
+        if position >= self._last_id:
+            self._stalled_readers.discard(reader_id)
+        self._read = self._notify(self._read)
+
+    async def read(self, after_id: int = 0) -> AsyncGenerator[AgentEvent, None]:
+        """Read events after the given ID, then follow new events until the log is closed
+
+        Args:
+            after_id: ID of the last event already seen by the reader, 0 to read all retained events
+        """
+        # IDs beyond the log, e.g. from before a restart, resume from the latest event
+        after_id = min(after_id, self._last_id)
+        if after_id < self.first_id - 1:
+            logger.warning(f"Events {after_id + 1} to {self.first_id - 1} are no longer retained")
+        reader_id = next(self._reader_ids)
+        self._advance(reader_id, after_id)
+        try:
+            while True:
+                appended = self._appended
+                # Copy pending events, the log may change while the reader is suspended
+                start = bisect.bisect_right(self._events, after_id, key=lambda e: e.id)
+                for event in self._events[start:]:
+                    after_id = event.id
+                    yield event
+                    self._advance(reader_id, after_id)
+                if self._events and self._events[-1].id > after_id:
+                    continue
+                if after_id < self._last_id:
+                    # The remaining events were coalesced away while the reader was suspended
+                    after_id = self._last_id
+                    self._advance(reader_id, after_id)
+                if self._closed:
+                    return
+                await appended.wait()
+        finally:
+            self._readers.pop(reader_id, None)
+            self._stalled_readers.discard(reader_id)
+            self._read = self._notify(self._read)
@@ -2,7 +2,7 @@ import logging
 from app.domain.services.flows.base import BaseFlow
 from app.domain.models.agent import Agent
 from app.domain.models.event import AgentEvent
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional, List
 from enum import Enum
 from app.domain.models.event import (
     AgentEvent, 
@@ -10,10 +10,19 @@ from app.domain.models.event import (
     PlanCompletedEvent,
     DoneEvent
 )
-from app.domain.models.plan import ExecutionStatus
+from app.domain.models.plan import ExecutionStatus, Step, Plan
+from app.domain.models.memory import Memory
 from app.domain.services.agents.planner import PlannerAgent
 from app.domain.services.agents.execution import ExecutionAgent
-from app.domain.external.llm import LLM
+from app.domain.services.flows.update_policy import PlanUpdatePolicy, AlwaysUpdatePolicy
+from app.domain.services.flows.step_scheduler import StepScheduler
+from app.domain.services.agents.leases import ResourceLeases
+from app.domain.services.agents.output_budget import ToolOutputBudget
+from app.domain.services.agents.compaction import MemoryCompaction
+from app.domain.services.tracing import tracer
+from app.domain.services.usage import usage_meter
+from app.domain.external.llm import LLMRouter
+from app.domain.models.llm import LLMCallSite
 from app.domain.external.sandbox import Sandbox
 from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
@@ -28,27 +37,70 @@ class AgentStatus(str, Enum):
     UPDATING = "updating"
 
 class PlanActFlow(BaseFlow):
-    def __init__(self, agent: Agent, llm: LLM, sandbox: Sandbox, browser: Browser, search_engine: SearchEngine):
+    def __init__(self, agent: Agent, llm_router: LLMRouter, sandbox: Sandbox, browser: Browser, search_engine: SearchEngine,
+                 update_policy: Optional[PlanUpdatePolicy] = None, max_parallel_steps: int = 1,
+                 output_budget: Optional[ToolOutputBudget] = None,
+                 memory_compaction: Optional[MemoryCompaction] = None, step_scoped_memory: bool = False):
         super().__init__(agent)
         self.status = AgentStatus.IDLE
         self.plan = None
+        self.update_policy = update_policy or AlwaysUpdatePolicy()
+        self.max_parallel_steps = max(1, max_parallel_steps)
+        # Steps share the agent's scratchpad instead of one execution memory
+        scratchpad = agent.scratchpad if step_scoped_memory else None
         # 创建计划代理和执行代理
         self.planner = PlannerAgent(
-            llm=llm,
+            llm=llm_router.get_llm(LLMCallSite.PLANNER),
+            update_llm=llm_router.get_llm(LLMCallSite.UPDATER),
             memory=agent.planner_memory,
         )
         logger.debug(f"Created planner agent for Agent {self.agent.id}")
         
         self.executor = ExecutionAgent(
-            llm=llm,
+            llm=llm_router.get_llm(LLMCallSite.EXECUTOR),
             memory=agent.execution_memory,
             sandbox=sandbox,
             browser=browser,
             search_engine=search_engine,
+            output_budget=output_budget,
+            memory_compaction=memory_compaction,
+            summarizer_llm=llm_router.get_llm(LLMCallSite.SUMMARIZER),
+            scratchpad=scratchpad,
         )
         logger.debug(f"Created execution agent for Agent {self.agent.id}")
 
-        
+        # Independent steps run concurrently on their own execution agents, sharing the sandbox and browser
+        resource_leases = ResourceLeases()
+        self.scheduler = StepScheduler(lambda: ExecutionAgent(
+            llm=llm_router.get_llm(LLMCallSite.EXECUTOR),
+            memory=Memory(),
+            sandbox=sandbox,
+            browser=browser,
+            search_engine=search_engine,
+            resource_leases=resource_leases,
+            output_budget=output_budget,
+            scratchpad=scratchpad,
+        ))
+
+    def _get_next_steps(self) -> List[Step]:
+        """Get the steps to execute next, several independent steps when parallel execution is enabled"""
+        if self.max_parallel_steps > 1:
+            steps = self.plan.get_ready_steps(self.max_parallel_steps)
+            if steps:
+                return steps
+        # Fall back to plan order, which also breaks dependency cycles
+        step = self.plan.get_next_step()
+        return [step] if step else []
+
+    def _remember_step_results(self, steps: List[Step]) -> None:
+        """Share results of concurrently executed steps with the main execution agent"""
+        results = "\n\n".join(
+            f"Step {step.id}: {step.description}\nResult: {step.result or step.error or ''}" for step in steps
+        )
+        self.executor.memory.add_message({
+            "role": "user",
+            "content": f"The following steps were executed in parallel:\n\n{results}"
+        })
 
     async def run(self, message: str) -> AsyncGenerator[AgentEvent, None]:
         if not self.is_idle():
@@ -58,50 +110,95 @@ class PlanActFlow(BaseFlow):
             self.executor.roll_back()
 
         logger.info(f"Agent {self.agent.id} started processing message: {message[:50]}...")
-        step = None
-        while True:
-            if self.status == AgentStatus.IDLE:
-                logger.info(f"Agent {self.agent.id} state changed from {AgentStatus.IDLE} to {AgentStatus.PLANNING}")
-                self.status = AgentStatus.PLANNING
-            elif self.status == AgentStatus.PLANNING:
-                # 创建计划
-                logger.info(f"Agent {self.agent.id} started creating plan")
-                async for event in self.planner.create_plan(message):
-                    if isinstance(event, PlanCreatedEvent):
-                        self.plan = event.plan
-                        logger.info(f"Agent {self.agent.id} created plan successfully with {len(event.plan.steps)} steps")
-                    yield event
-                logger.info(f"Agent {self.agent.id} state changed from {AgentStatus.PLANNING} to {AgentStatus.EXECUTING}")
-                self.status = AgentStatus.EXECUTING
+        async for event in self._run(message):
+            yield event
+
+    def restore(self, plan: Optional[Plan], status: AgentStatus) -> None:
+        """Restore flow state from a checkpoint"""
+        self.plan = plan
+        if plan:
+            # Steps interrupted by the restart are executed again
+            for step in plan.steps:
+                if step.status == ExecutionStatus.RUNNING:
+                    step.status = ExecutionStatus.PENDING
+        # Planning cannot be resumed without the original message
+        if status == AgentStatus.PLANNING or (status != AgentStatus.IDLE and plan is None):
+            status = AgentStatus.IDLE
+        self.status = status
+
+    async def resume(self) -> AsyncGenerator[AgentEvent, None]:
+        """Continue a restored flow from its last state"""
+        if self.is_idle():
+            return
+        logger.info(f"Agent {self.agent.id} resuming flow from state {self.status}")
+        async for event in self._run(None):
+            yield event
+
+    async def _run(self, message: Optional[str]) -> AsyncGenerator[AgentEvent, None]:
+        with tracer.span("flow.run", **{"agent.id": self.agent.id}), usage_meter.agent(self.agent.usage):
+            while True:
+                # Each stint in a state is recorded as a span, ended by the transition to the next state
+                with tracer.span(f"flow.{self.status.value}") as state_span:
+                    if self.status == AgentStatus.IDLE:
+                        logger.info(f"Agent {self.agent.id} state changed from {AgentStatus.IDLE} to {AgentStatus.PLANNING}")
+                        self.status = AgentStatus.PLANNING
+                    elif self.status == AgentStatus.PLANNING:
+                        # 创建计划
+                        logger.info(f"Agent {self.agent.id} started creating plan")
+                        async for event in self.planner.create_plan(message):
+                            if isinstance(event, PlanCreatedEvent):
+                                self.plan = event.plan
+                                self.agent.usage.by_step.clear()
+                                self.update_policy.reset()
+                                logger.info(f"Agent {self.agent.id} created plan successfully with {len(event.plan.steps)} steps")
+                            yield event
+                        logger.info(f"Agent {self.agent.id} state changed from {AgentStatus.PLANNING} to {AgentStatus.EXECUTING}")
+                        self.status = AgentStatus.EXECUTING
                     
-            elif self.status == AgentStatus.EXECUTING:
-                # 执行计划
-                self.plan.status = ExecutionStatus.RUNNING
-                step = self.plan.get_next_step()
-                if not step:
-                    logger.info(f"Agent {self.agent.id} has no more steps, state changed from {AgentStatus.EXECUTING} to {AgentStatus.COMPLETED}")
-                    self.status = AgentStatus.COMPLETED
-                    continue
-                # 执行步骤
-                logger.info(f"Agent {self.agent.id} started executing step {step.id}: {step.description[:50]}...")
-                async for event in self.executor.execute_step(self.plan, step):
-                    yield event
-                logger.info(f"Agent {self.agent.id} completed step {step.id}, state changed from {AgentStatus.EXECUTING} to {AgentStatus.UPDATING}")
-                self.status = AgentStatus.UPDATING
-            elif self.status == AgentStatus.UPDATING:
-                # 更新计划
-                logger.info(f"Agent {self.agent.id} started updating plan")
-                async for event in self.planner.update_plan(self.plan):
-                    yield event
-                logger.info(f"Agent {self.agent.id} plan update completed, state changed from {AgentStatus.UPDATING} to {AgentStatus.EXECUTING}")
-                self.status = AgentStatus.EXECUTING
-            elif self.status == AgentStatus.COMPLETED:
-                self.plan.status = ExecutionStatus.COMPLETED
-                logger.info(f"Agent {self.agent.id} plan has been completed")
-                yield PlanCompletedEvent(plan=self.plan) 
-                self.status = AgentStatus.IDLE
-                break
-        yield DoneEvent()
+                    elif self.status == AgentStatus.EXECUTING:
+                        # 执行计划
+                        self.plan.status = ExecutionStatus.RUNNING
+                        steps = self._get_next_steps()
+                        if not steps:
+                            logger.info(f"Agent {self.agent.id} has no more steps, state changed from {AgentStatus.EXECUTING} to {AgentStatus.COMPLETED}")
+                            self.status = AgentStatus.COMPLETED
+                            continue
+                        # 执行步骤
+                        step_ids = ", ".join(step.id for step in steps)
+                        state_span.set(**{"flow.steps": step_ids})
+                        if len(steps) == 1:
+                            step = steps[0]
+                            logger.info(f"Agent {self.agent.id} started executing step {step.id}: {step.description[:50]}...")
+                            async for event in self.executor.execute_step(self.plan, step):
+                                yield event
+                        else:
+                            logger.info(f"Agent {self.agent.id} started executing steps {step_ids} in parallel")
+                            async for event in self.scheduler.run(self.plan, steps):
+                                yield event
+                            if not self.executor.step_scoped:
+                                self._remember_step_results(steps)
+                        # Later steps run against a summary of the earlier ones once memory grows too large
+                        await self.executor.compact_memory()
+                        # Evaluate the policy for every step so stateful policies count them all
+                        if not any([self.update_policy.should_update(self.plan, step) for step in steps]):
+                            logger.info(f"Agent {self.agent.id} completed steps {step_ids}, plan update skipped by {type(self.update_policy).__name__}")
+                            continue
+                        logger.info(f"Agent {self.agent.id} completed steps {step_ids}, state changed from {AgentStatus.EXECUTING} to {AgentStatus.UPDATING}")
+                        self.status = AgentStatus.UPDATING
+                    elif self.status == AgentStatus.UPDATING:
+                        # 更新计划
+                        logger.info(f"Agent {self.agent.id} started updating plan")
+                        async for event in self.planner.update_plan(self.plan):
+                            yield event
+                        logger.info(f"Agent {self.agent.id} plan update completed, state changed from {AgentStatus.UPDATING} to {AgentStatus.EXECUTING}")
+                        self.status = AgentStatus.EXECUTING
+                    elif self.status == AgentStatus.COMPLETED:
+                        self.plan.status = ExecutionStatus.COMPLETED
+                        logger.info(f"Agent {self.agent.id} plan has been completed")
+                        yield PlanCompletedEvent(plan=self.plan) 
+                        self.status = AgentStatus.IDLE
+                        break
+            yield DoneEvent()
         
         logger.info(f"Agent {self.agent.id} message processing completed")
     
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import AsyncGenerator, Callable, List
+from app.domain.models.plan import Plan, Step, ExecutionStatus
+from app.domain.models.event import AgentEvent, StepFailedEvent
+from app.domain.services.agents.execution import ExecutionAgent
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a step in the merged event queue
+_STEP_FINISHED = object()
+
+
+class StepScheduler:
+    """Execute independent plan steps concurrently, each with its own execution agent and memory"""
+
+    def __init__(self, executor_factory: Callable[[], ExecutionAgent]):
+        """Initialize step scheduler
+
+        Args:
+            executor_factory: Create a fresh execution agent for a step
+        """
+        self.executor_factory = executor_factory
+
+    async def _execute_step(self, plan: Plan, step: Step, queue: asyncio.Queue) -> None:
+        executor = self.executor_factory()
+        try:
+            async for event in executor.execute_step(plan, step):
+                await queue.put(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Step {step.id} failed with exception: {str(e)}")
+            step.status = ExecutionStatus.FAILED
+            step.error = str(e)
+            await queue.put(StepFailedEvent(step=step, plan=plan))
+        finally:
+            await queue.put(_STEP_FINISHED)
+
+    async def run(self, plan: Plan, steps: List[Step]) -> AsyncGenerator[AgentEvent, None]:
+        """Execute steps concurrently and yield their events as they are produced"""
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks = [asyncio.create_task(self._execute_step(plan, step, queue)) for step in steps]
+        remaining = len(tasks)
+        try:
+            while remaining > 0:
+                event = await queue.get()
+                if event is _STEP_FINISHED:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from app.domain.models.plan import Plan, Step, ExecutionStatus
+
+
+class PlanUpdatePolicy(ABC):
+    """Decide whether the plan should be updated after a step has been executed"""
+
+    @abstractmethod
+    def should_update(self, plan: Plan, step: Step) -> bool:
+        """Check if the plan needs an update after the given step
+
+        Args:
+            plan: Current plan
+            step: Step that was just executed
+
+        Returns:
+            Whether the planner should update the remaining steps
+        """
+        pass
+
+    def reset(self) -> None:
+        """Forget the steps seen so far, called when a new plan is created"""
+        pass
+
+
+class AlwaysUpdatePolicy(PlanUpdatePolicy):
+    """Update the plan after every step"""
+
+    def should_update(self, plan: Plan, step: Step) -> bool:
+        return True
+
+
+class OnFailureUpdatePolicy(PlanUpdatePolicy):
+    """Update the plan only when a step fails"""
+
+    def should_update(self, plan: Plan, step: Step) -> bool:
+        return step.status == ExecutionStatus.FAILED
+
+
+class EveryNStepsUpdatePolicy(PlanUpdatePolicy):
+    """Update the plan every N executed steps, or immediately when a step fails"""
+
+    def __init__(self, interval: int = 3):
+        self.interval = max(1, interval)
+        self._steps_since_update = 0
+
+    def should_update(self, plan: Plan, step: Step) -> bool:
+        self._steps_since_update += 1
+        if step.status == ExecutionStatus.FAILED or self._steps_since_update >= self.interval:
+            self._steps_since_update = 0
+            return True
+        return False
+
+    def reset(self) -> None:
+        self._steps_since_update = 0
+
+
+class HeuristicUpdatePolicy(PlanUpdatePolicy):
+    """Update the plan when the step result suggests the remaining steps may no longer be valid
+
+    A step triggers an update when it failed, when its result is large enough to carry
+    information the planner did not have, or when it mentions one of the trigger keywords.
+    """
+
+    DEFAULT_KEYWORDS: List[str] = [
+        "error", "fail", "unable", "cannot", "can't", "not found", "instead", "unexpected",
+        "错误", "失败", "无法", "未找到", "改为",
+    ]
+
+    def __init__(self, max_result_length: int = 2000, keywords: Optional[List[str]] = None):
+        self.max_result_length = max_result_length
+        self.keywords = [keyword.lower() for keyword in (keywords or self.DEFAULT_KEYWORDS)]
+
+    def should_update(self, plan: Plan, step: Step) -> bool:
+        if step.status == ExecutionStatus.FAILED or step.error:
+            return True
+        result = (step.result or "").lower()
+        if len(result) > self.max_result_length:
+            return True
+        return any(keyword in result for keyword in self.keywords)
+
+
+def create_plan_update_policy(
+    policy: str,
+    interval: int = 3,
+    max_result_length: int = 2000,
+    keywords: Optional[List[str]] = None
+) -> PlanUpdatePolicy:
+    """Create a plan update policy by name
+
+    Args:
+        policy: Policy name, one of always, on_failure, every_n, heuristic
+        interval: Number of steps between updates for the every_n policy
+        max_result_length: Result length that triggers an update for the heuristic policy
+        keywords: Result keywords that trigger an update for the heuristic policy
+
+    Returns:
+        Plan update policy instance
+    """
+    if policy == "always":
+        return AlwaysUpdatePolicy()
+    if policy == "on_failure":
+        return OnFailureUpdatePolicy()
+    if policy == "every_n":
+        return EveryNStepsUpdatePolicy(interval)
+    if policy == "heuristic":
+        return HeuristicUpdatePolicy(max_result_length, keywords)
+    raise ValueError(f"Unknown plan update policy: {policy}")
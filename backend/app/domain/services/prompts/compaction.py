@@ -0,0 +1,17 @@
+# Memory compaction prompt
+COMPACTION_SYSTEM_PROMPT = """
+You summarize the work log of an AI agent so it can continue its task without the full log.
+
+<summary_rules>
+- Keep what later steps need: results, facts and figures found, files created or changed with their paths, URLs visited, commands that worked, and errors with their causes
+- Drop tool output that was only needed to make a decision, and repeated or failed attempts that led nowhere
+- Write one short paragraph per step, in the order the steps were executed, in the language of the log
+- Do not add information that is not in the log
+</summary_rules>
+"""
+
+COMPACTION_PROMPT = """
+Summarize the following work log of earlier steps:
+
+{transcript}
+"""
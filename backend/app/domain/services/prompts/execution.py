@@ -105,3 +105,26 @@ Goal:
 Step:
 {step}
 """
+
+# Execution prompt of a step started from fresh memory, carrying what earlier steps left behind
+STEP_SCOPED_EXECUTION_PROMPT = """
+You are executing the following goal and step:
+
+- Don't ask users to provide more information, don't tell how to do the task, determine by yourself.
+- Deliver the final result to user not the todo list, advice or plan.
+- Before and after using a tool, you must use message tool to notify users what you are going to do or have done within one sentence
+- Earlier steps ran in separate contexts, their results and the scratchpad below are all that is known about them
+- Record facts, figures, file paths and URLs that later steps will need with scratchpad_write before finishing the step
+
+Goal:
+{goal}
+
+Completed steps:
+{completed_steps}
+
+Scratchpad:
+{scratchpad}
+
+Step:
+{step}
+"""
@@ -44,6 +44,7 @@ You are now an experienced planner who needs to generate and update plan based o
 - Your next executor has can and can execute shell, edit file, use browser, use search engine, and other software.
 - You need to determine whether a task can be broken down into multiple steps. If it can, return multiple steps; otherwise, return a single step.
 - The final step needs to summarize all steps and provide the final result.
+- Steps that do not need each other's results must not depend on each other, so they can be executed in parallel.
 - You need to ensure the next executor can finish the task.
 </planning_rules>
 """
@@ -55,7 +56,8 @@ Return format requirements are as follows:
 - Return in JSON format, must comply with JSON standards, cannot include any content not in JSON standard
 - JSON fields are as follows:
     - message: string, required, response to user's message and thinking about the task, as detailed as possible
-    - steps: array, each step contains id and description
+    - steps: array, each step contains id, description and dependencies
+    - dependencies: array of ids of the steps that must be completed before the step, empty array if the step can start immediately
     - goal: string, plan goal generated based on the context
     - title: string, plan title generated based on the context
 - If the task is determined to be unfeasible, return an empty array for steps and empty string for goal
@@ -68,7 +70,8 @@ EXAMPLE JSON OUTPUT:
     "steps": [
         {{
             "id": "1",
-            "description": "Step 1 description"
+            "description": "Step 1 description",
+            "dependencies": []
         }}
     ]
 }}
@@ -81,8 +84,10 @@ UPDATE_PLAN_PROMPT = """
 You are updating the plan, you need to update the plan based on the step execution result.
 - You can delete, add or modify the plan steps, but don't change the plan goal
 - Don't change the description if the change is small
-- Only re-plan the following uncompleted steps, don't change the completed steps
-- Output the step id start with the id of first uncompleted step, re-plan the following steps
+- Only re-plan the uncompleted steps, don't change the completed steps
+- Steps can complete out of order, the completed steps are: {completed}
+- Output only uncompleted steps: keep the id of a step you keep or modify, use a new id for a new step
+- Keep the dependencies of each step, listing the ids of the steps that must be completed before it
 
 Input:·
 - plan: the plan steps with json to update
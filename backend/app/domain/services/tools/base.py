@@ -1,5 +1,4 @@
-from typing import Dict, Any, List, Callable
-import inspect
+from typing import Dict, Any, List, Callable, ClassVar
 from app.domain.models.tool_result import ToolResult
 
 def tool(
@@ -43,14 +42,76 @@ def tool(
     
     return decorator
 
+
+# Python types accepted for each JSON schema type of a tool parameter
+_JSON_TYPES: Dict[str, tuple] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool call arguments do not match the tool's parameter schema"""
+
+
+def validate_arguments(schema: Dict[str, Any], arguments: Dict[str, Any]) -> None:
+    """Validate tool call arguments against a tool schema
+    
+    Args:
+        schema: Tool schema created by the tool decorator
+        arguments: Call arguments
+        
+    Raises:
+        ToolArgumentError: Raised when a required argument is missing, an argument is unknown or has the wrong type
+    """
+    parameters = schema["function"]["parameters"]
+    properties = parameters["properties"]
+    missing = [name for name in parameters["required"] if name not in arguments]
+    if missing:
+        raise ToolArgumentError(f"Missing required arguments: {', '.join(missing)}")
+    for name, value in arguments.items():
+        if name not in properties:
+            raise ToolArgumentError(f"Unknown argument: {name}")
+        if value is None:
+            continue
+        expected = properties[name].get("type")
+        types = _JSON_TYPES.get(expected)
+        # bool is a subclass of int but not a JSON number
+        if types and (not isinstance(value, types) or (expected != "boolean" and isinstance(value, bool))):
+            raise ToolArgumentError(f"Argument {name} must be of type {expected}, got {type(value).__name__}")
+
 class BaseTool:
-    """Base tool class, providing common tool calling methods"""
+    """Base tool class, providing common tool calling methods
+    
+    Functions decorated with tool are collected once per class when the class is created.
+    A subclass overriding a tool method without the decorator keeps the inherited schema.
+    """
 
     name: str = ""
+    # Attribute names of tool methods and their schemas by function name, built for each subclass
+    _functions: ClassVar[Dict[str, str]] = {}
+    _schemas: ClassVar[Dict[str, Dict[str, Any]]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        functions: Dict[str, str] = {}
+        schemas: Dict[str, Dict[str, Any]] = {}
+        # Walk the MRO from the base so subclasses override inherited tool functions
+        for klass in reversed(cls.__mro__):
+            for attr_name, attr in vars(klass).items():
+                function_name = getattr(attr, '_function_name', None)
+                if function_name:
+                    functions[function_name] = attr_name
+                    schemas[function_name] = attr._tool_schema
+        cls._functions = functions
+        cls._schemas = schemas
     
     def __init__(self):
         """Initialize base tool class"""
-        self._tools_cache = None
     
     def get_tools(self) -> List[Dict[str, Any]]:
         """Get all registered tools
@@ -58,16 +119,11 @@ class BaseTool:
         Returns:
             List of tools
         """
-        if self._tools_cache is not None:
-            return self._tools_cache
-        
-        tools = []
-        for _, method in inspect.getmembers(self, inspect.ismethod):
-            if hasattr(method, '_tool_schema'):
-                tools.append(method._tool_schema)
-        
-        self._tools_cache = tools
-        return tools
+        return list(self._schemas.values())
+    
+    def get_function_names(self) -> List[str]:
+        """Get names of all registered functions"""
+        return list(self._functions)
     
     def has_function(self, function_name: str) -> bool:
         """Check if specified function exists
@@ -78,10 +134,23 @@ class BaseTool:
         Returns:
             Whether the tool exists
         """
-        for _, method in inspect.getmembers(self, inspect.ismethod):
-            if hasattr(method, '_function_name') and method._function_name == function_name:
-                return True
-        return False
+        return function_name in self._functions
+    
+    def validate_arguments(self, function_name: str, arguments: Dict[str, Any]) -> None:
+        """Validate call arguments of specified function against its schema
+        
+        Args:
+            function_name: Function name
+            arguments: Call arguments
+            
+        Raises:
+            ValueError: Raised when tool doesn't exist
+            ToolArgumentError: Raised when arguments don't match the schema
+        """
+        schema = self._schemas.get(function_name)
+        if schema is None:
+            raise ValueError(f"Tool '{function_name}' not found")
+        validate_arguments(schema, arguments)
     
     async def invoke_function(self, function_name: str, **kwargs) -> ToolResult:
         """Invoke specified tool
@@ -96,8 +165,8 @@ class BaseTool:
         Raises:
             ValueError: Raised when tool doesn't exist
         """
-        for _, method in inspect.getmembers(self, inspect.ismethod):
-            if hasattr(method, '_function_name') and method._function_name == function_name:
-                return await method(**kwargs)
-        
-        raise ValueError(f"Tool '{function_name}' not found") 
\ No newline at end of file
+        attr_name = self._functions.get(function_name)
+        if attr_name is None:
+            raise ValueError(f"Tool '{function_name}' not found")
+        # Looked up on the instance, so overrides without the decorator are called
+        return await getattr(self, attr_name)(**kwargs)
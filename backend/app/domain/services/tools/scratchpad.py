@@ -0,0 +1,83 @@
+from app.domain.services.tools.base import tool, BaseTool
+from app.domain.models.scratchpad import Scratchpad
+from app.domain.models.tool_result import ToolResult
+
+# Characters kept of an entry, the scratchpad is repeated in the prompt of every step
+MAX_ENTRY_CHARS = 2000
+
+
+class ScratchpadTool(BaseTool):
+    """Scratchpad tool class, recording facts and artifacts for the steps executed after the current one"""
+
+    name: str = "scratchpad"
+
+    def __init__(self, scratchpad: Scratchpad):
+        """Initialize scratchpad tool class
+
+        Args:
+            scratchpad: Scratchpad shared by the steps of the agent
+        """
+        super().__init__()
+        self.scratchpad = scratchpad
+
+    @tool(
+        name="scratchpad_write",
+        description="Record a key fact or artifact for later steps, which do not see the tool calls of this step. Use for findings, figures, file paths, URLs and decisions that later steps need. Writing an existing key replaces its content.",
+        parameters={
+            "key": {
+                "type": "string",
+                "description": "Short unique name of the entry, e.g. report_path or competitor_prices"
+            },
+            "content": {
+                "type": "string",
+                "description": "Concise content of the entry"
+            }
+        },
+        required=["key", "content"]
+    )
+    async def scratchpad_write(
+        self,
+        key: str,
+        content: str
+    ) -> ToolResult:
+        """Write a scratchpad entry
+
+        Args:
+            key: Entry name
+            content: Entry content, truncated to MAX_ENTRY_CHARS
+
+        Returns:
+            Write result
+        """
+        truncated = len(content) > MAX_ENTRY_CHARS
+        self.scratchpad.write(key, content[:MAX_ENTRY_CHARS])
+        message = (f"Entry truncated to {MAX_ENTRY_CHARS} characters, save longer content to a file and record its path"
+                   if truncated else None)
+        return ToolResult(success=True, message=message, data={"key": key, "entries": len(self.scratchpad.entries)})
+
+    @tool(
+        name="scratchpad_delete",
+        description="Remove a scratchpad entry that later steps no longer need.",
+        parameters={
+            "key": {
+                "type": "string",
+                "description": "Name of the entry to remove"
+            }
+        },
+        required=["key"]
+    )
+    async def scratchpad_delete(
+        self,
+        key: str
+    ) -> ToolResult:
+        """Delete a scratchpad entry
+
+        Args:
+            key: Entry name
+
+        Returns:
+            Delete result, failed if the entry does not exist
+        """
+        if not self.scratchpad.delete(key):
+            return ToolResult(success=False, message=f"Scratchpad entry does not exist: {key}")
+        return ToolResult(success=True, data={"key": key, "entries": len(self.scratchpad.entries)})
@@ -0,0 +1,133 @@
+import os
+import time
+import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+from app.domain.models.trace import Span
+from app.domain.external.tracing import SpanExporter
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class _NoopSpan(Span):
+    """Span handed out while tracing is disabled, discarding its attributes"""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan(name="", trace_id="0" * 32, span_id="0" * 16)
+
+
+class Tracer:
+    """Record spans of the agent loop and hand finished spans to exporters
+
+    The current span is tracked per task with a context variable, so spans started by tasks created
+    inside a span become its children. Without exporters, spans are not created at all.
+    """
+
+    def __init__(self):
+        self._exporters: List[SpanExporter] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self._exporters.append(exporter)
+
+    async def shutdown(self) -> None:
+        """Flush and remove all exporters"""
+        exporters, self._exporters = self._exporters, []
+        for exporter in exporters:
+            try:
+                await exporter.shutdown()
+            except Exception as e:
+                logger.warning(f"Failed to shut down span exporter: {str(e)}")
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """Start a span without making it current, end it with end_span
+
+        Args:
+            name: Operation name
+            parent: Parent span, defaults to the current span
+            **attributes: Span attributes
+        """
+        if not self._exporters:
+            return NOOP_SPAN
+        parent = parent or _current_span.get()
+        parent = parent if parent is not NOOP_SPAN else None
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes
+        )
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """End a span and export it"""
+        if span is NOOP_SPAN or span.end_time is not None:
+            return
+        span.end_time = time.time_ns()
+        if error is not None:
+            span.error = str(error) or type(error).__name__
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Failed to export span {span.name}: {str(e)}")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Record the enclosed code as the current span
+
+        Args:
+            name: Operation name
+            **attributes: Span attributes, more can be set with set on the yielded span
+        """
+        span = self.start_span(name, **attributes)
+        if span is NOOP_SPAN:
+            yield span
+            return
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except GeneratorExit:
+            # A generator closed early by its consumer did not fail
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Async generators may be finalized in another context than they were started in
+                _current_span.set(None)
+            self.end_span(span, error)
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """Record each call of the decorated coroutine function as a span
+
+    Args:
+        name: Operation name
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,58 @@
+import contextvars
+from contextlib import contextmanager
+from typing import Iterator, Optional, TypeVar
+from app.domain.models.usage import AgentUsage, TokenUsage
+
+_current_usage: contextvars.ContextVar[Optional[AgentUsage]] = contextvars.ContextVar("current_usage", default=None)
+_current_step: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_step", default=None)
+
+T = TypeVar("T")
+
+
+@contextmanager
+def _scoped(var: contextvars.ContextVar, value: T) -> Iterator[T]:
+    token = var.set(value)
+    try:
+        yield value
+    finally:
+        try:
+            var.reset(token)
+        except ValueError:
+            # Async generators may be finalized in another context than they were started in
+            var.set(None)
+
+
+class UsageMeter:
+    """Attribute the token usage reported by LLMs to the agent and plan step making the call
+
+    Like the tracer, the agent and step are tracked per task with context variables, so LLM
+    implementations report usage without being handed the agent, and steps executed concurrently
+    by their own tasks are told apart. Usage reported outside an agent is discarded.
+    """
+
+    @contextmanager
+    def agent(self, usage: AgentUsage) -> Iterator[AgentUsage]:
+        """Record usage reported by the enclosed code to an agent's usage, outside of any step"""
+        # A step scope left open by an abandoned async generator must not outlive the agent scope
+        with _scoped(_current_usage, usage), _scoped(_current_step, None):
+            yield usage
+
+    @contextmanager
+    def step(self, step_id: str) -> Iterator[str]:
+        """Attribute usage reported by the enclosed code to a plan step"""
+        with _scoped(_current_step, step_id):
+            yield step_id
+
+    def record(self, call_site: str, usage: TokenUsage) -> None:
+        """Record the usage of an LLM call
+
+        Args:
+            call_site: Call site that made the call
+            usage: Tokens and cost of the call
+        """
+        agent_usage = _current_usage.get()
+        if agent_usage is not None:
+            agent_usage.add(usage, call_site, _current_step.get())
+
+
+usage_meter = UsageMeter()
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, Literal
 
 
 class Settings(BaseSettings):
@@ -12,7 +13,44 @@ class Settings(BaseSettings):
     model_name: str = "deepseek-chat"
     temperature: float = 0.7
     max_tokens: int = 2000
-    
+
+    # Model routing configuration, unset values fall back to the model configuration above
+    planner_model_name: str | None = None
+    planner_api_base: str | None = None
+    planner_api_key: str | None = None
+    planner_max_tokens: int | None = None
+    updater_model_name: str | None = None
+    updater_api_base: str | None = None
+    updater_api_key: str | None = None
+    updater_max_tokens: int | None = None
+    executor_model_name: str | None = None
+    executor_api_base: str | None = None
+    executor_api_key: str | None = None
+    executor_max_tokens: int | None = None
+    browser_extractor_model_name: str | None = None
+    browser_extractor_api_base: str | None = None
+    browser_extractor_api_key: str | None = None
+    browser_extractor_max_tokens: int | None = None
+    summarizer_model_name: str | None = None
+    summarizer_api_base: str | None = None
+    summarizer_api_key: str | None = None
+    summarizer_max_tokens: int | None = None
+    llm_token_prices: Dict[str, Dict[str, float]] = {}  # USD per million tokens by model name, as JSON, e.g. {"deepseek-chat": {"prompt": 0.27, "cached": 0.07, "completion": 1.1}}
+
+    # Plan update configuration
+    plan_update_policy: Literal["always", "on_failure", "every_n", "heuristic"] = "always"
+    plan_update_interval: int = 3  # Steps between plan updates for the every_n policy
+    plan_update_result_length: int = 2000  # Step result length that triggers an update for the heuristic policy
+    max_parallel_steps: int = 1  # Maximum number of independent plan steps executed concurrently
+    tool_output_budget: int = 8000  # Characters of a tool result kept in agent memory, larger results are truncated and saved to the sandbox, 0 to disable
+    tool_output_budgets: Dict[str, int] = {}  # Budgets by tool name overriding tool_output_budget, as JSON, e.g. {"shell": 12000}
+    execution_memory: Literal["shared", "step"] = "shared"  # step starts each step from fresh memory with the goal, earlier step results and the scratchpad
+    memory_compaction: Literal["off", "rules", "llm"] = "off"  # How earlier steps in execution memory are summarized once it grows too large, llm uses the summarizer model
+    memory_compaction_threshold: int = 60000  # Characters of execution memory above which earlier steps are summarized
+    memory_compaction_keep_steps: int = 1  # Most recent steps kept verbatim when compacting
+    event_log_size: int = 1000  # Events retained per agent for replay to reconnecting clients
+    event_backpressure_threshold: int | None = None  # Unread events before the agent waits for a slow client, defaults to half the log size
+
     # Sandbox configuration
     sandbox_address: str | None = None
     sandbox_image: str | None = None
@@ -23,6 +61,51 @@ class Settings(BaseSettings):
     sandbox_https_proxy: str | None = None
     sandbox_http_proxy: str | None = None
     sandbox_no_proxy: str | None = None
+    sandbox_ready_timeout: int = 60  # Seconds to wait for sandbox services to start after creation, creation fails after that, 0 to not wait
+    sandbox_stop_timeout: int = 10  # Seconds a sandbox container gets to stop before it is killed
+    sandbox_docker_workers: int = 8  # Threads for concurrent Docker API calls
+    sandbox_hosts: str | None = None  # Comma separated Docker daemon URLs sandboxes are placed on, defaults to the local daemon
+    sandbox_placement_policy: Literal["least_loaded", "bin_packing"] = "least_loaded"
+    sandbox_cpus: float = 0  # CPU limit per sandbox, also reserved when placing it on a host, 0 for no limit
+    sandbox_memory_mb: int = 0  # Memory limit in MB per sandbox, also reserved when placing it on a host, 0 for no limit
+    sandbox_pids_limit: int = 0  # Maximum processes per sandbox, 0 for no limit
+    sandbox_max_per_host: int = 0  # Maximum sandboxes per Docker host, 0 for no limit
+    sandbox_host_refresh_interval: int = 30  # Seconds between reading capacity and load of Docker hosts
+    
+    # Agent lifecycle configuration
+    agent_idle_timeout: int = 900  # Seconds without activity before an idle agent is evicted, 0 to disable, must leave time before the sandbox TTL to restore checkpointed agents
+    agent_lifecycle_interval: int = 60  # Seconds between sandbox timeout extensions and idle agent checks
+    agent_evict_memory_ratio: float = 0  # Evict idle agents early once their sandbox uses this share of its memory limit, 0 to disable
+    
+    # VNC proxy configuration
+    vnc_idle_timeout: int = 900  # Seconds without traffic before a VNC connection is closed, 0 to disable
+    vnc_compression: bool = False  # Negotiate permessage-deflate with the sandbox VNC WebSocket
+    
+    # Stub provider configuration, replaces the model, sandboxes and browsers to load test the backend alone
+    llm_provider: Literal["openai", "scripted"] = "openai"
+    sandbox_provider: Literal["docker", "fake"] = "docker"  # fake also replaces the browser
+    stub_llm_latency: float = 0  # Seconds per scripted LLM response
+    stub_sandbox_latency: float = 0  # Seconds per fake sandbox and browser call
+    stub_plan_steps: int = 3  # Steps of each scripted plan
+    
+    # Checkpoint configuration
+    checkpoint_store: Literal["none", "sqlite"] = "none"  # Persist agent state to resume agents after restarts
+    checkpoint_sqlite_path: str = "data/checkpoints.db"
+    
+    # Cluster configuration, redis is required to run several backend workers or replicas
+    cluster_backend: Literal["local", "redis"] = "local"
+    redis_url: str = "redis://localhost:6379/0"
+    worker_id: str | None = None  # Defaults to hostname and process ID
+    agent_registration_ttl: int = 60  # Seconds before agents of an unresponsive worker are unregistered
+    agent_forward_timeout: int = 600  # Seconds without events before a chat forwarded to another worker fails, 0 to disable
+    
+    # Tracing configuration
+    tracing_exporter: Literal["none", "memory", "otlp"] = "none"
+    otlp_endpoint: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP traces endpoint of an OpenTelemetry collector
+    tracing_service_name: str = "manus-backend"
+    
+    # Metrics configuration
+    metrics_enabled: bool = True  # Serve Prometheus metrics at /metrics
     
     # Search engine configuration
     google_search_api_key: str | None = None
@@ -38,6 +121,15 @@ class Settings(BaseSettings):
     def validate(self):
         if not self.api_key:
             raise ValueError("API key is required")
+        if self.checkpoint_store != "none" and self.agent_idle_timeout:
+            # Evicted agents keep their sandbox for restoring, it shuts down by its own timer
+            if not self.sandbox_ttl_minutes:
+                raise ValueError("SANDBOX_TTL_MINUTES is required to evict idle agents with a checkpoint store")
+            if self.agent_idle_timeout + self.agent_lifecycle_interval >= self.sandbox_ttl_minutes * 60:
+                raise ValueError(
+                    "AGENT_IDLE_TIMEOUT plus AGENT_LIFECYCLE_INTERVAL must be below SANDBOX_TTL_MINUTES, "
+                    "otherwise sandboxes of evicted agents are gone before the agents can be restored"
+                )
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -0,0 +1,68 @@
+from typing import Optional
+import asyncio
+from app.domain.models.tool_result import ToolResult
+
+PAGE_CONTENT = "# Example Domain\n\nThis domain is for use in illustrative examples in documents.\n\n" + \
+    "You may use this domain in literature without prior coordination or asking for permission.\n" * 10
+INTERACTIVE_ELEMENTS = [f"{i}:<a>More information {i}</a>" for i in range(20)]
+
+
+class FakeBrowser:
+    """Browser answering every action with the same page, for benchmarks and load tests
+
+    It implements the same gateway as PlaywrightBrowser without a browser or network access.
+    """
+
+    def __init__(self, latency: float = 0):
+        """Initialize fake browser
+
+        Args:
+            latency: Seconds each action is delayed by, to stand in for page loads
+        """
+        self.latency = latency
+        self.url = "about:blank"
+
+    async def _page(self) -> ToolResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ToolResult(success=True, data={"interactive_elements": INTERACTIVE_ELEMENTS, "content": PAGE_CONTENT})
+
+    async def view_page(self) -> ToolResult:
+        return await self._page()
+
+    async def navigate(self, url: str) -> ToolResult:
+        self.url = url
+        return await self._page()
+
+    async def restart(self, url: str) -> ToolResult:
+        self.url = url
+        return await self._page()
+
+    async def click(self, index: Optional[int] = None, coordinate_x: Optional[float] = None,
+                    coordinate_y: Optional[float] = None) -> ToolResult:
+        return await self._page()
+
+    async def input(self, text: str, press_enter: bool, index: Optional[int] = None,
+                    coordinate_x: Optional[float] = None, coordinate_y: Optional[float] = None) -> ToolResult:
+        return await self._page()
+
+    async def move_mouse(self, coordinate_x: float, coordinate_y: float) -> ToolResult:
+        return ToolResult(success=True)
+
+    async def press_key(self, key: str) -> ToolResult:
+        return await self._page()
+
+    async def select_option(self, index: int, option: int) -> ToolResult:
+        return await self._page()
+
+    async def scroll_up(self, to_top: Optional[bool] = None) -> ToolResult:
+        return await self._page()
+
+    async def scroll_down(self, to_bottom: Optional[bool] = None) -> ToolResult:
+        return await self._page()
+
+    async def console_exec(self, javascript: str) -> ToolResult:
+        return ToolResult(success=True, data={"result": None})
+
+    async def console_view(self, max_lines: Optional[int] = None) -> ToolResult:
+        return ToolResult(success=True, data={"logs": []})
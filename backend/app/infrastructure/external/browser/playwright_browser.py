@@ -5,6 +5,7 @@ from markdownify import markdownify
 from app.domain.external.llm import LLM
 from app.infrastructure.config import get_settings
 from app.domain.models.tool_result import ToolResult
+from app.domain.services.tracing import traced
 import logging
 
 # Set up logger for this module
@@ -228,6 +229,7 @@ class PlaywrightBrowser:
         
         return response.content
     
+    @traced("browser.view_page")
     async def view_page(self) -> ToolResult:
         """View visible elements within the current page's viewport and convert to Markdown format"""
         await self._ensure_page()
@@ -404,6 +406,7 @@ class PlaywrightBrowser:
         
         return formatted_elements
     
+    @traced("browser.navigate")
     async def navigate(self, url: str, timeout: Optional[int] = 15000) -> ToolResult:
         """Navigate to the specified URL
         
@@ -428,6 +431,7 @@ class PlaywrightBrowser:
         except Exception as e:
             return ToolResult(success=False, message=f"Failed to navigate to {url}: {str(e)}")
     
+    @traced("browser.restart")
     async def restart(self, url: str) -> ToolResult:
         """Restart the browser and navigate to the specified URL"""
         await self.cleanup()
@@ -451,6 +455,7 @@ class PlaywrightBrowser:
         selector = f'[data-manus-id="manus-element-{index}"]'
         return await self.page.query_selector(selector)
     
+    @traced("browser.click")
     async def click(
         self,
         index: Optional[int] = None,
@@ -497,6 +502,7 @@ class PlaywrightBrowser:
                 return ToolResult(success=False, message=f"Failed to click element: {str(e)}")
         return ToolResult(success=True)
     
+    @traced("browser.input")
     async def input(
         self,
         text: str,
@@ -531,6 +537,7 @@ class PlaywrightBrowser:
             await self.page.keyboard.press("Enter")
         return ToolResult(success=True)
     
+    @traced("browser.move_mouse")
     async def move_mouse(
         self,
         coordinate_x: float,
@@ -541,12 +548,14 @@ class PlaywrightBrowser:
         await self.page.mouse.move(coordinate_x, coordinate_y)
         return ToolResult(success=True)
     
+    @traced("browser.press_key")
     async def press_key(self, key: str) -> ToolResult:
         """Simulate key press"""
         await self._ensure_page()
         await self.page.keyboard.press(key)
         return ToolResult(success=True)
     
+    @traced("browser.select_option")
     async def select_option(
         self,
         index: int,
@@ -565,6 +574,7 @@ class PlaywrightBrowser:
         except Exception as e:
             return ToolResult(success=False, message=f"Failed to select option: {str(e)}")
     
+    @traced("browser.scroll_up")
     async def scroll_up(
         self,
         to_top: Optional[bool] = None
@@ -577,6 +587,7 @@ class PlaywrightBrowser:
             await self.page.evaluate("window.scrollBy(0, -window.innerHeight)")
         return ToolResult(success=True)
     
+    @traced("browser.scroll_down")
     async def scroll_down(
         self,
         to_bottom: Optional[bool] = None
@@ -589,12 +600,14 @@ class PlaywrightBrowser:
             await self.page.evaluate("window.scrollBy(0, window.innerHeight)")
         return ToolResult(success=True)
     
+    @traced("browser.console_exec")
     async def console_exec(self, javascript: str) -> ToolResult:
         """Execute JavaScript code"""
         await self._ensure_page()
         result = await self.page.evaluate(javascript)
         return ToolResult(success=True, data={"result": result})
     
+    @traced("browser.console_view")
     async def console_view(self, max_lines: Optional[int] = None) -> ToolResult:
         """View console output"""
         await self._ensure_page()
@@ -0,0 +1,76 @@
+from typing import List, Optional
+import os
+import sqlite3
+import asyncio
+import logging
+import threading
+from app.domain.models.checkpoint import AgentCheckpoint
+
+logger = logging.getLogger(__name__)
+
+class SQLiteCheckpointStore:
+    """SQLite based agent checkpoint store, for single host deployments"""
+
+    def __init__(self, path: str):
+        """Initialize SQLite checkpoint store
+
+        Args:
+            path: Database file path, created if it does not exist
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agent_checkpoints ("
+            "agent_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"Initialized SQLite checkpoint store at {path}")
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    async def save(self, checkpoint: AgentCheckpoint) -> None:
+        # None fields are dropped so restored messages don't send null fields to the model API
+        data = checkpoint.model_dump_json(exclude_none=True)
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO agent_checkpoints (agent_id, data, updated_at) VALUES (?, ?, ?)",
+            (checkpoint.agent.id, data, checkpoint.updated_at)
+        )
+
+    async def load(self, agent_id: str) -> Optional[AgentCheckpoint]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT data FROM agent_checkpoints WHERE agent_id = ?",
+            (agent_id,)
+        )
+        if not rows:
+            return None
+        return AgentCheckpoint.model_validate_json(rows[0][0])
+
+    async def delete(self, agent_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM agent_checkpoints WHERE agent_id = ?",
+            (agent_id,)
+        )
+
+    async def list_agent_ids(self) -> List[str]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT agent_id FROM agent_checkpoints ORDER BY updated_at"
+        )
+        return [row[0] for row in rows]
+
+    async def close(self) -> None:
+        """Close database connection"""
+        with self._lock:
+            self._conn.close()
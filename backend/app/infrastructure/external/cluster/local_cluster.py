@@ -0,0 +1,76 @@
+from typing import AsyncIterator, Dict, Optional, Set
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+from app.domain.models.cluster import AgentRegistration, AgentCommand
+from app.domain.models.event import AgentEvent
+
+logger = logging.getLogger(__name__)
+
+class LocalAgentRegistry:
+    """In-process agent registry, for single worker deployments and tests
+    
+    Several AgentService instances sharing one registry behave like workers of a cluster.
+    """
+
+    def __init__(self):
+        self._registrations: Dict[str, AgentRegistration] = {}
+
+    async def register(self, registration: AgentRegistration) -> bool:
+        if registration.agent_id in self._registrations:
+            return False
+        self._registrations[registration.agent_id] = registration
+        return True
+
+    async def refresh(self, registration: AgentRegistration) -> bool:
+        # Local registrations never expire
+        current = self._registrations.get(registration.agent_id)
+        return current is not None and current.worker_id == registration.worker_id
+
+    async def get(self, agent_id: str) -> Optional[AgentRegistration]:
+        return self._registrations.get(agent_id)
+
+    async def unregister(self, agent_id: str) -> None:
+        self._registrations.pop(agent_id, None)
+
+
+class LocalEventBus:
+    """In-process event bus, for single worker deployments and tests"""
+
+    def __init__(self):
+        self._event_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._command_queues: Dict[str, asyncio.Queue] = {}
+
+    async def publish_event(self, stream_id: str, event: AgentEvent) -> None:
+        for queue in self._event_subscribers.get(stream_id, ()):
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe_events(self, stream_id: str) -> AsyncIterator[AsyncIterator[AgentEvent]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._event_subscribers.setdefault(stream_id, set()).add(queue)
+        try:
+            yield self._iterate(queue)
+        finally:
+            subscribers = self._event_subscribers.get(stream_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    self._event_subscribers.pop(stream_id, None)
+
+    def _command_queue(self, worker_id: str) -> asyncio.Queue:
+        if worker_id not in self._command_queues:
+            self._command_queues[worker_id] = asyncio.Queue()
+        return self._command_queues[worker_id]
+
+    async def send_command(self, worker_id: str, command: AgentCommand) -> None:
+        self._command_queue(worker_id).put_nowait(command)
+
+    @asynccontextmanager
+    async def subscribe_commands(self, worker_id: str) -> AsyncIterator[AsyncIterator[AgentCommand]]:
+        yield self._iterate(self._command_queue(worker_id))
+
+    @staticmethod
+    async def _iterate(queue: asyncio.Queue) -> AsyncIterator:
+        while True:
+            yield await queue.get()
@@ -0,0 +1,134 @@
+from typing import AsyncIterator, Optional
+from contextlib import asynccontextmanager
+import logging
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from app.domain.models.cluster import AgentRegistration, AgentCommand
+from app.domain.models.event import AgentEvent, AnyAgentEvent
+
+logger = logging.getLogger(__name__)
+
+_event_adapter: TypeAdapter[AgentEvent] = TypeAdapter(AnyAgentEvent)
+
+
+class RedisAgentRegistry:
+    """Redis based agent registry, shared by all backend workers and replicas
+    
+    Registrations expire unless refreshed by their owner, so agents of a crashed worker
+    are no longer routed to it.
+    """
+
+    # Checking the owner and extending the registration must be atomic, another worker may take over an expired one
+    REFRESH_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+if cjson.decode(current)['worker_id'] ~= ARGV[3] then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+    def __init__(self, redis: Redis, ttl: int = 60, prefix: str = "manus"):
+        """Initialize Redis agent registry
+        
+        Args:
+            redis: Redis client
+            ttl: Seconds a registration stays valid without being refreshed
+            prefix: Key prefix
+        """
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, agent_id: str) -> str:
+        return f"{self.prefix}:agent:{agent_id}"
+
+    async def register(self, registration: AgentRegistration) -> bool:
+        stored = await self.redis.set(
+            self._key(registration.agent_id),
+            registration.model_dump_json(),
+            ex=self.ttl,
+            nx=True
+        )
+        return bool(stored)
+
+    async def refresh(self, registration: AgentRegistration) -> bool:
+        # Extend the registration if the worker still owns it, or register again if it expired meanwhile
+        owned = await self.redis.eval(
+            self.REFRESH_SCRIPT, 1, self._key(registration.agent_id),
+            registration.model_dump_json(), self.ttl, registration.worker_id
+        )
+        return bool(owned)
+
+    async def get(self, agent_id: str) -> Optional[AgentRegistration]:
+        data = await self.redis.get(self._key(agent_id))
+        if not data:
+            return None
+        return AgentRegistration.model_validate_json(data)
+
+    async def unregister(self, agent_id: str) -> None:
+        await self.redis.delete(self._key(agent_id))
+
+
+class RedisEventBus:
+    """Redis based event bus
+    
+    Events are fanned out with pub/sub, commands are queued in a list per worker so
+    they are not lost while the worker is busy.
+    """
+
+    def __init__(self, redis: Redis, prefix: str = "manus", command_poll_timeout: int = 5):
+        """Initialize Redis event bus
+        
+        Args:
+            redis: Redis client
+            prefix: Channel and key prefix
+            command_poll_timeout: Seconds a blocking command read waits before polling again
+        """
+        self.redis = redis
+        self.prefix = prefix
+        self.command_poll_timeout = command_poll_timeout
+
+    def _event_channel(self, stream_id: str) -> str:
+        return f"{self.prefix}:events:{stream_id}"
+
+    def _command_key(self, worker_id: str) -> str:
+        return f"{self.prefix}:commands:{worker_id}"
+
+    async def publish_event(self, stream_id: str, event: AgentEvent) -> None:
+        await self.redis.publish(self._event_channel(stream_id), event.model_dump_json())
+
+    @asynccontextmanager
+    async def subscribe_events(self, stream_id: str) -> AsyncIterator[AsyncIterator[AgentEvent]]:
+        channel = self._event_channel(stream_id)
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            yield self._iterate_events(pubsub)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def _iterate_events(self, pubsub) -> AsyncIterator[AgentEvent]:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            yield _event_adapter.validate_json(message["data"])
+
+    async def send_command(self, worker_id: str, command: AgentCommand) -> None:
+        await self.redis.rpush(self._command_key(worker_id), command.model_dump_json())
+
+    @asynccontextmanager
+    async def subscribe_commands(self, worker_id: str) -> AsyncIterator[AsyncIterator[AgentCommand]]:
+        yield self._iterate_commands(self._command_key(worker_id))
+
+    async def _iterate_commands(self, key: str) -> AsyncIterator[AgentCommand]:
+        while True:
+            item = await self.redis.blpop([key], timeout=self.command_poll_timeout)
+            if not item:
+                continue
+            yield AgentCommand.model_validate_json(item[1])
@@ -1,29 +1,96 @@
 from typing import List, Dict, Any, Optional
 from openai import AsyncOpenAI
 from app.infrastructure.config import get_settings
+from app.domain.services.tracing import tracer
+from app.domain.services.usage import usage_meter
+from app.domain.models.usage import TokenUsage
 import logging
 
 # 设置模块级别的日志记录器
 logger = logging.getLogger(__name__)
 
 class OpenAILLM:
-    def __init__(self):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        client: Optional[AsyncOpenAI] = None,
+        call_site: str = "default"
+    ):
+        """Initialize OpenAI LLM, unset parameters fall back to the default model configuration
+        
+        Args:
+            model_name: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum output tokens per request
+            client: Shared OpenAI client, created from the default endpoint if not provided
+            call_site: Call site the LLM serves, recorded with its requests
+        """
         settings = get_settings()
-        self.client = AsyncOpenAI(
+        self.client = client or AsyncOpenAI(
             api_key=settings.api_key,
             base_url=settings.api_base
         )
         
-        self.model_name = settings.model_name
-        self.temperature = settings.temperature
-        self.max_tokens = settings.max_tokens
-        logger.info(f"Initialized OpenAI LLM with model: {self.model_name}")
+        self.model_name = model_name or settings.model_name
+        self.temperature = temperature if temperature is not None else settings.temperature
+        self.max_tokens = max_tokens or settings.max_tokens
+        self.call_site = call_site
+        # USD per million prompt, cached prompt and completion tokens
+        self.prices = settings.llm_token_prices.get(self.model_name, {})
+        logger.info(f"Initialized OpenAI LLM with model: {self.model_name} for {self.call_site} calls")
     
     async def ask(self, messages: List[Dict[str, str]], 
                             tools: Optional[List[Dict[str, Any]]] = None,
                             response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Send chat request to OpenAI API"""
         response = None
+        with tracer.span("llm.ask", **{
+            "llm.model": self.model_name,
+            "llm.call_site": self.call_site,
+            "llm.messages": len(messages),
+            "llm.tools": len(tools) if tools else 0,
+        }) as span:
+            response = await self._ask(messages, tools, response_format)
+            usage = self._get_usage(response)
+            if usage:
+                usage_meter.record(self.call_site, usage)
+            span.set(**{
+                "llm.prompt_tokens": usage.prompt_tokens if usage else None,
+                "llm.completion_tokens": usage.completion_tokens if usage else None,
+                "llm.cached_tokens": usage.cached_tokens if usage else None,
+                "llm.total_tokens": usage.total_tokens if usage else None,
+                "llm.finish_reason": response.choices[0].finish_reason,
+                "llm.tool_calls": len(response.choices[0].message.tool_calls or []),
+            })
+            return response.choices[0].message
+
+    def _get_usage(self, response: Any) -> Optional[TokenUsage]:
+        """Read token counts of a response and price them, None if the endpoint reports no usage"""
+        usage = response.usage
+        if not usage:
+            return None
+        details = getattr(usage, "prompt_tokens_details", None)
+        # DeepSeek reports prompt cache hits in its own field
+        cached_tokens = (details.cached_tokens if details else None) or getattr(usage, "prompt_cache_hit_tokens", None) or 0
+        prompt_price = self.prices.get("prompt", 0)
+        cost = ((usage.prompt_tokens - cached_tokens) * prompt_price
+                + cached_tokens * self.prices.get("cached", prompt_price)
+                + usage.completion_tokens * self.prices.get("completion", 0)) / 1e6
+        return TokenUsage(
+            calls=1,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_tokens=cached_tokens,
+            total_tokens=usage.total_tokens,
+            cost=cost
+        )
+
+    async def _ask(self, messages: List[Dict[str, str]],
+                   tools: Optional[List[Dict[str, Any]]] = None,
+                   response_format: Optional[Dict[str, Any]] = None) -> Any:
+        response = None
         try:
             if tools:
                 logger.debug(f"Sending request to OpenAI with tools, model: {self.model_name}")
@@ -44,7 +111,7 @@ class OpenAILLM:
                     messages=messages,
                     response_format=response_format
                 )
-            return response.choices[0].message
+            return response
         except Exception as e:
             logger.error(f"Error calling OpenAI API: {str(e)}")
             raise
\ No newline at end of file
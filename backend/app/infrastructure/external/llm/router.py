@@ -0,0 +1,50 @@
+from typing import Dict, Tuple, Optional
+from openai import AsyncOpenAI
+from app.domain.external.llm import LLM
+from app.domain.models.llm import LLMCallSite
+from app.infrastructure.config import get_settings
+from app.infrastructure.external.llm.openai_llm import OpenAILLM
+import logging
+
+logger = logging.getLogger(__name__)
+
+class OpenAILLMRouter:
+    """Route each LLM call site to its own model and endpoint, configured in Settings
+
+    A call site is configured through the `<call_site>_model_name`, `<call_site>_api_base`,
+    `<call_site>_api_key` and `<call_site>_max_tokens` settings. Call sites without any
+    override use the default model and endpoint.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        # One client per endpoint so call sites on the same endpoint share a connection pool
+        self._clients: Dict[Tuple[Optional[str], str], AsyncOpenAI] = {}
+        self.default_llm = OpenAILLM(client=self._get_client(settings.api_key, settings.api_base))
+        self._llms: Dict[LLMCallSite, OpenAILLM] = {}
+
+        for call_site in LLMCallSite:
+            model_name = getattr(settings, f"{call_site.value}_model_name")
+            api_base = getattr(settings, f"{call_site.value}_api_base")
+            api_key = getattr(settings, f"{call_site.value}_api_key")
+            max_tokens = getattr(settings, f"{call_site.value}_max_tokens")
+            client = self._get_client(api_key or settings.api_key, api_base or settings.api_base)
+            # Every call site gets its own LLM, so its requests are told apart in traces and metrics
+            self._llms[call_site] = OpenAILLM(
+                model_name=model_name,
+                max_tokens=max_tokens,
+                client=client,
+                call_site=call_site.value
+            )
+            if any([model_name, api_base, api_key, max_tokens]):
+                logger.info(f"Routing {call_site.value} calls to model: {self._llms[call_site].model_name}")
+
+    def _get_client(self, api_key: Optional[str], api_base: str) -> AsyncOpenAI:
+        key = (api_key, api_base)
+        if key not in self._clients:
+            self._clients[key] = AsyncOpenAI(api_key=api_key, base_url=api_base)
+        return self._clients[key]
+
+    def get_llm(self, call_site: LLMCallSite) -> LLM:
+        """Get the LLM configured for a call site, falling back to the default LLM"""
+        return self._llms.get(call_site, self.default_llm)
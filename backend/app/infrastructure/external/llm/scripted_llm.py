@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import asyncio
+import itertools
+import json
+from openai.types.chat import ChatCompletionMessage
+from app.domain.external.llm import LLM
+from app.domain.models.llm import LLMCallSite
+from app.domain.models.usage import TokenUsage
+from app.domain.services.usage import usage_meter
+
+# Tool calls replayed for every step unless a script sets its own
+DEFAULT_TOOL_CALLS: List[Dict[str, Any]] = [
+    {"name": "shell_exec", "arguments": {"id": "main", "exec_dir": "/home/ubuntu", "command": "ls -la"}},
+    {"name": "file_write", "arguments": {"file": "/home/ubuntu/notes.md", "content": "# Notes\n" + "Collected facts.\n" * 20}},
+    {"name": "browser_navigate", "arguments": {"url": "https://example.com"}},
+    {"name": "file_read", "arguments": {"file": "/home/ubuntu/notes.md"}},
+]
+
+
+@dataclass
+class LLMScript:
+    """Canned responses replayed by ScriptedLLM"""
+    steps: int = 3  # Steps of each created plan
+    tool_calls: List[Dict[str, Any]] = field(default_factory=lambda: list(DEFAULT_TOOL_CALLS))  # Tool calls of each step, in order
+    latency: float = 0  # Seconds each response is delayed by, to stand in for model latency
+
+
+def _field(message: Any, name: str) -> Any:
+    return message.get(name) if isinstance(message, dict) else getattr(message, name, None)
+
+
+class ScriptedLLM:
+    """LLM that replays a script instead of calling a model, for benchmarks and load tests
+
+    Responses only depend on the call site and the messages of the request, so one instance can
+    serve any number of agents. The planner gets a plan of the scripted number of steps, plan
+    updates keep the remaining steps, and the executor gets the scripted tool calls one by one
+    before a final message.
+    """
+
+    _call_ids = itertools.count(1)
+
+    def __init__(self, call_site: LLMCallSite = LLMCallSite.EXECUTOR, script: Optional[LLMScript] = None):
+        """Initialize scripted LLM
+
+        Args:
+            call_site: Call site whose responses are replayed
+            script: Responses to replay, defaults to LLMScript()
+        """
+        self.call_site = call_site
+        self.script = script or LLMScript()
+        self.model_name = f"scripted-{call_site.value}"
+        self.calls = 0
+
+    async def ask(self, messages: List[Dict[str, Any]],
+                  tools: Optional[List[Dict[str, Any]]] = None,
+                  response_format: Optional[Dict[str, Any]] = None) -> ChatCompletionMessage:
+        self.calls += 1
+        if self.script.latency:
+            await asyncio.sleep(self.script.latency)
+        if self.call_site == LLMCallSite.PLANNER:
+            response = self._message(self._create_plan())
+        elif self.call_site == LLMCallSite.UPDATER:
+            response = self._message(self._update_plan(_field(messages[-1], "content") or ""))
+        elif self.call_site == LLMCallSite.BROWSER_EXTRACTOR:
+            response = self._message("# Example Domain\n\nThis domain is for use in illustrative examples.")
+        elif self.call_site == LLMCallSite.SUMMARIZER:
+            response = self._message("Earlier steps ran the scripted tool calls and completed.")
+        else:
+            response = self._execute(messages)
+        usage_meter.record(self.call_site.value, self._estimate_usage(messages, response))
+        return response
+
+    @staticmethod
+    def _estimate_usage(messages: List[Any], response: ChatCompletionMessage) -> TokenUsage:
+        """Estimate token counts at four characters per token, so usage accounting is exercised too"""
+        prompt_tokens = sum(len(str(_field(message, "content") or "")) for message in messages) // 4
+        completion_tokens = len(response.content or "") // 4 + sum(
+            len(tool_call.function.arguments) // 4 for tool_call in response.tool_calls or []
+        )
+        return TokenUsage(calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                          total_tokens=prompt_tokens + completion_tokens)
+
+    @staticmethod
+    def _message(content: Optional[str], tool_call: Optional[Dict[str, Any]] = None) -> ChatCompletionMessage:
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        if tool_call:
+            message["tool_calls"] = [{
+                "id": f"call_{next(ScriptedLLM._call_ids)}",
+                "type": "function",
+                "function": {"name": tool_call["name"], "arguments": json.dumps(tool_call["arguments"])}
+            }]
+        return ChatCompletionMessage.model_validate(message)
+
+    def _create_plan(self) -> str:
+        return json.dumps({
+            "message": "I will work through the task step by step.",
+            "goal": "Complete the scripted task",
+            "title": "Scripted task",
+            "steps": [{"id": str(i), "description": f"Scripted step {i}"} for i in range(1, self.script.steps + 1)]
+        })
+
+    @staticmethod
+    def _update_plan(prompt: str) -> str:
+        """Keep the uncompleted steps of the plan in the update prompt"""
+        _, _, plan = prompt.rpartition("Plan:")
+        try:
+            steps = json.loads(plan)["steps"]
+        except (ValueError, KeyError):
+            steps = []
+        return json.dumps({"steps": [
+            {"id": step["id"], "description": step["description"], "dependencies": step.get("dependencies")}
+            for step in steps if step.get("status") not in ("completed", "failed")
+        ]})
+
+    def _execute(self, messages: List[Any]) -> ChatCompletionMessage:
+        """Send the next scripted tool call of the current step, counted since its user message"""
+        done = 0
+        for message in reversed(messages):
+            role = _field(message, "role")
+            if role == "user":
+                break
+            if role == "assistant" and _field(message, "tool_calls"):
+                done += 1
+        if done < len(self.script.tool_calls):
+            return self._message(None, self.script.tool_calls[done])
+        return self._message("The step is completed.")
+
+
+class ScriptedLLMRouter:
+    """Route every call site to its own ScriptedLLM replaying the same script"""
+
+    def __init__(self, script: Optional[LLMScript] = None):
+        self._llms = {call_site: ScriptedLLM(call_site, script) for call_site in LLMCallSite}
+
+    def get_llm(self, call_site: LLMCallSite) -> LLM:
+        return self._llms[call_site]
+
+    @property
+    def calls(self) -> int:
+        """Total responses sent for all call sites"""
+        return sum(llm.calls for llm in self._llms.values())
@@ -1,21 +1,79 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import time
 import uuid
 import httpx
 import docker
 import socket
 import logging
 import asyncio
+import threading
+import websockets
+from concurrent.futures import ThreadPoolExecutor
 from app.infrastructure.config import get_settings
 from urllib.parse import urlparse
 from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.sandbox.placement import SandboxScheduler, SANDBOX_LABEL
+from app.infrastructure.external.tracing.httpx_transport import TracingTransport
 
 logger = logging.getLogger(__name__)
 
+# Scheduler with the Docker clients and worker threads shared by all sandboxes, created on first use
+_scheduler: Optional[SandboxScheduler] = None
+_docker_executor: Optional[ThreadPoolExecutor] = None
+_docker_lock = threading.Lock()
+
+# Seconds resolved sandbox addresses are cached
+DNS_CACHE_TTL = 60
+# Resolved address and expiry time by hostname, and lookups in progress
+_dns_cache: Dict[str, Tuple[str, float]] = {}
+_dns_lookups: Dict[str, asyncio.Task] = {}
+
+
+def get_sandbox_scheduler() -> SandboxScheduler:
+    """Get the scheduler placing sandboxes on the configured Docker hosts"""
+    global _scheduler
+    with _docker_lock:
+        if _scheduler is None:
+            settings = get_settings()
+            # Without configured hosts, sandboxes run on the daemon configured by the environment
+            urls = [url.strip() for url in (settings.sandbox_hosts or "").split(",") if url.strip()] or [""]
+            _scheduler = SandboxScheduler(
+                urls,
+                policy=settings.sandbox_placement_policy,
+                sandbox_cpus=settings.sandbox_cpus,
+                sandbox_memory_mb=settings.sandbox_memory_mb,
+                max_per_host=settings.sandbox_max_per_host,
+                refresh_interval=settings.sandbox_host_refresh_interval
+            )
+        return _scheduler
+
+
+async def _run_docker(func, *args):
+    """Run a blocking Docker API call on the dedicated worker threads
+    
+    The Docker SDK is synchronous, a separate pool keeps bursts of sandbox creation and teardown
+    from blocking the event loop or starving other threaded work.
+    """
+    global _docker_executor
+    if _docker_executor is None:
+        _docker_executor = ThreadPoolExecutor(
+            max_workers=get_settings().sandbox_docker_workers,
+            thread_name_prefix="docker"
+        )
+    return await asyncio.get_running_loop().run_in_executor(_docker_executor, func, *args)
+
+
 class DockerSandbox:
-    def __init__(self, ip: str = None):
+    def __init__(self, ip: str = None, container_name: Optional[str] = None, host: Optional[str] = None):
         """Initialize Docker sandbox and API interaction client"""
-        self.client = httpx.AsyncClient(timeout=600)
+        self.client = httpx.AsyncClient(timeout=600, transport=TracingTransport("sandbox.http"))
         self.ip = ip
+        # Name of the container created for this sandbox, None when using a fixed sandbox address
+        self.container_name = container_name
+        # URL of the Docker daemon running the container, empty for the daemon configured by the environment
+        self.host = host
+        # Seconds each sandbox service took to become ready, set by wait_until_ready
+        self.startup_timings: Dict[str, Optional[float]] = {}
         self.base_url = f"http://{self.ip}:8080"
         self.vnc_url = f"ws://{self.ip}:5901"
         self.cdp_url = f"http://{self.ip}:9222"
@@ -38,9 +96,11 @@ class DockerSandbox:
         name_prefix = settings.sandbox_name_prefix
         container_name = f"{name_prefix}-{str(uuid.uuid4())[:8]}"
         
+        scheduler = get_sandbox_scheduler()
+        host = scheduler.acquire()
+        confirmed = False
         try:
-            # Create Docker client
-            docker_client = docker.from_env()
+            docker_client = scheduler.get_client(host.url)
 
             # Prepare container configuration
             container_config = {
@@ -48,6 +108,7 @@ class DockerSandbox:
                 "name": container_name,
                 "detach": True,
                 "remove": True,
+                "labels": {SANDBOX_LABEL: name_prefix or "sandbox"},
                 "environment": {
                     "SERVICE_TIMEOUT_MINUTES": settings.sandbox_ttl_minutes,
                     "CHROME_ARGS": settings.sandbox_chrome_args,
@@ -57,12 +118,22 @@ class DockerSandbox:
                 }
             }
             
+            # Limit resources so one sandbox cannot starve the others on its host
+            if settings.sandbox_cpus:
+                container_config["nano_cpus"] = int(settings.sandbox_cpus * 1e9)
+            if settings.sandbox_memory_mb:
+                container_config["mem_limit"] = f"{settings.sandbox_memory_mb}m"
+            if settings.sandbox_pids_limit:
+                container_config["pids_limit"] = settings.sandbox_pids_limit
+            
             # Add network to container config if configured
             if settings.sandbox_network:
                 container_config["network"] = settings.sandbox_network
             
             # Create container
             container = docker_client.containers.run(**container_config)
+            scheduler.confirm(host.url)
+            confirmed = True
             
             # Get container IP address
             container.reload()  # Refresh container info
@@ -82,10 +153,13 @@ class DockerSandbox:
             
             # Create and return DockerSandbox instance
             return DockerSandbox(
-                ip=ip_address
+                ip=ip_address,
+                container_name=container_name,
+                host=host.url
             )
             
         except Exception as e:
+            scheduler.release(host.url, confirmed=confirmed)
             raise Exception(f"Failed to create Docker sandbox: {str(e)}")
 
     @staticmethod
@@ -95,16 +169,133 @@ class DockerSandbox:
         if settings.sandbox_address:
             # Chrome CDP needs IP address
             ip = await DockerSandbox._resolve_hostname_to_ip(settings.sandbox_address)
-            return DockerSandbox(ip=ip)
-    
-        return await asyncio.to_thread(DockerSandbox._create_task)
+            sandbox = DockerSandbox(ip=ip)
+        else:
+            sandbox = await _run_docker(DockerSandbox._create_task)
+
+        if settings.sandbox_ready_timeout and not await sandbox.wait_until_ready(settings.sandbox_ready_timeout):
+            not_ready = ", ".join(name for name, timing in sandbox.startup_timings.items() if timing is None)
+            await sandbox.destroy()
+            raise Exception(
+                f"Failed to create Docker sandbox: {not_ready} not ready after {settings.sandbox_ready_timeout}s"
+            )
+        return sandbox
+
+    async def _probe_api(self) -> None:
+        response = await self.client.get(f"{self.base_url}/api/v1/supervisor/status", timeout=2)
+        response.raise_for_status()
+
+    async def _probe_cdp(self) -> None:
+        # The CDP port is forwarded before Chrome is started, so ask Chrome itself
+        response = await self.client.get(f"{self.cdp_url}/json/version", timeout=2)
+        response.raise_for_status()
+
+    async def _probe_vnc(self) -> None:
+        # The WebSocket bridge is up before the VNC server, wait for the server's protocol version
+        async with websockets.connect(self.vnc_url, open_timeout=2, close_timeout=1) as ws:
+            await asyncio.wait_for(ws.recv(), 2)
+
+    async def _wait_for_service(self, name: str, probe, started: float, timeout: float) -> Optional[float]:
+        """Probe a service with backoff until it responds
+        
+        Returns:
+            Seconds until the service was ready, or None if it was not ready within the timeout
+        """
+        loop = asyncio.get_running_loop()
+        delay = 0.1
+        while True:
+            try:
+                await probe()
+                return loop.time() - started
+            except Exception as e:
+                remaining = started + timeout - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"Sandbox {self.ip} {name} not ready after {timeout}s: {str(e)}")
+                    return None
+                await asyncio.sleep(min(delay, remaining))
+                delay = min(delay * 2, 1)
+
+    async def wait_until_ready(self, timeout: float = 60) -> bool:
+        """Wait until the sandbox API, Chrome CDP and VNC endpoints respond
+        
+        Services are probed concurrently, the time each took is kept in startup_timings.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            Whether all services became ready within the timeout
+        """
+        started = asyncio.get_running_loop().time()
+        probes = {"api": self._probe_api, "cdp": self._probe_cdp, "vnc": self._probe_vnc}
+        timings = await asyncio.gather(
+            *(self._wait_for_service(name, probe, started, timeout) for name, probe in probes.items())
+        )
+        self.startup_timings = dict(zip(probes, timings))
+        summary = ", ".join(
+            f"{name} {timing:.2f}s" if timing is not None else f"{name} not ready"
+            for name, timing in self.startup_timings.items()
+        )
+        logger.info(f"Sandbox {self.ip} startup: {summary}")
+        return all(timing is not None for timing in timings)
     
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> 'DockerSandbox':
+        """Create a client for an existing sandbox from its saved state, without checking it
+        
+        Args:
+            state: Sandbox state returned by get_state
+            
+        Returns:
+            DockerSandbox instance
+        """
+        return DockerSandbox(ip=state.get("ip"), container_name=state.get("container_name"), host=state.get("host"))
+
+    @staticmethod
+    async def attach(state: Dict[str, Any]) -> Optional['DockerSandbox']:
+        """Reattach to a still running sandbox from its saved state
+        
+        Args:
+            state: Sandbox state returned by get_state
+            
+        Returns:
+            DockerSandbox instance, or None if the sandbox is no longer reachable
+        """
+        sandbox = DockerSandbox.from_state(state)
+        try:
+            response = await sandbox.client.get(f"{sandbox.base_url}/api/v1/supervisor/status", timeout=5)
+            response.raise_for_status()
+            return sandbox
+        except Exception as e:
+            logger.warning(f"Sandbox {state} is no longer reachable: {str(e)}")
+            await sandbox.close()
+            return None
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "ip": self.ip,
+            "container_name": self.container_name,
+            "host": self.host
+        }
+
     def get_cdp_url(self) -> str:
         return self.cdp_url
 
     def get_vnc_url(self) -> str:
         return self.vnc_url
 
+    async def extend_timeout(self, minutes: Optional[int] = None) -> ToolResult:
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/supervisor/timeout/extend",
+            json={"minutes": minutes},
+            timeout=10
+        )
+        return ToolResult(**response.json())
+
+    async def get_stats(self) -> ToolResult:
+        response = await self.client.get(f"{self.base_url}/api/v1/stats", timeout=10)
+        return ToolResult(**response.json())
+
     async def exec_command(self, session_id: str, exec_dir: str, command: str) -> ToolResult:
         response = await self.client.post(
             f"{self.base_url}/api/v1/shell/exec",
@@ -332,17 +523,72 @@ class DockerSandbox:
                 # Not a valid IP address format, proceed with DNS resolution
                 pass
                 
-            # Use socket.getaddrinfo for DNS resolution
-            addr_info = socket.getaddrinfo(hostname, None, family=socket.AF_INET)
+            cached = _dns_cache.get(hostname)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+
+            # Concurrent lookups of the same hostname share one resolution
+            lookup = _dns_lookups.get(hostname)
+            if not lookup:
+                lookup = asyncio.create_task(
+                    asyncio.get_running_loop().getaddrinfo(hostname, None, family=socket.AF_INET)
+                )
+                _dns_lookups[hostname] = lookup
+                lookup.add_done_callback(lambda _: _dns_lookups.pop(hostname, None))
+            addr_info = await asyncio.shield(lookup)
             # Return the first IPv4 address found
             if addr_info and len(addr_info) > 0:
-                return addr_info[0][4][0]  # Return sockaddr[0] from (family, type, proto, canonname, sockaddr), which is the IP address
+                ip = addr_info[0][4][0]  # sockaddr[0] from (family, type, proto, canonname, sockaddr), which is the IP address
+                _dns_cache[hostname] = (ip, time.monotonic() + DNS_CACHE_TTL)
+                return ip
             return None
         except Exception as e:
             # Log error and return None on failure
             logger.error(f"Failed to resolve hostname {hostname}: {str(e)}")
             return None
 
+    @staticmethod
+    def _destroy_task(container_name: str, host: Optional[str], stop_timeout: int) -> None:
+        """Stop and remove a sandbox container (blocking)"""
+        scheduler = get_sandbox_scheduler()
+        try:
+            docker_client = scheduler.get_client(host)
+            container = docker_client.containers.get(container_name)
+            container.stop(timeout=stop_timeout)
+            # Containers are started with auto-remove, removing only cleans up if that did not happen
+            container.remove(force=True)
+        except docker.errors.APIError as e:
+            # 404 once the container is gone, 409 while the daemon's auto-remove is in progress
+            if e.status_code not in (404, 409):
+                raise
+        finally:
+            # Free the placement slot even if the container could not be removed
+            scheduler.release(host)
+
+    async def destroy(self) -> bool:
+        """Stop and remove the sandbox container and close the HTTP client
+        
+        Returns:
+            Whether the container was removed, True if the sandbox has no container
+        """
+        try:
+            if not self.container_name:
+                return True
+            stop_timeout = get_settings().sandbox_stop_timeout
+            try:
+                # The container is killed after stop_timeout, allow some more time for the API calls
+                await asyncio.wait_for(
+                    _run_docker(DockerSandbox._destroy_task, self.container_name, self.host, stop_timeout),
+                    stop_timeout + 10
+                )
+                logger.info(f"Destroyed sandbox container {self.container_name}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to destroy sandbox container {self.container_name}: {str(e)}")
+                return False
+        finally:
+            await self.close()
+
     async def close(self):
         """Close HTTP client connection"""
         if self.client:
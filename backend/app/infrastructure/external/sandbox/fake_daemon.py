@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Optional
+import itertools
+import threading
+import docker
+
+
+class FakeContainer:
+    """In-memory container of a FakeDockerDaemon"""
+
+    def __init__(self, daemon: 'FakeDockerDaemon', name: str, labels: Dict[str, str], ip: str):
+        self.daemon = daemon
+        self.name = name
+        self.labels = labels
+        self.status = "running"
+        self.attrs = {"NetworkSettings": {"IPAddress": ip, "Networks": {}}}
+
+    def reload(self) -> None:
+        pass
+
+    def stop(self, timeout: int = 10) -> None:
+        self.status = "exited"
+        self.daemon._remove(self.name)
+
+    def remove(self, force: bool = False) -> None:
+        if not self.daemon._remove(self.name):
+            raise docker.errors.NotFound(f"No such container: {self.name}")
+
+
+class FakeContainers:
+    def __init__(self, daemon: 'FakeDockerDaemon'):
+        self.daemon = daemon
+
+    def run(self, image: str, name: str, labels: Optional[Dict[str, str]] = None, **kwargs) -> FakeContainer:
+        return self.daemon._run(name, labels or {})
+
+    def get(self, name: str) -> FakeContainer:
+        with self.daemon._lock:
+            container = self.daemon._containers.get(name)
+        if not container:
+            raise docker.errors.NotFound(f"No such container: {name}")
+        return container
+
+    def list(self, filters: Optional[Dict[str, Any]] = None) -> List[FakeContainer]:
+        label = (filters or {}).get("label")
+        with self.daemon._lock:
+            containers = list(self.daemon._containers.values())
+        return [c for c in containers if not label or label in c.labels]
+
+
+class FakeDockerDaemon:
+    """Docker client stand-in that keeps containers in memory, to exercise sandbox placement
+    without Docker daemons
+
+    Only the calls used by DockerSandbox and SandboxScheduler are implemented. Use it as the
+    scheduler's client factory, e.g. ``SandboxScheduler(urls, client_factory=FakeDockerDaemon.factory(cpus=8))``.
+    """
+
+    _subnets = itertools.count(1)
+
+    def __init__(self, url: str = "", cpus: int = 8, memory_mb: int = 16384):
+        self.url = url
+        self.cpus = cpus
+        self.memory_mb = memory_mb
+        self.containers = FakeContainers(self)
+        self._containers: Dict[str, FakeContainer] = {}
+        self._subnet = next(self._subnets)
+        self._addresses = itertools.count(2)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def factory(**kwargs) -> Any:
+        """Create a client factory returning a new fake daemon for each URL"""
+        return lambda url: FakeDockerDaemon(url, **kwargs)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            running = len(self._containers)
+        return {"NCPU": self.cpus, "MemTotal": self.memory_mb * 1024 * 1024, "ContainersRunning": running}
+
+    def _run(self, name: str, labels: Dict[str, str]) -> FakeContainer:
+        with self._lock:
+            ip = f"10.{self._subnet // 256}.{self._subnet % 256}.{next(self._addresses) % 254 + 1}"
+            container = FakeContainer(self, name, labels, ip)
+            self._containers[name] = container
+        return container
+
+    def _remove(self, name: str) -> bool:
+        with self._lock:
+            return self._containers.pop(name, None) is not None
@@ -0,0 +1,157 @@
+from typing import Any, Dict, Optional
+import asyncio
+import fnmatch
+import re
+import uuid
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.config import get_settings
+
+
+class FakeSandbox:
+    """In-process sandbox keeping files and shell sessions in memory, for benchmarks and load tests
+
+    Commands are not run, each one answers with a fixed amount of output. Files written by the agent
+    can be read, searched and found again. It implements the same gateway as DockerSandbox.
+    """
+
+    def __init__(self, name: Optional[str] = None, latency: float = 0, output_lines: int = 20):
+        """Initialize fake sandbox
+
+        Args:
+            name: Sandbox name, generated if not provided
+            latency: Seconds each call is delayed by, to stand in for the sandbox API round trip
+            output_lines: Lines of output of each shell command
+        """
+        self.name = name or f"fake-sandbox-{uuid.uuid4().hex[:8]}"
+        self.latency = latency
+        self.output_lines = output_lines
+        self.files: Dict[str, str] = {}
+        self.shells: Dict[str, str] = {}
+        self.destroyed = False
+
+    async def _delay(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    @staticmethod
+    async def create() -> 'FakeSandbox':
+        return FakeSandbox(latency=get_settings().stub_sandbox_latency)
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> 'FakeSandbox':
+        return FakeSandbox(name=state.get("container_name"), latency=get_settings().stub_sandbox_latency)
+
+    @staticmethod
+    async def attach(state: Dict[str, Any]) -> Optional['FakeSandbox']:
+        return FakeSandbox.from_state(state)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"ip": "127.0.0.1", "container_name": self.name, "host": None}
+
+    def get_cdp_url(self) -> str:
+        return "http://127.0.0.1:9222"
+
+    def get_vnc_url(self) -> str:
+        return "ws://127.0.0.1:5901"
+
+    async def extend_timeout(self, minutes: Optional[int] = None) -> ToolResult:
+        return ToolResult(success=True, data={"active": True, "timeout_minutes": minutes})
+
+    async def get_stats(self) -> ToolResult:
+        return ToolResult(success=True, data={
+            "cpu_usage_seconds": 0.0,
+            "memory_used_bytes": sum(len(content) for content in self.files.values()),
+            "disk_used_bytes": 0,
+            "disk_total_bytes": 0,
+            "process_count": len(self.shells),
+        })
+
+    async def exec_command(self, session_id: str, exec_dir: str, command: str) -> ToolResult:
+        await self._delay()
+        output = "\n".join(f"{exec_dir}/file_{i}.txt" for i in range(self.output_lines))
+        self.shells[session_id] = self.shells.get(session_id, "") + f"$ {command}\n{output}\n"
+        return ToolResult(success=True, message="Command executed", data={
+            "session_id": session_id,
+            "command": command,
+            "status": "completed",
+            "returncode": 0,
+            "output": output,
+        })
+
+    async def view_shell(self, session_id: str) -> ToolResult:
+        await self._delay()
+        if session_id not in self.shells:
+            return ToolResult(success=False, message=f"Session ID does not exist: {session_id}")
+        return ToolResult(success=True, data={"session_id": session_id, "output": self.shells[session_id], "console": []})
+
+    async def wait_for_process(self, session_id: str, seconds: Optional[int] = None) -> ToolResult:
+        await self._delay()
+        return ToolResult(success=True, data={"returncode": 0})
+
+    async def write_to_process(self, session_id: str, input_text: str, press_enter: bool = True) -> ToolResult:
+        await self._delay()
+        return ToolResult(success=True, data={"status": "success"})
+
+    async def kill_process(self, session_id: str) -> ToolResult:
+        await self._delay()
+        return ToolResult(success=True, data={"status": "terminated", "returncode": -15})
+
+    async def file_write(self, file: str, content: str, append: bool = False,
+                         leading_newline: bool = False, trailing_newline: bool = False,
+                         sudo: bool = False) -> ToolResult:
+        await self._delay()
+        content = ("\n" if leading_newline else "") + content + ("\n" if trailing_newline else "")
+        self.files[file] = (self.files.get(file, "") if append else "") + content
+        return ToolResult(success=True, data={"file": file, "bytes_written": len(content.encode("utf-8"))})
+
+    async def file_read(self, file: str, start_line: int = None,
+                        end_line: int = None, sudo: bool = False) -> ToolResult:
+        await self._delay()
+        if file not in self.files:
+            return ToolResult(success=False, message=f"File does not exist: {file}")
+        content = self.files[file]
+        if start_line is not None or end_line is not None:
+            content = "\n".join(content.splitlines()[start_line:end_line])
+        return ToolResult(success=True, data={"content": content, "file": file})
+
+    async def file_exists(self, path: str) -> ToolResult:
+        return ToolResult(success=True, data={"exists": path in self.files})
+
+    async def file_delete(self, path: str) -> ToolResult:
+        return ToolResult(success=self.files.pop(path, None) is not None)
+
+    async def file_list(self, path: str) -> ToolResult:
+        prefix = path.rstrip("/") + "/"
+        return ToolResult(success=True, data={"files": [file for file in self.files if file.startswith(prefix)]})
+
+    async def file_replace(self, file: str, old_str: str, new_str: str, sudo: bool = False) -> ToolResult:
+        await self._delay()
+        if file not in self.files:
+            return ToolResult(success=False, message=f"File does not exist: {file}")
+        count = self.files[file].count(old_str)
+        self.files[file] = self.files[file].replace(old_str, new_str)
+        return ToolResult(success=True, data={"file": file, "replaced_count": count})
+
+    async def file_search(self, file: str, regex: str, sudo: bool = False) -> ToolResult:
+        await self._delay()
+        if file not in self.files:
+            return ToolResult(success=False, message=f"File does not exist: {file}")
+        pattern = re.compile(regex)
+        found = [(i, line) for i, line in enumerate(self.files[file].splitlines()) if pattern.search(line)]
+        return ToolResult(success=True, data={
+            "file": file,
+            "matches": [line for _, line in found],
+            "line_numbers": [i for i, _ in found],
+        })
+
+    async def file_find(self, path: str, glob_pattern: str) -> ToolResult:
+        await self._delay()
+        pattern = f"{path.rstrip('/')}/{glob_pattern}"
+        return ToolResult(success=True, data={"path": path, "files": fnmatch.filter(self.files, pattern)})
+
+    async def destroy(self) -> bool:
+        self.destroyed = True
+        return True
+
+    async def close(self):
+        pass
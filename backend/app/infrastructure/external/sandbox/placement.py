@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Literal, Optional
+import time
+import logging
+import threading
+import docker
+
+logger = logging.getLogger(__name__)
+
+# Label set on sandbox containers, used to count the sandboxes running on each host
+SANDBOX_LABEL = "manus.sandbox"
+
+PlacementPolicy = Literal["least_loaded", "bin_packing"]
+
+
+@dataclass
+class DockerHost:
+    """A Docker daemon sandboxes can be placed on, with its capacity and current load"""
+    url: str
+    client: Any
+    cpus: float = 0
+    memory_mb: float = 0
+    sandboxes: int = 0
+    # Sandboxes placed on the host whose containers are still being created, not yet counted by the daemon
+    reserved: int = 0
+    healthy: bool = False
+    refreshed_at: float = 0
+
+    def utilization(self, cpus: float, memory_mb: float, extra: int = 0) -> float:
+        """Share of the host's CPU or memory, whichever is higher, reserved by its sandboxes
+
+        Without reservations, the number of sandboxes per CPU is used instead.
+
+        Args:
+            cpus: CPUs reserved per sandbox, 0 for none
+            memory_mb: Memory reserved per sandbox in MB, 0 for none
+            extra: Number of sandboxes to add to the running and reserved ones
+        """
+        sandboxes = self.sandboxes + self.reserved + extra
+        shares = []
+        if cpus:
+            shares.append(sandboxes * cpus / self.cpus if self.cpus else float("inf"))
+        if memory_mb:
+            shares.append(sandboxes * memory_mb / self.memory_mb if self.memory_mb else float("inf"))
+        if not shares:
+            return sandboxes / self.cpus if self.cpus else sandboxes
+        return max(shares)
+
+
+class SandboxScheduler:
+    """Place sandboxes on several Docker daemons according to their capacity
+
+    Each sandbox can reserve a fixed share of CPU and memory on its host. Host capacity and the number
+    of running sandboxes are read from the daemons periodically and kept up to date in between
+    by the scheduler's own placements and releases. Sandboxes whose containers are still being created
+    are reserved on top of the running ones, so a refresh does not free their place. Methods are
+    blocking and thread safe.
+    """
+
+    def __init__(self, urls: List[str], policy: PlacementPolicy = "least_loaded",
+                 sandbox_cpus: float = 0, sandbox_memory_mb: int = 0, max_per_host: int = 0,
+                 refresh_interval: float = 30,
+                 client_factory: Optional[Callable[[Optional[str]], Any]] = None):
+        """Initialize sandbox scheduler
+
+        Args:
+            urls: Docker daemon URLs, an empty string for the daemon configured by the environment
+            policy: least_loaded spreads sandboxes over hosts, bin_packing fills hosts one after another
+            sandbox_cpus: CPUs reserved per sandbox, 0 to not limit placement by CPU
+            sandbox_memory_mb: Memory reserved per sandbox in MB, 0 to not limit placement by memory
+            max_per_host: Maximum number of sandboxes per host, 0 for no limit besides CPU and memory
+            refresh_interval: Seconds between reading host capacity and load from the daemons
+            client_factory: Create a Docker client from a daemon URL, defaults to docker.DockerClient
+        """
+        self.policy = policy
+        self.sandbox_cpus = sandbox_cpus
+        self.sandbox_memory_mb = sandbox_memory_mb
+        self.max_per_host = max_per_host
+        self.refresh_interval = refresh_interval
+        self._client_factory = client_factory or self._create_client
+        self._hosts: Dict[str, DockerHost] = {url: DockerHost(url=url, client=None) for url in urls}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def _create_client(url: Optional[str]) -> docker.DockerClient:
+        if not url:
+            return docker.from_env()
+        return docker.DockerClient(base_url=url)
+
+    def get_client(self, url: Optional[str]) -> Any:
+        """Get the Docker client of a host, None or an unknown URL refer to the first host"""
+        host = self._hosts.get(url or "") or next(iter(self._hosts.values()))
+        with self._lock:
+            if host.client is None:
+                host.client = self._client_factory(host.url)
+        return host.client
+
+    def _refresh_host(self, host: DockerHost) -> None:
+        try:
+            client = self.get_client(host.url)
+            info = client.info()
+            host.cpus = info.get("NCPU", 0)
+            host.memory_mb = info.get("MemTotal", 0) / (1024 * 1024)
+            host.sandboxes = len(client.containers.list(filters={"label": SANDBOX_LABEL}))
+            host.healthy = True
+        except Exception as e:
+            logger.warning(f"Docker host {host.url or 'default'} is unavailable: {str(e)}")
+            host.healthy = False
+        host.refreshed_at = time.monotonic()
+
+    def refresh(self, force: bool = False, unhealthy: bool = False) -> None:
+        """Read capacity and load of hosts whose information is older than the refresh interval
+
+        Args:
+            force: Read all hosts regardless of the refresh interval
+            unhealthy: Also read hosts that could not be read last time, regardless of the refresh interval
+        """
+        # Concurrent placements wait for one refresh instead of each querying the daemons
+        with self._refresh_lock:
+            now = time.monotonic()
+            for host in self._hosts.values():
+                if force or (unhealthy and not host.healthy) or now - host.refreshed_at >= self.refresh_interval:
+                    self._refresh_host(host)
+
+    def _fits(self, host: DockerHost) -> bool:
+        if not host.healthy:
+            # The only host is used anyway, creating the sandbox reports why the daemon is unavailable
+            return len(self._hosts) == 1
+        if self.max_per_host and host.sandboxes + host.reserved >= self.max_per_host:
+            return False
+        if not self.sandbox_cpus and not self.sandbox_memory_mb:
+            return True
+        return host.utilization(self.sandbox_cpus, self.sandbox_memory_mb, extra=1) <= 1
+
+    def acquire(self) -> DockerHost:
+        """Choose a host for a new sandbox and reserve its resources
+
+        Returns:
+            Chosen host, confirm the placement once the sandbox is created or release it if it could not be
+        """
+        self.refresh()
+        with self._lock:
+            candidates = [host for host in self._hosts.values() if self._fits(host)]
+        if not candidates and not all(host.healthy for host in self._hosts.values()):
+            # A host may have been unavailable only briefly, read it again before giving up
+            self.refresh(unhealthy=True)
+        with self._lock:
+            candidates = [host for host in self._hosts.values() if self._fits(host)]
+            if not candidates:
+                raise RuntimeError(f"No Docker host has capacity for another sandbox ({len(self._hosts)} hosts)")
+            load = lambda host: host.utilization(self.sandbox_cpus, self.sandbox_memory_mb)
+            if self.policy == "bin_packing":
+                host = max(candidates, key=load)
+            else:
+                host = min(candidates, key=load)
+            host.reserved += 1
+        logger.debug(f"Placed sandbox on Docker host {host.url or 'default'}, "
+                     f"now running {host.sandboxes} and creating {host.reserved}")
+        return host
+
+    def confirm(self, url: Optional[str]) -> None:
+        """Count a sandbox whose container was created on a host as running instead of reserved"""
+        host = self._hosts.get(url or "")
+        if not host:
+            return
+        with self._lock:
+            host.reserved = max(0, host.reserved - 1)
+            host.sandboxes += 1
+
+    def release(self, url: Optional[str], confirmed: bool = True) -> None:
+        """Release the resources of a sandbox removed from a host
+
+        Args:
+            url: URL of the sandbox's host
+            confirmed: Whether the placement was confirmed, False to release a sandbox that was not created
+        """
+        host = self._hosts.get(url or "")
+        if not host:
+            return
+        with self._lock:
+            if confirmed:
+                host.sandboxes = max(0, host.sandboxes - 1)
+            else:
+                host.reserved = max(0, host.reserved - 1)
+
+    def get_hosts(self) -> List[DockerHost]:
+        return list(self._hosts.values())
@@ -0,0 +1,40 @@
+from typing import Optional
+import httpx
+from app.domain.services.tracing import tracer
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording each request as a span, until the response headers are received"""
+
+    def __init__(self, span_name: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize tracing transport
+
+        Args:
+            span_name: Name of the request spans
+            transport: Transport sending the requests, defaults to httpx.AsyncHTTPTransport
+        """
+        self.span_name = span_name
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not tracer.enabled:
+            return await self._transport.handle_async_request(request)
+        try:
+            request_bytes = len(request.content)
+        except httpx.RequestNotRead:
+            request_bytes = None
+        with tracer.span(self.span_name, **{
+            "http.method": request.method,
+            "http.path": request.url.path,
+            "http.request_bytes": request_bytes,
+        }) as span:
+            response = await self._transport.handle_async_request(request)
+            content_length = response.headers.get("content-length")
+            span.set(**{
+                "http.status_code": response.status_code,
+                "http.response_bytes": int(content_length) if content_length else None,
+            })
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
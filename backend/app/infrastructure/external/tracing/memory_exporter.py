@@ -0,0 +1,28 @@
+from collections import deque
+from typing import List, Optional
+from app.domain.models.trace import Span
+
+
+class InMemorySpanExporter:
+    """Keep finished spans in memory, for tests and local debugging"""
+
+    def __init__(self, max_spans: int = 10000):
+        """Initialize in-memory span exporter
+
+        Args:
+            max_spans: Maximum number of retained spans, older spans are dropped first
+        """
+        self._spans: deque = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def get_finished_spans(self, name: Optional[str] = None) -> List[Span]:
+        """Get retained spans in the order they finished, optionally only those with the given name"""
+        return [span for span in self._spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    async def shutdown(self) -> None:
+        pass
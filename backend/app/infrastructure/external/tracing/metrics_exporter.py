@@ -0,0 +1,38 @@
+from app.domain.models.trace import Span
+from app.infrastructure.metrics import (
+    llm_request_seconds, llm_request_errors, llm_tokens,
+    tool_call_seconds, tool_call_failures, sandbox_request_seconds
+)
+
+
+class MetricsSpanExporter:
+    """Aggregate LLM, tool and sandbox request spans into Prometheus metrics
+
+    Spans carry the model, call site, tool and token attributes already, so the metrics are
+    derived from them instead of instrumenting the agent loop a second time.
+    """
+
+    def export(self, span: Span) -> None:
+        attributes = span.attributes
+        if span.name == "llm.ask":
+            model = attributes.get("llm.model", "")
+            call_site = attributes.get("llm.call_site", "")
+            llm_request_seconds.labels(model, call_site).observe(span.duration)
+            if span.error:
+                llm_request_errors.labels(model, call_site).inc()
+            if attributes.get("llm.prompt_tokens"):
+                llm_tokens.labels(model, call_site, "prompt").inc(attributes["llm.prompt_tokens"])
+            if attributes.get("llm.completion_tokens"):
+                llm_tokens.labels(model, call_site, "completion").inc(attributes["llm.completion_tokens"])
+            if attributes.get("llm.cached_tokens"):
+                llm_tokens.labels(model, call_site, "cached").inc(attributes["llm.cached_tokens"])
+        elif span.name == "tool.execute":
+            tool, function = attributes.get("tool.name", ""), attributes.get("tool.function", "")
+            tool_call_seconds.labels(tool, function).observe(span.duration)
+            if span.error or not attributes.get("tool.success"):
+                tool_call_failures.labels(tool, function).inc()
+        elif span.name == "sandbox.http":
+            sandbox_request_seconds.labels(attributes.get("http.method", ""), attributes.get("http.path", "")).observe(span.duration)
+
+    async def shutdown(self) -> None:
+        pass
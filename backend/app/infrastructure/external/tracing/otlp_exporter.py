@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import httpx
+from app.domain.models.trace import Span
+
+logger = logging.getLogger(__name__)
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+# OTLP span kind INTERNAL
+SPAN_KIND_INTERNAL = 1
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _attribute_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class OTLPSpanExporter:
+    """Export spans in batches to an OpenTelemetry collector with OTLP/HTTP JSON
+
+    Spans are buffered and sent by a background task, so ending a span never waits for the network.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "manus-backend", headers: Optional[Dict[str, str]] = None,
+                 flush_interval: float = 5, max_batch_size: int = 512, max_queue_size: int = 10000):
+        """Initialize OTLP span exporter
+
+        Args:
+            endpoint: Collector traces endpoint, e.g. http://localhost:4318/v1/traces
+            service_name: Value of the service.name resource attribute
+            headers: Extra HTTP headers, e.g. for authentication
+            flush_interval: Seconds between sending batches
+            max_batch_size: Maximum spans per request
+            max_queue_size: Maximum buffered spans, newer spans are dropped when the collector falls behind
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self._client = httpx.AsyncClient(timeout=10, headers=headers)
+        self._pending: List[Span] = []
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_spans = 0
+
+    def export(self, span: Span) -> None:
+        if len(self._pending) >= self.max_queue_size:
+            self.dropped_spans += 1
+            return
+        self._pending.append(span)
+        if self._task is None:
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                # No event loop yet, spans are sent once one is running
+                pass
+
+    def _encode(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "app"},
+                    "spans": [{
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        "parentSpanId": span.parent_id or "",
+                        "name": span.name,
+                        "kind": SPAN_KIND_INTERNAL,
+                        "startTimeUnixNano": str(span.start_time),
+                        "endTimeUnixNano": str(span.end_time),
+                        "attributes": _attributes(span.attributes),
+                        "status": {"code": STATUS_ERROR, "message": span.error} if span.error else {"code": STATUS_OK},
+                    } for span in spans]
+                }]
+            }]
+        }
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            try:
+                response = await self._client.post(self.endpoint, json=self._encode(batch))
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Failed to export {len(batch)} spans to {self.endpoint}: {str(e)}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def shutdown(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+        await self._client.aclose()
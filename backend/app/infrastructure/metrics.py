@@ -0,0 +1,32 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets in seconds, LLM requests take from under a second to minutes
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+# Buckets in seconds, tool calls range from in-memory lookups to long shell commands
+TOOL_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+llm_request_seconds = Histogram(
+    "manus_llm_request_seconds", "Latency of LLM requests",
+    ["model", "call_site"], buckets=LLM_BUCKETS
+)
+llm_request_errors = Counter(
+    "manus_llm_request_errors_total", "LLM requests that failed",
+    ["model", "call_site"]
+)
+llm_tokens = Counter(
+    "manus_llm_tokens_total", "Tokens used by LLM requests, by type prompt, completion or cached (prompt tokens served from cache)",
+    ["model", "call_site", "type"]
+)
+tool_call_seconds = Histogram(
+    "manus_tool_call_seconds", "Latency of tool calls, including retries",
+    ["tool", "function"], buckets=TOOL_BUCKETS
+)
+tool_call_failures = Counter(
+    "manus_tool_call_failures_total", "Tool calls that raised or returned an unsuccessful result",
+    ["tool", "function"]
+)
+sandbox_request_seconds = Histogram(
+    "manus_sandbox_request_seconds", "Latency of sandbox API requests until the response headers",
+    ["method", "path"], buckets=TOOL_BUCKETS
+)
+sse_connections = Gauge("manus_sse_connections", "Open SSE chat streams")
@@ -0,0 +1,21 @@
+import logging
+from app.domain.services.tracing import tracer
+from app.infrastructure.config import get_settings
+from app.infrastructure.external.tracing.memory_exporter import InMemorySpanExporter
+from app.infrastructure.external.tracing.otlp_exporter import OTLPSpanExporter
+from app.infrastructure.external.tracing.metrics_exporter import MetricsSpanExporter
+
+logger = logging.getLogger(__name__)
+
+
+def setup_tracing() -> None:
+    """Configure the span exporters of the agent loop tracer from the settings"""
+    settings = get_settings()
+    if settings.metrics_enabled:
+        tracer.add_exporter(MetricsSpanExporter())
+    if settings.tracing_exporter == "otlp":
+        tracer.add_exporter(OTLPSpanExporter(settings.otlp_endpoint, service_name=settings.tracing_service_name))
+        logger.info(f"Tracing enabled, exporting spans to {settings.otlp_endpoint}")
+    elif settings.tracing_exporter == "memory":
+        tracer.add_exporter(InMemorySpanExporter())
+        logger.info("Tracing enabled, keeping spans in memory")
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.application.services.agent import AgentService
+from app.interfaces.api.vnc_proxy import vnc_proxy_stats
+
+
+class AgentCollector:
+    """Read agent and VNC proxy state of this worker when metrics are scraped"""
+
+    def __init__(self, agent_service: AgentService):
+        self.agent_service = agent_service
+
+    def collect(self):
+        agents = GaugeMetricFamily("manus_agents", "Agents of this worker by flow state", labels=["state"])
+        for state, count in self.agent_service.get_agent_states().items():
+            agents.add_metric([state], count)
+        yield agents
+
+        depths = self.agent_service.get_queue_depths().values()
+        yield GaugeMetricFamily("manus_agent_queued_messages", "Messages waiting to be processed by agents",
+                                value=sum(depths))
+        yield GaugeMetricFamily("manus_agent_max_queue_depth", "Most messages waiting for a single agent",
+                                value=max(depths, default=0))
+
+        stats = vnc_proxy_stats
+        yield GaugeMetricFamily("manus_vnc_active_connections", "Open VNC proxy connections", value=stats.active_connections)
+        yield CounterMetricFamily("manus_vnc_connections", "VNC proxy connections", value=stats.total_connections)
+        yield CounterMetricFamily("manus_vnc_idle_timeouts", "VNC proxy connections closed for inactivity",
+                                  value=stats.idle_timeouts)
+        frames = CounterMetricFamily("manus_vnc_frames", "WebSocket frames relayed by the VNC proxy", labels=["direction"])
+        frames.add_metric(["to_sandbox"], stats.frames_to_sandbox)
+        frames.add_metric(["from_sandbox"], stats.frames_from_sandbox)
+        frames.add_metric(["to_browser"], stats.frames_to_browser)
+        yield frames
+        transferred = CounterMetricFamily("manus_vnc_bytes", "Bytes relayed by the VNC proxy", labels=["direction"])
+        transferred.add_metric(["to_sandbox"], stats.bytes_to_sandbox)
+        transferred.add_metric(["from_sandbox"], stats.bytes_from_sandbox)
+        yield transferred
+
+
+def create_metrics_router(agent_service: AgentService) -> APIRouter:
+    """Create the router serving Prometheus metrics of this worker at /metrics"""
+    REGISTRY.register(AgentCollector(agent_service))
+    router = APIRouter()
+
+    @router.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    return router
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, Header
 from sse_starlette.sse import EventSourceResponse
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, Dict, Any, Optional
 from sse_starlette.event import ServerSentEvent
-import asyncio
-import websockets
 import logging
 from app.application.services.agent import AgentService
 from app.application.schemas.request import ChatRequest, FileViewRequest, ShellViewRequest
-from app.application.schemas.response import APIResponse, AgentResponse, ShellViewResponse, FileViewResponse
+from app.application.schemas.response import APIResponse, AgentResponse, ShellViewResponse, FileViewResponse, SandboxStatsResponse, AgentUsageResponse
+from app.interfaces.api.vnc_proxy import VNCProxy, vnc_proxy_stats
+from app.infrastructure.config import get_settings
+from app.infrastructure.metrics import sse_connections
 
 router = APIRouter()
 agent_service = AgentService()
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 @router.post("/agents", response_model=APIResponse[AgentResponse])
@@ -25,13 +27,27 @@ async def create_agent() -> APIResponse[AgentResponse]:
     )
 
 @router.post("/agents/{agent_id}/chat")
-async def chat(agent_id: str, request: ChatRequest) -> EventSourceResponse:
+async def chat(
+    agent_id: str,
+    request: ChatRequest,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+) -> EventSourceResponse:
+    """Chat with the agent and stream its events
+
+    Reconnecting clients send the ID of the last event they received in the Last-Event-ID header
+    to resume the stream after it.
+    """
+    resume_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
     async def event_generator() -> AsyncGenerator[ServerSentEvent, None]:
-        async for event in agent_service.chat(agent_id, request.message, request.timestamp):
-            yield ServerSentEvent(
-                event=event.event,
-                data=event.data.model_dump_json() if event.data else None
-            )
+        events = agent_service.chat(agent_id, request.message, request.timestamp, resume_after, request.plan_delta)
+        with sse_connections.track_inprogress():
+            async for event in events:
+                yield ServerSentEvent(
+                    id=event.id,
+                    event=event.event,
+                    data=event.data_json()
+                )
 
     return EventSourceResponse(event_generator()) 
 
@@ -63,11 +79,25 @@ async def view_file(agent_id: str, request: FileViewRequest) -> APIResponse[File
     return APIResponse.success(result)
 
 
+@router.get("/agents/{agent_id}/stats", response_model=APIResponse[SandboxStatsResponse])
+async def sandbox_stats(agent_id: str) -> APIResponse[SandboxStatsResponse]:
+    """Get CPU, memory, disk and process usage of the agent's sandbox"""
+    result = await agent_service.get_sandbox_stats(agent_id)
+    return APIResponse.success(result)
+
+
+@router.get("/agents/{agent_id}/usage", response_model=APIResponse[AgentUsageResponse])
+async def agent_usage(agent_id: str) -> APIResponse[AgentUsageResponse]:
+    """Get prompt, completion and cached tokens and cost of the agent's LLM calls, in total, by call site and by step"""
+    result = await agent_service.get_usage(agent_id)
+    return APIResponse.success(result)
+
+
 @router.websocket("/agents/{agent_id}/vnc")
 async def vnc_websocket(websocket: WebSocket, agent_id: str):
     """VNC WebSocket endpoint (binary mode)
     
-    Establishes a connection with the VNC WebSocket service in the sandbox environment and forwards data bidirectionally
+    Establishes a connection with the VNC WebSocket service in the sandbox environment and relays data bidirectionally
     
     Args:
         websocket: WebSocket connection
@@ -76,55 +106,16 @@ async def vnc_websocket(websocket: WebSocket, agent_id: str):
     await websocket.accept(subprotocol="binary")
     
     try:
-    
         # Get sandbox environment address
         sandbox_ws_url = await agent_service.get_vnc_url(agent_id)
 
         logger.info(f"Connecting to VNC WebSocket at {sandbox_ws_url}")
-    
-        # Connect to sandbox WebSocket
-        async with websockets.connect(sandbox_ws_url) as sandbox_ws:
-            logger.info(f"Connected to VNC WebSocket at {sandbox_ws_url}")
-            # Create two tasks to forward data bidirectionally
-            async def forward_to_sandbox():
-                try:
-                    while True:
-                        data = await websocket.receive_bytes()
-                        logger.info(f"Forwarding data to sandbox: {data}")
-                        await sandbox_ws.send(data)
-                except WebSocketDisconnect:
-                    logger.info("Web -> VNC connection closed")
-                    pass
-                except Exception as e:
-                    logger.error(f"Error forwarding data to sandbox: {e}")
-            
-            async def forward_from_sandbox():
-                try:
-                    while True:
-                        data = await sandbox_ws.recv()
-                        logger.info(f"Forwarding data from sandbox: {data}")
-                        await websocket.send_bytes(data)
-                except websockets.exceptions.ConnectionClosed:
-                    logger.info("VNC -> Web connection closed")
-                    pass
-                except Exception as e:
-                    logger.error(f"Error forwarding data from sandbox: {e}")
-            
-            # Run two forwarding tasks concurrently
-            forward_task1 = asyncio.create_task(forward_to_sandbox())
-            forward_task2 = asyncio.create_task(forward_from_sandbox())
-            
-            # Wait for either task to complete (meaning connection has closed)
-            done, pending = await asyncio.wait(
-                [forward_task1, forward_task2],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-
-            logger.info("WebSocket connection closed")
-            
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
+        await VNCProxy(
+            websocket,
+            sandbox_ws_url,
+            idle_timeout=settings.vnc_idle_timeout,
+            compression=settings.vnc_compression
+        ).run()
     
     except ConnectionError as e:
         logger.error(f"Unable to connect to sandbox environment: {str(e)}")
@@ -134,3 +125,7 @@ async def vnc_websocket(websocket: WebSocket, agent_id: str):
         await websocket.close(code=1011, reason=f"WebSocket error: {str(e)}")
 
 
+@router.get("/vnc/stats", response_model=APIResponse[Dict[str, int]])
+async def vnc_stats() -> APIResponse[Dict[str, int]]:
+    """Get byte and frame counters of the VNC proxy of this worker"""
+    return APIResponse.success(vnc_proxy_stats.to_dict())
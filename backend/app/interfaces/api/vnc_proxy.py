@@ -0,0 +1,151 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from fastapi import WebSocket, WebSocketDisconnect
+import asyncio
+import logging
+import websockets
+
+logger = logging.getLogger(__name__)
+
+# Maximum bytes coalesced into one frame sent to the browser
+MAX_BATCH_BYTES = 256 * 1024
+
+
+@dataclass
+class VNCProxyStats:
+    """Counters of the VNC WebSocket proxy, shared by all connections of the process"""
+    active_connections: int = 0
+    total_connections: int = 0
+    idle_timeouts: int = 0
+    frames_to_sandbox: int = 0
+    bytes_to_sandbox: int = 0
+    frames_from_sandbox: int = 0
+    bytes_from_sandbox: int = 0
+    # Frames sent to browsers, lower than frames_from_sandbox when frames are batched
+    frames_to_browser: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+vnc_proxy_stats = VNCProxyStats()
+
+
+class VNCProxy:
+    """Low-overhead relay between a browser WebSocket and the sandbox VNC WebSocket
+
+    Each direction is relayed by a single task that receives a frame and sends it on. RFB over
+    WebSocket is a byte stream, so frames from the sandbox that were buffered while the browser
+    was slow are sent together as one frame. Frames are never formatted or logged.
+    """
+
+    def __init__(self, websocket: WebSocket, sandbox_ws_url: str, idle_timeout: Optional[float] = None,
+                 compression: bool = False):
+        """Initialize VNC proxy
+
+        Args:
+            websocket: Accepted browser WebSocket
+            sandbox_ws_url: Sandbox VNC WebSocket URL
+            idle_timeout: Seconds without traffic in either direction before the connection is closed,
+                None or 0 to keep idle connections open
+            compression: Negotiate permessage-deflate with the sandbox
+        """
+        self.websocket = websocket
+        self.sandbox_ws_url = sandbox_ws_url
+        self.idle_timeout = idle_timeout or None
+        self.compression = compression
+        self._last_activity = 0.0
+
+    def _touch(self) -> None:
+        self._last_activity = asyncio.get_running_loop().time()
+
+    async def run(self) -> None:
+        """Relay data until either side closes or the connection becomes idle"""
+        stats = vnc_proxy_stats
+        async with websockets.connect(
+            self.sandbox_ws_url,
+            compression="deflate" if self.compression else None,
+            max_size=None
+        ) as sandbox_ws:
+            logger.info(f"Connected to VNC WebSocket at {self.sandbox_ws_url}")
+            stats.active_connections += 1
+            stats.total_connections += 1
+            self._touch()
+            tasks = [
+                asyncio.create_task(self._forward_to_sandbox(sandbox_ws)),
+                asyncio.create_task(self._forward_to_browser(sandbox_ws)),
+            ]
+            try:
+                await self._wait(tasks)
+            finally:
+                stats.active_connections -= 1
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("VNC WebSocket connection closed")
+
+    async def _wait(self, tasks: List[asyncio.Task]) -> None:
+        """Wait until a relay task ends, closing the browser connection on idle timeout"""
+        loop = asyncio.get_running_loop()
+        while True:
+            timeout = None
+            if self.idle_timeout:
+                timeout = max(0.0, self._last_activity + self.idle_timeout - loop.time())
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if done:
+                return
+            if loop.time() - self._last_activity >= self.idle_timeout:
+                logger.info(f"Closing VNC WebSocket idle for {self.idle_timeout}s")
+                vnc_proxy_stats.idle_timeouts += 1
+                await self.websocket.close(code=1000, reason="Idle timeout")
+                return
+
+    async def _forward_to_sandbox(self, sandbox_ws) -> None:
+        stats = vnc_proxy_stats
+        try:
+            while True:
+                data = await self.websocket.receive_bytes()
+                self._touch()
+                stats.frames_to_sandbox += 1
+                stats.bytes_to_sandbox += len(data)
+                await sandbox_ws.send(data)
+        except WebSocketDisconnect:
+            logger.debug("Web -> VNC connection closed")
+        except websockets.exceptions.ConnectionClosed:
+            logger.debug("VNC connection closed while forwarding to sandbox")
+        except Exception as e:
+            logger.error(f"Error forwarding data to sandbox: {e}")
+
+    @staticmethod
+    def _buffered_frames(sandbox_ws) -> int:
+        """Number of frames received from the sandbox and not read yet, 0 if unknown"""
+        messages = getattr(sandbox_ws, "recv_messages", None)
+        return len(getattr(messages, "frames", ()))
+
+    async def _forward_to_browser(self, sandbox_ws) -> None:
+        stats = vnc_proxy_stats
+        try:
+            while True:
+                data = await sandbox_ws.recv()
+                self._touch()
+                stats.frames_from_sandbox += 1
+                stats.bytes_from_sandbox += len(data)
+                if self._buffered_frames(sandbox_ws):
+                    # The browser fell behind, send the frames already received as one
+                    chunks = [data]
+                    size = len(data)
+                    while size < MAX_BATCH_BYTES and self._buffered_frames(sandbox_ws):
+                        chunk = await sandbox_ws.recv()
+                        stats.frames_from_sandbox += 1
+                        stats.bytes_from_sandbox += len(chunk)
+                        chunks.append(chunk)
+                        size += len(chunk)
+                    data = b"".join(chunks)
+                stats.frames_to_browser += 1
+                await self.websocket.send_bytes(data)
+        except websockets.exceptions.ConnectionClosed:
+            logger.debug("VNC -> Web connection closed")
+        except (WebSocketDisconnect, RuntimeError):
+            logger.debug("Browser connection closed while forwarding from sandbox")
+        except Exception as e:
+            logger.error(f"Error forwarding data from sandbox: {e}")
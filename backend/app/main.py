@@ -3,14 +3,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
-from app.interfaces.api.routes import router
-from app.application.services.agent import AgentService
+from app.interfaces.api.routes import router, agent_service
+from app.interfaces.api.metrics import create_metrics_router
 from app.infrastructure.config import get_settings
 from app.infrastructure.logging import setup_logging
+from app.infrastructure.tracing import setup_tracing
+from app.domain.services.tracing import tracer
 from app.interfaces.api.errors.exception_handlers import register_exception_handlers
 
 # Initialize logging system
 setup_logging()
+setup_tracing()
 logger = logging.getLogger(__name__)
 
 # Load configuration
@@ -21,13 +24,14 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     # Code executed on startup
     logger.info("Application startup - Manus AI Agent initializing")
+    await agent_service.start()
     yield
     # Code executed on shutdown
     logger.info("Application shutdown - Manus AI Agent terminating")
     await agent_service.close()
+    await tracer.shutdown()
 
 app = FastAPI(title="Manus AI Agent", lifespan=lifespan)
-agent_service = AgentService()
 
 # Configure CORS
 app.add_middleware(
@@ -42,4 +46,6 @@ app.add_middleware(
 register_exception_handlers(app)
 
 # Register routes
-app.include_router(router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(router, prefix="/api/v1")
+if settings.metrics_enabled:
+    app.include_router(create_metrics_router(agent_service))
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""Agent loop orchestration benchmark
+
+Runs chat turns through AgentDomainService, PlanActFlow, the agents and their tools with a
+scripted LLM and an in-process fake sandbox and browser, so only the orchestration overhead
+is measured. No network access or model is needed. Reports the time and events of a turn,
+memory growth per executed step, and throughput of concurrent agents.
+
+Usage (from the backend directory):
+    python -m benchmarks.agent_loop [--turns 20] [--steps 3] [--agents 1,10,50] [--llm-latency 0.01] [--step-memory]
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import List, Tuple
+from app.domain.services.agent import AgentDomainService
+from app.infrastructure.external.llm.scripted_llm import DEFAULT_TOOL_CALLS, LLMScript, ScriptedLLMRouter
+from app.infrastructure.external.sandbox.fake_sandbox import FakeSandbox
+from app.infrastructure.external.browser.fake_browser import FakeBrowser
+
+
+def create_script(args: argparse.Namespace, latency: float = 0) -> LLMScript:
+    tool_calls = list(DEFAULT_TOOL_CALLS)
+    if args.step_memory:
+        tool_calls.append({"name": "scratchpad_write", "arguments": {"key": "notes", "content": "/home/ubuntu/notes.md"}})
+    return LLMScript(steps=args.steps, tool_calls=tool_calls, latency=latency)
+
+
+def create_agent(service: AgentDomainService, router: ScriptedLLMRouter, args: argparse.Namespace) -> str:
+    return service.create_agent("scripted", router, FakeSandbox(), FakeBrowser(), step_scoped_memory=args.step_memory).id
+
+
+async def run_turn(service: AgentDomainService, agent_id: str) -> Tuple[float, int]:
+    """Run one chat turn to completion, returning its duration and number of events"""
+    events = 0
+    start = time.perf_counter()
+    # A new timestamp for every turn, the same message and timestamp would replay the previous turn
+    async for _ in service.chat(agent_id, "Complete the scripted task", time.time_ns()):
+        events += 1
+    return time.perf_counter() - start, events
+
+
+async def bench_turns(args: argparse.Namespace) -> None:
+    router = ScriptedLLMRouter(create_script(args))
+    service = AgentDomainService()
+    agent_id = create_agent(service, router, args)
+    await run_turn(service, agent_id)  # Warm up
+
+    calls = router.calls
+    usage = service.get_agent(agent_id).usage.total
+    prompt_tokens = usage.prompt_tokens
+    durations, events = [], 0
+    for _ in range(args.turns):
+        duration, turn_events = await run_turn(service, agent_id)
+        durations.append(duration)
+        events += turn_events
+    calls = router.calls - calls
+    prompt_tokens = usage.prompt_tokens - prompt_tokens
+    total = sum(durations)
+    print(f"single agent, {args.turns} turns of {args.steps} steps:")
+    print(f"  per turn: p50 {statistics.median(durations) * 1e3:.2f} ms, max {max(durations) * 1e3:.2f} ms, "
+          f"{events / args.turns:.0f} events, {calls / args.turns:.0f} LLM calls")
+    print(f"  overhead per LLM call: {total / calls * 1e6:.0f} us, {events / total:,.0f} events/s")
+    print(f"  estimated prompt tokens: {prompt_tokens / args.turns:,.0f} per turn, {prompt_tokens / calls:,.0f} per LLM call")
+    await service.close_all()
+
+
+async def bench_memory(args: argparse.Namespace) -> None:
+    router = ScriptedLLMRouter(create_script(args))
+    service = AgentDomainService()
+    agent_id = create_agent(service, router, args)
+    await run_turn(service, agent_id)  # Warm up
+
+    tracemalloc.start()
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(args.turns):
+        await run_turn(service, agent_id)
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    steps = args.turns * args.steps
+    print(f"memory, {steps} steps on one agent:")
+    print(f"  growth {(after - before) / 1024:.0f} KiB, {(after - before) / steps / 1024:.1f} KiB per step, "
+          f"peak {peak / 1024 / 1024:.1f} MiB")
+    await service.close_all()
+
+
+async def bench_concurrency(agents: int, args: argparse.Namespace) -> None:
+    router = ScriptedLLMRouter(create_script(args, args.llm_latency))
+    service = AgentDomainService()
+    agent_ids = [create_agent(service, router, args) for _ in range(agents)]
+
+    start = time.perf_counter()
+    results: List[Tuple[float, int]] = await asyncio.gather(*[run_turn(service, agent_id) for agent_id in agent_ids])
+    elapsed = time.perf_counter() - start
+    durations = sorted(duration for duration, _ in results)
+    events = sum(turn_events for _, turn_events in results)
+    print(f"  {agents:>4} agents: {agents / elapsed:8.1f} turns/s, {events / elapsed:10,.0f} events/s, "
+          f"turn p50 {durations[len(durations) // 2] * 1e3:.0f} ms, "
+          f"p95 {durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1e3:.0f} ms")
+    await service.close_all()
+
+
+async def run(args: argparse.Namespace) -> None:
+    await bench_turns(args)
+    await bench_memory(args)
+    print(f"concurrent agents, one turn each, {args.llm_latency * 1e3:.0f} ms per LLM response:")
+    for agents in args.agents:
+        await bench_concurrency(agents, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20, help="Turns run on one agent")
+    parser.add_argument("--steps", type=int, default=3, help="Steps of each plan")
+    parser.add_argument("--agents", type=lambda value: [int(n) for n in value.split(",")], default=[1, 10, 50],
+                        help="Comma separated numbers of concurrent agents")
+    parser.add_argument("--llm-latency", type=float, default=0.01, help="Seconds per LLM response in the concurrency runs")
+    parser.add_argument("--step-memory", action="store_true", help="Start each step from fresh memory with the scratchpad")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
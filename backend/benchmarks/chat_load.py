@@ -0,0 +1,130 @@
+"""Chat load test against the HTTP API
+
+Simulates users that each create an agent and send it messages, reading every SSE stream to
+the end and waiting a random think time between messages. Reports time to first event, gaps
+between events, turn duration and error rates, to find how many concurrent chat streams one
+backend process sustains.
+
+Run the backend with the stub providers so results reflect backend overhead only:
+    LLM_PROVIDER=scripted SANDBOX_PROVIDER=fake uvicorn app.main:app --port 8000
+
+Usage (from the backend directory):
+    python -m benchmarks.chat_load [--url http://localhost:8000] [--users 50] [--messages 3] [--think-time 2]
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+import httpx
+
+
+@dataclass
+class LoadStats:
+    first_event: List[float] = field(default_factory=list)  # Seconds from request to first event
+    event_gaps: List[float] = field(default_factory=list)  # Seconds between consecutive events of a stream
+    turns: List[float] = field(default_factory=list)  # Seconds from request to the done event
+    events: int = 0
+    requests: int = 0
+    errors: int = 0  # Failed requests and streams ending without a done event
+    error_events: int = 0  # Error events sent by agents
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def read_events(response: httpx.Response):
+    """Yield the event type of each SSE event of a response"""
+    event: Optional[str] = None
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif not line and event:
+            yield event
+            event = None
+
+
+async def chat(client: httpx.AsyncClient, agent_id: str, message: str, stats: LoadStats) -> None:
+    stats.requests += 1
+    start = last = time.perf_counter()
+    first = True
+    done = False
+    try:
+        async with client.stream("POST", f"/api/v1/agents/{agent_id}/chat",
+                                 json={"message": message, "timestamp": int(time.time())}) as response:
+            response.raise_for_status()
+            async for event in read_events(response):
+                now = time.perf_counter()
+                if first:
+                    stats.first_event.append(now - start)
+                    first = False
+                else:
+                    stats.event_gaps.append(now - last)
+                last = now
+                stats.events += 1
+                if event == "error":
+                    stats.error_events += 1
+                elif event == "done":
+                    done = True
+        stats.turns.append(time.perf_counter() - start)
+    except httpx.HTTPError:
+        pass
+    if not done:
+        stats.errors += 1
+
+
+async def run_user(client: httpx.AsyncClient, user: int, args: argparse.Namespace, stats: LoadStats) -> None:
+    # Spread the users' start over the ramp up time
+    await asyncio.sleep(args.ramp_up * user / args.users)
+    stats.requests += 1
+    try:
+        response = await client.post("/api/v1/agents")
+        response.raise_for_status()
+        agent_id = response.json()["data"]["agent_id"]
+    except (httpx.HTTPError, KeyError, TypeError):
+        stats.errors += 1
+        return
+    for i in range(args.messages):
+        if i:
+            await asyncio.sleep(random.expovariate(1 / args.think_time) if args.think_time else 0)
+        await chat(client, agent_id, f"Message {i + 1} of user {user}", stats)
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[run_user(client, user, args, stats) for user in range(args.users)])
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.users} users, {args.messages} messages each, {elapsed:.1f} s")
+    print(f"  requests {stats.requests}, errors {stats.errors} ({stats.errors / max(1, stats.requests):.1%}), "
+          f"error events {stats.error_events}")
+    print(f"  events {stats.events}, {stats.events / elapsed:,.0f} events/s, {len(stats.turns) / elapsed:.1f} turns/s")
+    for label, values in (("time to first event", stats.first_event),
+                          ("event gap", stats.event_gaps),
+                          ("turn duration", stats.turns)):
+        print(f"  {label + ':':<21} p50 {percentile(values, 0.5) * 1e3:8.1f} ms, "
+              f"p95 {percentile(values, 0.95) * 1e3:8.1f} ms, p99 {percentile(values, 0.99) * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent users, each with its own agent")
+    parser.add_argument("--messages", type=int, default=3, help="Messages sent by each user")
+    parser.add_argument("--think-time", type=float, default=2, help="Mean seconds between a user's messages")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which users start")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before a request is failed")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
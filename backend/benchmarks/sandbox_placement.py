@@ -0,0 +1,78 @@
+"""Sandbox placement simulation
+
+Places sandboxes on fake Docker daemons of different sizes with each placement policy,
+with a share of sandboxes being destroyed along the way, and reports how many sandboxes
+fit and how evenly the hosts end up loaded.
+
+Usage (from the backend directory):
+    python -m benchmarks.sandbox_placement [--hosts 4] [--sandboxes 80] [--cpus 1] [--memory 2048]
+"""
+import argparse
+import random
+import time
+import uuid
+from typing import List
+from app.infrastructure.external.sandbox.fake_daemon import FakeDockerDaemon
+from app.infrastructure.external.sandbox.placement import SandboxScheduler, SANDBOX_LABEL
+
+
+def simulate(policy: str, args: argparse.Namespace) -> None:
+    sizes = [(8, 16384), (16, 32768), (32, 65536), (4, 8192)]
+    daemons = {}
+
+    def factory(url: str) -> FakeDockerDaemon:
+        cpus, memory_mb = sizes[len(daemons) % len(sizes)]
+        daemons[url] = FakeDockerDaemon(url, cpus=cpus, memory_mb=memory_mb)
+        return daemons[url]
+
+    scheduler = SandboxScheduler(
+        [f"tcp://host-{i}:2375" for i in range(args.hosts)],
+        policy=policy,
+        sandbox_cpus=args.cpus,
+        sandbox_memory_mb=args.memory,
+        refresh_interval=args.refresh,
+        client_factory=factory
+    )
+    rng = random.Random(0)
+    running: List[tuple] = []
+    placed = rejected = 0
+    start = time.perf_counter()
+    for _ in range(args.sandboxes):
+        if running and rng.random() < args.churn:
+            url, name = running.pop(rng.randrange(len(running)))
+            scheduler.get_client(url).containers.get(name).stop()
+            scheduler.release(url)
+        try:
+            host = scheduler.acquire()
+        except RuntimeError:
+            rejected += 1
+            continue
+        name = f"sandbox-{uuid.uuid4().hex[:8]}"
+        scheduler.get_client(host.url).containers.run(image="sandbox", name=name, labels={SANDBOX_LABEL: "sandbox"})
+        scheduler.confirm(host.url)
+        running.append((host.url, name))
+        placed += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{policy}: placed {placed}, rejected {rejected}, running {len(running)}, "
+          f"{elapsed / max(1, placed + rejected) * 1e6:.1f} us per placement")
+    for host in scheduler.get_hosts():
+        print(f"  {host.url}: {host.cpus} CPUs, {host.sandboxes} sandboxes, "
+              f"utilization {host.utilization(args.cpus, args.memory):.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--sandboxes", type=int, default=80, help="Sandboxes to place")
+    parser.add_argument("--cpus", type=float, default=1, help="CPUs reserved per sandbox")
+    parser.add_argument("--memory", type=int, default=2048, help="Memory in MB reserved per sandbox")
+    parser.add_argument("--churn", type=float, default=0.2, help="Probability of destroying a sandbox before each placement")
+    parser.add_argument("--refresh", type=float, default=1, help="Seconds between reading host load from the daemons")
+    args = parser.parse_args()
+    for policy in ("least_loaded", "bin_packing"):
+        simulate(policy, args)
+
+
+if __name__ == "__main__":
+    main()
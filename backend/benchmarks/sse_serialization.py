@@ -0,0 +1,83 @@
+"""SSE event serialization micro-benchmark
+
+Converts a typical mix of domain events to SSE events and serializes their data the
+way the chat endpoint does, measuring serialization alone and with the conversion.
+
+Usage (from the backend directory):
+    python -m benchmarks.sse_serialization [--events 20000] [--steps 30]
+"""
+import argparse
+import time
+from typing import Callable, List
+from app.application.schemas.event import SSEEvent
+from app.application.services.agent import AgentService
+from app.domain.models.plan import Plan, Step, ExecutionStatus
+from app.domain.models.event import (
+    AgentEvent,
+    PlanUpdatedEvent,
+    StepStartedEvent,
+    StepCompletedEvent,
+    ToolCallingEvent,
+    ToolCalledEvent,
+    MessageEvent,
+)
+
+
+def build_events(count: int, steps: int) -> List[AgentEvent]:
+    plan = Plan(
+        id="plan",
+        title="Benchmark plan",
+        goal="Measure SSE serialization",
+        steps=[Step(id=str(i), description=f"Step {i}: collect and summarize sources") for i in range(1, steps + 1)]
+    )
+    step = plan.steps[0]
+    step.status = ExecutionStatus.COMPLETED
+    step.result = "Collected 12 sources and wrote the summary to /home/ubuntu/summary.md"
+    mix: List[AgentEvent] = [
+        ToolCallingEvent(tool_name="shell", function_name="shell_exec",
+                         function_args={"id": "main", "exec_dir": "/home/ubuntu", "command": "ls -la"}),
+        ToolCallingEvent(tool_name="file", function_name="file_write",
+                         function_args={"file": "/home/ubuntu/summary.md", "content": "# Summary\n" + "text " * 200}),
+        ToolCalledEvent(tool_name="search", function_name="search_web", function_args={"query": "benchmark"},
+                        function_result={"results": [{"title": f"Result {i}", "link": f"https://example.com/{i}"} for i in range(10)]}),
+        StepStartedEvent(step=step, plan=plan),
+        StepCompletedEvent(step=step, plan=plan),
+        PlanUpdatedEvent(plan=plan),
+        MessageEvent(message="Working on it"),
+    ]
+    return [mix[i % len(mix)] for i in range(count)]
+
+
+def measure(events: List[AgentEvent], serialize: Callable[[SSEEvent], str], convert: bool, repeat: int) -> float:
+    """Best events/s of several runs, optionally including the domain to SSE event conversion"""
+    converted = [list(AgentService._to_sse_event(event)) for event in events]
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if convert:
+            for event in events:
+                for sse_event in AgentService._to_sse_event(event):
+                    serialize(sse_event)
+        else:
+            for sse_events in converted:
+                for sse_event in sse_events:
+                    serialize(sse_event)
+        best = max(best, len(events) / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--steps", type=int, default=30, help="Number of steps in the plan")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    events = build_events(args.events, args.steps)
+    for convert in (False, True):
+        rate = measure(events, lambda e: e.data_json(), convert, args.repeat)
+        label = "conversion + serialization" if convert else "serialization"
+        print(f"{label:<28} {rate:>12,.0f} events/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import asyncio
+
+from app.domain.models.event import (
+    MessageEvent,
+    PlanUpdatedEvent,
+    StepCompletedEvent,
+    StepStartedEvent,
+    ToolCalledEvent,
+    ToolCallingEvent,
+)
+from app.domain.models.plan import ExecutionStatus, Plan, Step
+from app.domain.services.event_log import AgentEventLog
+
+
+def message(text: str) -> MessageEvent:
+    return MessageEvent(message=text)
+
+
+def tool_called(tool_name: str = "shell") -> ToolCalledEvent:
+    return ToolCalledEvent(tool_name=tool_name, function_name="run", function_args={}, function_result=None)
+
+
+def tool_calling(tool_name: str = "shell") -> ToolCallingEvent:
+    return ToolCallingEvent(tool_name=tool_name, function_name="run", function_args={})
+
+
+async def read_retained(log: AgentEventLog, after_id: int = 0) -> list:
+    """Read the retained events after an ID and stop"""
+    log.close()
+    return [event async for event in log.read(after_id)]
+
+
+def test_read_resumes_after_last_seen_event():
+    async def run():
+        log = AgentEventLog()
+        for text in ("a", "b", "c"):
+            await log.append(message(text))
+        events = await read_retained(log, after_id=1)
+        assert [event.message for event in events] == ["b", "c"]
+        assert [event.id for event in events] == [2, 3]
+
+    asyncio.run(run())
+
+
+def test_ids_beyond_the_log_resume_from_the_latest_event():
+    async def run():
+        log = AgentEventLog()
+        await log.append(message("a"))
+        assert await read_retained(log, after_id=42) == []
+
+    asyncio.run(run())
+
+
+def test_oldest_events_are_dropped_beyond_max_size():
+    async def run():
+        log = AgentEventLog(max_size=2)
+        for text in ("a", "b", "c"):
+            await log.append(message(text))
+        assert log.first_id == 2
+        assert [event.message for event in await read_retained(log)] == ["b", "c"]
+
+    asyncio.run(run())
+
+
+def test_follow_receives_new_events():
+    async def run():
+        log = AgentEventLog()
+        received = []
+
+        async def follow():
+            async for event in log.read():
+                received.append(event.message)
+
+        reader = asyncio.create_task(follow())
+        await asyncio.sleep(0)
+        await log.append(message("a"))
+        await log.append(message("b"))
+        await asyncio.sleep(0)
+        log.close()
+        await asyncio.wait_for(reader, 1)
+        assert received == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_superseded_plan_and_step_events_are_coalesced():
+    async def run():
+        log = AgentEventLog()
+        step = Step(id="1", description="Step 1")
+        plan = Plan(id="plan", title="Plan", goal="Goal", steps=[step])
+        await log.append(PlanUpdatedEvent(plan=plan))
+        await log.append(StepStartedEvent(step=step, plan=plan))
+        await log.append(PlanUpdatedEvent(plan=plan))
+        done = step.model_copy(update={"status": ExecutionStatus.COMPLETED})
+        await log.append(StepCompletedEvent(step=done, plan=plan))
+        events = await read_retained(log)
+        assert [event.type for event in events] == ["plan_updated", "step_completed"]
+        assert [event.id for event in events] == [3, 4]
+
+    asyncio.run(run())
+
+
+def test_consecutive_tool_events_are_coalesced_without_readers():
+    async def run():
+        log = AgentEventLog()
+        await log.append(tool_calling())
+        await log.append(tool_called())
+        await log.append(tool_called("message"))
+        await log.append(tool_calling())
+        events = await read_retained(log)
+        assert [(event.type, event.tool_name) for event in events] == [
+            ("tool_called", "shell"), ("tool_called", "message"), ("tool_calling", "shell")
+        ]
+
+    asyncio.run(run())
+
+
+def test_stalled_reader_delays_appends_only_once():
+    async def run():
+        log = AgentEventLog(backpressure_threshold=2, backpressure_timeout=0.05)
+        reader = log.read()
+        await log.append(message("a"))
+        # The reader consumes one event and then stalls
+        assert (await reader.__anext__()).message == "a"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for text in ("b", "c", "d", "e", "f"):
+            await log.append(message(text))
+        # Only the append that first found the reader lagging waited for it
+        assert 0.05 <= loop.time() - started < 0.09
+        # The stalled reader reads on from where it stopped
+        assert [(await reader.__anext__()).message for _ in range(5)] == ["b", "c", "d", "e", "f"]
+        await reader.aclose()
+
+    asyncio.run(run())
+
+
+def test_reader_catching_up_releases_backpressure():
+    async def run():
+        log = AgentEventLog(backpressure_threshold=3, backpressure_timeout=5)
+        reader = log.read()
+        await log.append(message("a"))
+        # An event counts as consumed once the reader asks for the next one
+        await reader.__anext__()
+        await log.append(message("b"))
+        await log.append(message("c"))
+        append = asyncio.create_task(log.append(message("d")))
+        await asyncio.sleep(0.01)
+        assert not append.done()
+        await reader.__anext__()
+        assert await asyncio.wait_for(append, 1) == 4
+        await reader.aclose()
+
+    asyncio.run(run())
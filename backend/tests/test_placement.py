@@ -0,0 +1,94 @@
+import pytest
+
+from app.infrastructure.external.sandbox.fake_daemon import FakeDockerDaemon
+from app.infrastructure.external.sandbox.placement import SANDBOX_LABEL, SandboxScheduler
+
+
+class FlakyDaemon(FakeDockerDaemon):
+    """Fake daemon whose info call fails a given number of times"""
+
+    def __init__(self, url: str = "", failures: int = 1, **kwargs):
+        super().__init__(url, **kwargs)
+        self.failures = failures
+
+    def info(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("daemon unavailable")
+        return super().info()
+
+
+def scheduler(hosts: int = 2, **kwargs) -> SandboxScheduler:
+    kwargs.setdefault("client_factory", FakeDockerDaemon.factory(cpus=4, memory_mb=8192))
+    return SandboxScheduler([f"tcp://host-{i}:2375" for i in range(hosts)], refresh_interval=3600, **kwargs)
+
+
+def create(scheduler: SandboxScheduler, url: str, name: str) -> None:
+    scheduler.get_client(url).containers.run(image="sandbox", name=name, labels={SANDBOX_LABEL: "sandbox"})
+
+
+def test_least_loaded_spreads_sandboxes_over_hosts():
+    placement = scheduler(sandbox_cpus=1)
+    urls = [placement.acquire().url for _ in range(4)]
+    assert sorted(urls) == ["tcp://host-0:2375"] * 2 + ["tcp://host-1:2375"] * 2
+
+
+def test_bin_packing_fills_one_host_first():
+    placement = scheduler(policy="bin_packing", sandbox_cpus=1)
+    urls = [placement.acquire().url for _ in range(5)]
+    assert urls == ["tcp://host-0:2375"] * 4 + ["tcp://host-1:2375"]
+
+
+def test_acquire_fails_once_hosts_are_full_and_release_frees_a_place():
+    placement = scheduler(hosts=1, max_per_host=2)
+    host = placement.acquire()
+    placement.acquire()
+    with pytest.raises(RuntimeError):
+        placement.acquire()
+    placement.release(host.url, confirmed=False)
+    assert placement.acquire().url == host.url
+
+
+def test_refresh_keeps_sandboxes_still_being_created_reserved():
+    placement = scheduler(hosts=1, max_per_host=2)
+    host = placement.acquire()
+    create(placement, host.url, "sandbox-1")
+    placement.confirm(host.url)
+    # The second sandbox's container does not exist yet when the daemon is read again
+    placement.acquire()
+    placement.refresh(force=True)
+    assert (host.sandboxes, host.reserved) == (1, 1)
+    with pytest.raises(RuntimeError):
+        placement.acquire()
+
+
+def test_confirmed_sandboxes_are_released_from_the_running_count():
+    placement = scheduler(hosts=1)
+    host = placement.acquire()
+    placement.confirm(host.url)
+    assert (host.sandboxes, host.reserved) == (1, 0)
+    placement.release(host.url)
+    assert (host.sandboxes, host.reserved) == (0, 0)
+
+
+def test_unavailable_host_is_read_again_before_giving_up():
+    placement = scheduler(client_factory=lambda url: FlakyDaemon(url, failures=1, cpus=4), sandbox_cpus=1)
+    host = placement.acquire()
+    assert host.healthy
+    assert all(host.healthy for host in placement.get_hosts())
+
+
+def test_only_host_is_used_while_unavailable():
+    placement = scheduler(hosts=1, client_factory=lambda url: FlakyDaemon(url, failures=2))
+    host = placement.acquire()
+    assert not host.healthy
+    assert host.reserved == 1
+
+
+def test_unavailable_hosts_are_skipped_when_others_are_available():
+    def factory(url: str) -> FakeDockerDaemon:
+        failures = 2 if url.startswith("tcp://host-0") else 0
+        return FlakyDaemon(url, failures=failures)
+
+    placement = scheduler(client_factory=factory)
+    assert placement.acquire().url == "tcp://host-1:2375"
@@ -0,0 +1,63 @@
+from app.domain.models.plan import ExecutionStatus, Plan, Step
+from app.domain.services.agents.planner import PlannerAgent
+
+
+def make_plan(*steps: Step) -> Plan:
+    return Plan(id="plan", title="Plan", goal="Goal", steps=list(steps))
+
+
+def step(step_id: str, dependencies=None, status=ExecutionStatus.PENDING) -> Step:
+    return Step(id=step_id, description=f"Step {step_id}", dependencies=dependencies, status=status)
+
+
+def ids(steps) -> list:
+    return [step.id for step in steps]
+
+
+def test_ready_steps_without_dependencies_run_in_order():
+    plan = make_plan(step("1"), step("2"), step("3"))
+    assert ids(plan.get_ready_steps()) == ["1"]
+    plan.steps[0].status = ExecutionStatus.COMPLETED
+    assert ids(plan.get_ready_steps()) == ["2"]
+
+
+def test_ready_steps_follow_dependencies():
+    plan = make_plan(step("1", []), step("2", ["1"]), step("3", []))
+    assert ids(plan.get_ready_steps()) == ["1", "3"]
+    assert ids(plan.get_ready_steps(limit=1)) == ["1"]
+    plan.steps[0].status = ExecutionStatus.FAILED
+    assert ids(plan.get_ready_steps()) == ["2", "3"]
+
+
+def test_ready_steps_skip_running_steps_and_ignore_unknown_dependencies():
+    plan = make_plan(step("1", [], ExecutionStatus.RUNNING), step("2", ["1"]), step("3", ["missing"]))
+    assert ids(plan.get_ready_steps()) == ["3"]
+
+
+def test_merge_keeps_steps_completed_out_of_order():
+    steps = [
+        step("1", [], ExecutionStatus.COMPLETED),
+        step("2", ["1"]),
+        step("3", [], ExecutionStatus.COMPLETED),
+    ]
+    steps[2].result = "result of 3"
+    merged = PlannerAgent._merge_steps(steps, [Step(id="2", description="Step 2 revised", dependencies=["1"])])
+    assert ids(merged) == ["1", "2", "3"]
+    assert merged[1].description == "Step 2 revised"
+    assert merged[2].status == ExecutionStatus.COMPLETED
+    assert merged[2].result == "result of 3"
+
+
+def test_merge_drops_steps_reusing_done_ids():
+    steps = [step("1", [], ExecutionStatus.COMPLETED), step("2", ["1"]), step("3", [], ExecutionStatus.COMPLETED)]
+    merged = PlannerAgent._merge_steps(steps, [step("2", ["1"]), Step(id="3", description="Run 3 again")])
+    assert ids(merged) == ["1", "2", "3"]
+    assert merged[2].description == "Step 3"
+    assert merged[2].status == ExecutionStatus.COMPLETED
+
+
+def test_merge_removes_left_out_steps_and_inserts_added_steps():
+    steps = [step("1", status=ExecutionStatus.COMPLETED), step("2"), step("3"), step("4")]
+    merged = PlannerAgent._merge_steps(steps, [step("5"), step("2"), step("6"), step("4")])
+    assert ids(merged) == ["1", "5", "2", "6", "4"]
+    assert all(not step.is_done() for step in merged[1:])
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.domain.models.cluster import AgentRegistration
+from app.infrastructure.external.cluster.local_cluster import LocalAgentRegistry
+
+
+def registration(worker_id: str) -> AgentRegistration:
+    return AgentRegistration(agent_id="agent", worker_id=worker_id, sandbox={})
+
+
+def test_register_keeps_first_owner():
+    async def run():
+        registry = LocalAgentRegistry()
+        assert await registry.register(registration("a"))
+        assert not await registry.register(registration("b"))
+        assert (await registry.get("agent")).worker_id == "a"
+
+    asyncio.run(run())
+
+
+def test_refresh_reports_lost_ownership():
+    async def run():
+        registry = LocalAgentRegistry()
+        await registry.register(registration("a"))
+        assert await registry.refresh(registration("a"))
+        await registry.unregister("agent")
+        await registry.register(registration("b"))
+        assert not await registry.refresh(registration("a"))
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.domain.models.tool_result import ToolResult
+from app.domain.services.tools.base import BaseTool, ToolArgumentError, tool
+
+
+class EchoTool(BaseTool):
+    name = "echo"
+
+    @tool(
+        name="echo",
+        description="Echo a text",
+        parameters={"text": {"type": "string", "description": "Text to echo"}},
+        required=["text"]
+    )
+    async def echo(self, text: str) -> ToolResult:
+        return ToolResult(success=True, data=text)
+
+    @tool(
+        name="echo_twice",
+        description="Echo a text twice",
+        parameters={"text": {"type": "string", "description": "Text to echo"}},
+        required=["text"]
+    )
+    async def echo_twice(self, text: str) -> ToolResult:
+        return ToolResult(success=True, data=text * 2)
+
+
+class LoudEchoTool(EchoTool):
+    """Overrides a tool method without repeating the decorator"""
+
+    async def echo(self, text: str) -> ToolResult:
+        return ToolResult(success=True, data=text.upper())
+
+
+class RedefinedEchoTool(EchoTool):
+    """Redefines a tool with a new schema"""
+
+    @tool(
+        name="echo",
+        description="Echo a text a number of times",
+        parameters={
+            "text": {"type": "string", "description": "Text to echo"},
+            "times": {"type": "integer", "description": "Number of times"}
+        },
+        required=["text", "times"]
+    )
+    async def echo(self, text: str, times: int) -> ToolResult:
+        return ToolResult(success=True, data=text * times)
+
+
+def test_decorated_functions_are_registered():
+    echo = EchoTool()
+    assert echo.get_function_names() == ["echo", "echo_twice"]
+    assert [schema["function"]["name"] for schema in echo.get_tools()] == ["echo", "echo_twice"]
+    assert echo.has_function("echo_twice")
+    assert not echo.has_function("shout")
+
+
+def test_invoke_function_calls_the_tool():
+    result = asyncio.run(EchoTool().invoke_function("echo_twice", text="ab"))
+    assert result.data == "abab"
+
+
+def test_unknown_function_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(EchoTool().invoke_function("shout", text="a"))
+
+
+def test_override_without_decorator_keeps_schema_and_is_called():
+    loud = LoudEchoTool()
+    assert loud.get_function_names() == ["echo", "echo_twice"]
+    assert asyncio.run(loud.invoke_function("echo", text="hi")).data == "HI"
+    # The base class still calls its own method
+    assert asyncio.run(EchoTool().invoke_function("echo", text="hi")).data == "hi"
+
+
+def test_redefined_tool_replaces_the_inherited_schema():
+    redefined = RedefinedEchoTool()
+    schema = next(schema for schema in redefined.get_tools() if schema["function"]["name"] == "echo")
+    assert schema["function"]["parameters"]["required"] == ["text", "times"]
+    assert asyncio.run(redefined.invoke_function("echo", text="a", times=3)).data == "aaa"
+
+
+def test_arguments_are_validated_against_the_schema():
+    echo = EchoTool()
+    echo.validate_arguments("echo", {"text": "a"})
+    with pytest.raises(ToolArgumentError):
+        echo.validate_arguments("echo", {})
+    with pytest.raises(ToolArgumentError):
+        echo.validate_arguments("echo", {"text": 1})
+    with pytest.raises(ToolArgumentError):
+        echo.validate_arguments("echo", {"text": "a", "loud": True})
@@ -0,0 +1,45 @@
+import asyncio
+
+import websockets
+
+from app.interfaces.api.vnc_proxy import VNCProxy, vnc_proxy_stats
+
+
+class SlowBrowser:
+    """Browser WebSocket that is slower than the sandbox and never sends anything"""
+
+    def __init__(self):
+        self.received = bytearray()
+        self.sends = 0
+
+    async def receive_bytes(self) -> bytes:
+        await asyncio.sleep(3600)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await asyncio.sleep(0.001)
+        self.received += data
+        self.sends += 1
+
+    async def close(self, **kwargs) -> None:
+        pass
+
+
+def test_relays_all_frames_and_batches_for_a_slow_browser():
+    frames = [bytes([i % 256]) * 100 for i in range(300)]
+
+    async def sandbox(ws):
+        for frame in frames:
+            await ws.send(frame)
+
+    async def run():
+        async with websockets.serve(sandbox, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            browser = SlowBrowser()
+            frames_before = vnc_proxy_stats.frames_from_sandbox
+            await asyncio.wait_for(VNCProxy(browser, f"ws://127.0.0.1:{port}").run(), 10)
+        # Frames sent right before the sandbox closed still reach the browser, in order
+        assert bytes(browser.received) == b"".join(frames)
+        assert vnc_proxy_stats.frames_from_sandbox - frames_before == len(frames)
+        assert browser.sends < len(frames)
+
+    asyncio.run(run())
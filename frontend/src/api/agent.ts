@@ -29,6 +29,9 @@ export const getVNCUrl = (agentId: string): string => {
   return `${wsBaseUrl}/agents/${agentId}/vnc`;
 }
 
+const MAX_CHAT_RETRIES = 3;
+const CHAT_RETRY_INTERVAL = 1000;
+
 /**
  * Chat with Agent (using SSE to receive streaming responses)
  */
@@ -40,6 +43,8 @@ export const chatWithAgent = async (
 ) => {
   try {
     const apiUrl = `${BASE_URL}/agents/${agentId}/chat`;
+    // Retries resume after the last received event via the Last-Event-ID header
+    let retries = 0;
     
     await fetchEventSource(apiUrl, {
       method: 'POST',
@@ -47,8 +52,9 @@ export const chatWithAgent = async (
         'Content-Type': 'application/json',
       },
       openWhenHidden: true,
-      body: JSON.stringify({ message, timestamp: Math.floor(Date.now() / 1000) }),
+      body: JSON.stringify({ message, timestamp: Math.floor(Date.now() / 1000), plan_delta: true }),
       onmessage(event: EventSourceMessage) {
+        retries = 0;
         if (event.event && event.event.trim() !== '') {
           onMessage({
             event: event.event as SSEEvent['event'],
@@ -58,6 +64,10 @@ export const chatWithAgent = async (
       },
       onerror(err) {
         console.error('EventSource error:', err);
+        if (retries < MAX_CHAT_RETRIES) {
+          retries++;
+          return CHAT_RETRY_INTERVAL;
+        }
         if (onError) {
           onError(err instanceof Error ? err : new Error(String(err)));
         }
@@ -1,5 +1,5 @@
 export type SSEEvent = {
-  event: 'tool' | 'step' | 'message' | 'error' | 'done' | 'title';
+  event: 'tool' | 'step' | 'message' | 'error' | 'done' | 'title' | 'plan' | 'plan_delta';
   data: ToolEventData | StepEventData | MessageEventData | ErrorEventData | DoneEventData | TitleEventData;
 }
 
@@ -39,4 +39,18 @@ export interface TitleEventData {
 export interface PlanEventData {
   timestamp: number;
   steps: StepEventData[];
+  version?: number;
+}
+
+export interface PlanStepChange {
+  op: 'add' | 'remove' | 'status' | 'description';
+  id: string;
+  status?: StepEventData['status'];
+  description?: string;
+}
+
+export interface PlanDeltaEventData {
+  timestamp: number;
+  version: number;
+  changes: PlanStepChange[];
 }
\ No newline at end of file
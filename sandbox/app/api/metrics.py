@@ -0,0 +1,35 @@
+import logging
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.core.exceptions import AppException
+from app.core.metrics import (
+    shell_sessions, shell_running_processes, shell_output_bytes,
+    supervisor_process_running, supervisor_timeout_remaining_seconds
+)
+from app.services.shell import shell_service
+from app.services.supervisor import supervisor_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Get Prometheus metrics of shell sessions, file operations and supervisord programs
+    """
+    shells = list(shell_service.active_shells.values())
+    shell_sessions.set(len(shells))
+    shell_running_processes.set(sum(1 for shell in shells if shell["process"].returncode is None))
+    shell_output_bytes.set(sum(len(shell["output"].encode("utf-8")) for shell in shells))
+
+    try:
+        for process in await supervisor_service.get_all_processes():
+            supervisor_process_running.labels(process.name).set(1 if process.statename == "RUNNING" else 0)
+    except AppException as e:
+        logger.warning(f"Failed to get supervisord program states: {e.message}")
+    timeout = await supervisor_service.get_timeout_status()
+    supervisor_timeout_remaining_seconds.set(timeout.remaining_seconds if timeout.active else -1)
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
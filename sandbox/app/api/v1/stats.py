@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.schemas.response import Response
+from app.services.stats import stats_service
+
+
+router = APIRouter()
+
+@router.get("", response_model=Response)
+async def get_stats():
+    """
+    Get CPU, memory, disk and process usage of the sandbox
+    """
+    result = await stats_service.get_stats()
+    return Response(
+        success=True,
+        message="Resource usage retrieved successfully",
+        data=result.model_dump()
+    )
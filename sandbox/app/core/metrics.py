@@ -0,0 +1,48 @@
+"""
+Prometheus metrics of the sandbox API
+"""
+import time
+import functools
+from typing import Callable
+from prometheus_client import Counter, Gauge, Histogram
+
+file_operation_seconds = Histogram(
+    "sandbox_file_operation_seconds", "Latency of file operations",
+    ["operation"], buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+file_operation_errors = Counter(
+    "sandbox_file_operation_errors_total", "File operations that failed",
+    ["operation"]
+)
+shell_sessions = Gauge("sandbox_shell_sessions", "Shell sessions")
+shell_running_processes = Gauge("sandbox_shell_running_processes", "Shell sessions with a running process")
+shell_output_bytes = Gauge("sandbox_shell_output_bytes", "Output bytes buffered by all shell sessions")
+supervisor_process_running = Gauge(
+    "sandbox_supervisor_process_running", "Whether a supervisord program is running, 1 or 0",
+    ["name"]
+)
+supervisor_timeout_remaining_seconds = Gauge(
+    "sandbox_supervisor_timeout_remaining_seconds", "Seconds until the sandbox shuts down, -1 without a timeout"
+)
+
+
+def timed_file_operation(operation: str) -> Callable:
+    """
+    Record latency and failures of the decorated async file operation
+    
+    Args:
+        operation: Operation label, e.g. read or write
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                file_operation_errors.labels(operation).inc()
+                raise
+            finally:
+                file_operation_seconds.labels(operation).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -7,6 +7,7 @@ import sys
 
 from app.core.config import settings
 from app.api.router import api_router
+from app.api import metrics
 from app.core.exceptions import (
     AppException, 
     app_exception_handler, 
@@ -68,5 +69,6 @@ app.add_exception_handler(Exception, general_exception_handler)
 
 # Register routes
 app.include_router(api_router, prefix="/api/v1")
+app.include_router(metrics.router)
 
 logger.info("Sandbox API routes registered and server ready")
\ No newline at end of file
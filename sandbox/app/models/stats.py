@@ -0,0 +1,18 @@
+"""
+Resource usage model definitions
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ResourceStats(BaseModel):
+    """Resource usage of the sandbox container"""
+    cpu_usage_seconds: float = Field(..., description="CPU time used since the container started (seconds)")
+    cpu_percent: Optional[float] = Field(None, description="CPU usage since the previous request, 100 is one full CPU")
+    cpu_limit: Optional[float] = Field(None, description="Number of CPUs the container may use, None if unlimited")
+    memory_used_bytes: int = Field(..., description="Memory used (bytes)")
+    memory_limit_bytes: Optional[int] = Field(None, description="Memory limit (bytes), None if unlimited")
+    disk_used_bytes: int = Field(..., description="Disk space used on the root filesystem (bytes)")
+    disk_total_bytes: int = Field(..., description="Disk space of the root filesystem (bytes)")
+    process_count: int = Field(..., description="Number of running processes")
+    pids_limit: Optional[int] = Field(None, description="Process limit, None if unlimited")
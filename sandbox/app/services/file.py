@@ -12,11 +12,13 @@ from app.models.file import (
     FileSearchResult, FileFindResult
 )
 from app.core.exceptions import AppException, ResourceNotFoundException, BadRequestException
+from app.core.metrics import timed_file_operation
 
 
 class FileService:
     """File Operation Service"""
 
+    @timed_file_operation("read")
     async def read_file(self, file: str, start_line: Optional[int] = None, 
                  end_line: Optional[int] = None, sudo: bool = False) -> FileReadResult:
         """
@@ -77,6 +79,7 @@ class FileService:
                 raise e
             raise AppException(message=f"Failed to read file: {str(e)}")
 
+    @timed_file_operation("write")
     async def write_file(self, file: str, content: str, append: bool = False,
                   leading_newline: bool = False, trailing_newline: bool = False,
                   sudo: bool = False) -> FileWriteResult:
@@ -149,6 +152,7 @@ class FileService:
                 raise e
             raise AppException(message=f"Failed to write file: {str(e)}")
 
+    @timed_file_operation("replace")
     async def str_replace(self, file: str, old_str: str, new_str: str, 
                    sudo: bool = False) -> FileReplaceResult:
         """
@@ -183,6 +187,7 @@ class FileService:
             replaced_count=replaced_count
         )
 
+    @timed_file_operation("search")
     async def find_in_content(self, file: str, regex: str, 
                        sudo: bool = False) -> FileSearchResult:
         """
@@ -224,6 +229,7 @@ class FileService:
             line_numbers=line_numbers
         )
 
+    @timed_file_operation("find")
     async def find_by_name(self, path: str, glob_pattern: str) -> FileFindResult:
         """
         Asynchronously find files by name pattern
@@ -0,0 +1,124 @@
+"""
+Resource Usage Service Implementation
+"""
+import os
+import time
+import shutil
+import asyncio
+from typing import Optional
+from app.models.stats import ResourceStats
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    if value is None or value == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class StatsService:
+    """Resource usage of the sandbox from cgroupfs (v2 or v1), falling back to /proc"""
+
+    def __init__(self):
+        self.cgroup_v2 = os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers"))
+        # Previous CPU usage sample (cpu seconds, wall time) to compute the usage percentage
+        self._last_sample: Optional[tuple] = None
+
+    def _cpu_usage_seconds(self) -> float:
+        if self.cgroup_v2:
+            for line in (_read(os.path.join(CGROUP_ROOT, "cpu.stat")) or "").splitlines():
+                key, _, value = line.partition(" ")
+                if key == "usage_usec":
+                    return int(value) / 1e6
+        else:
+            usage = _read_int(os.path.join(CGROUP_ROOT, "cpuacct", "cpuacct.usage"))
+            if usage is not None:
+                return usage / 1e9
+        # Without cgroup accounting, use the CPU time of all processes of the system
+        fields = (_read("/proc/stat") or "cpu 0").splitlines()[0].split()[1:]
+        busy = sum(int(v) for i, v in enumerate(fields) if i not in (3, 4))  # Exclude idle and iowait
+        return busy / os.sysconf("SC_CLK_TCK")
+
+    def _cpu_limit(self) -> Optional[float]:
+        if self.cgroup_v2:
+            quota, _, period = (_read(os.path.join(CGROUP_ROOT, "cpu.max")) or "max").partition(" ")
+            if quota == "max" or not period:
+                return None
+            return int(quota) / int(period)
+        quota = _read_int(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_quota_us"))
+        period = _read_int(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_period_us"))
+        if not quota or quota < 0 or not period:
+            return None
+        return quota / period
+
+    def _memory(self) -> tuple:
+        if self.cgroup_v2:
+            used = _read_int(os.path.join(CGROUP_ROOT, "memory.current"))
+            limit = _read_int(os.path.join(CGROUP_ROOT, "memory.max"))
+        else:
+            used = _read_int(os.path.join(CGROUP_ROOT, "memory", "memory.usage_in_bytes"))
+            limit = _read_int(os.path.join(CGROUP_ROOT, "memory", "memory.limit_in_bytes"))
+            # An unlimited cgroup v1 reports a huge page-aligned number
+            if limit is not None and limit >= 1 << 62:
+                limit = None
+        if used is None:
+            meminfo = {}
+            for line in (_read("/proc/meminfo") or "").splitlines():
+                key, _, value = line.partition(":")
+                meminfo[key] = int(value.split()[0]) * 1024
+            used = meminfo.get("MemTotal", 0) - meminfo.get("MemAvailable", 0)
+        return used, limit
+
+    def _pids(self) -> tuple:
+        if self.cgroup_v2:
+            limit = _read_int(os.path.join(CGROUP_ROOT, "pids.max"))
+        else:
+            limit = _read_int(os.path.join(CGROUP_ROOT, "pids", "pids.max"))
+        count = sum(1 for entry in os.listdir("/proc") if entry.isdigit())
+        return count, limit
+
+    def _collect(self) -> ResourceStats:
+        cpu_seconds = self._cpu_usage_seconds()
+        now = time.monotonic()
+        cpu_percent = None
+        if self._last_sample and now > self._last_sample[1]:
+            cpu_percent = round((cpu_seconds - self._last_sample[0]) / (now - self._last_sample[1]) * 100, 1)
+        self._last_sample = (cpu_seconds, now)
+
+        memory_used, memory_limit = self._memory()
+        disk = shutil.disk_usage("/")
+        process_count, pids_limit = self._pids()
+        return ResourceStats(
+            cpu_usage_seconds=round(cpu_seconds, 3),
+            cpu_percent=cpu_percent,
+            cpu_limit=self._cpu_limit(),
+            memory_used_bytes=memory_used,
+            memory_limit_bytes=memory_limit,
+            disk_used_bytes=disk.used,
+            disk_total_bytes=disk.total,
+            process_count=process_count,
+            pids_limit=pids_limit
+        )
+
+    async def get_stats(self) -> ResourceStats:
+        """
+        Asynchronously collect resource usage
+        """
+        return await asyncio.to_thread(self._collect)
+
+
+# Global instance
+stats_service = StatsService()
@@ -41,7 +41,8 @@ class SupervisorService:
     """
     def __init__(self):
         self.rpc_url = "/tmp/supervisor.sock"
-        self._connect_rpc()
+        # Connected on first use, so the API can be imported and started without supervisord
+        self._server = None
         
         # Timeout management - enabled based on configuration
         self.timeout_active = settings.SERVICE_TIMEOUT_MINUTES is not None
@@ -53,15 +54,23 @@ class SupervisorService:
             self.shutdown_time = datetime.now() + timedelta(minutes=settings.SERVICE_TIMEOUT_MINUTES)
             self._setup_timer(settings.SERVICE_TIMEOUT_MINUTES)
     
+    @property
+    def server(self) -> xmlrpc.client.ServerProxy:
+        """supervisord RPC proxy, connecting on first access"""
+        if self._server is None:
+            self._connect_rpc()
+        return self._server
+
     def _connect_rpc(self):
         """Connect to supervisord's RPC interface"""
         try:
-            self.server = xmlrpc.client.ServerProxy(
+            server = xmlrpc.client.ServerProxy(
                 'http://localhost',
                 transport=UnixStreamTransport(self.rpc_url)
             )
             # Test connection
-            self.server.supervisor.getState()
+            server.supervisor.getState()
+            self._server = server
         except Exception as e:
             raise ResourceNotFoundException(f"Cannot connect to Supervisord: {str(e)}")
     
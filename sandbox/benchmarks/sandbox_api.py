@@ -0,0 +1,178 @@
+"""
+Sandbox API micro-benchmark
+
+Calls the shell and file endpoints of the sandbox FastAPI app in-process, through the full ASGI
+stack without a server or HTTP client, on files in a temporary directory. Reports latency,
+throughput and RSS growth of each scenario, so regressions in the ShellService and FileService
+hot paths show up before deploy.
+
+Usage (from the sandbox directory):
+    python -m benchmarks.sandbox_api [--sizes 1K,64K,1M,16M] [--iterations 20] [--sessions 1,8,32]
+
+File sizes go up to 1G (--sizes 1K,1M,1G), which needs several GB of memory since the content
+travels in JSON requests and responses.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+from app.main import app
+
+SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+# Bytes moved per size before the iterations of a size are cut down
+MAX_BYTES_PER_SIZE = 256 * 1024 ** 2
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().upper()
+    if value[-1] in SIZE_UNITS:
+        return int(float(value[:-1]) * SIZE_UNITS[value[-1]])
+    return int(value)
+
+
+def rss_mb() -> float:
+    """Current RSS in MB, falling back to the peak RSS where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def post(path: str, payload: Dict[str, Any]) -> Tuple[int, int]:
+    """Send a JSON POST request to the app, returning the status code and response size"""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status, size = 0, 0
+
+    async def receive() -> Dict[str, Any]:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+def report(name: str, latencies: List[float], moved_bytes: int, rss_before: float, errors: int = 0) -> None:
+    total = sum(latencies)
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    throughput = f"{moved_bytes / total / 1024 ** 2:9.1f} MB/s" if moved_bytes else f"{len(latencies) / total:9.0f} op/s"
+    print(f"  {name:<28} p50 {statistics.median(latencies) * 1e3:9.2f} ms  p95 {p95 * 1e3:9.2f} ms  "
+          f"{throughput}  RSS {rss_mb() - rss_before:+7.1f} MB" + (f"  errors {errors}" if errors else ""))
+
+
+async def timed(path: str, payload: Dict[str, Any]) -> Tuple[float, int, int]:
+    start = time.perf_counter()
+    status, size = await post(path, payload)
+    return time.perf_counter() - start, status, size
+
+
+async def bench_files(directory: str, args: argparse.Namespace) -> None:
+    print("file endpoints:")
+    for size in args.sizes:
+        label = next((f"{size // unit}{name}" for name, unit in reversed(SIZE_UNITS.items()) if size % unit == 0), str(size))
+        iterations = max(1, min(args.iterations, MAX_BYTES_PER_SIZE // size))
+        path = os.path.join(directory, f"file_{label}.txt")
+        line = "The quick brown fox jumps over the lazy dog 0123456789\n"
+        content = (line * (size // len(line) + 1))[:size]
+
+        for endpoint, payload, moved in (
+            ("write", {"file": path, "content": content}, size),
+            ("read", {"file": path}, size),
+            ("search", {"file": path, "regex": "lazy cat"}, size),
+        ):
+            rss_before = rss_mb()
+            results = [await timed(f"/api/v1/file/{endpoint}", payload) for _ in range(iterations)]
+            report(f"/file/{endpoint} {label}", [r[0] for r in results], moved * iterations, rss_before,
+                   sum(1 for r in results if r[1] != 200))
+        os.unlink(path)
+        del content
+
+    tree = os.path.join(directory, "tree")
+    for i in range(args.find_files):
+        subdirectory = os.path.join(tree, f"dir_{i % 50}")
+        os.makedirs(subdirectory, exist_ok=True)
+        open(os.path.join(subdirectory, f"file_{i}.{'py' if i % 10 == 0 else 'txt'}"), "w").close()
+    rss_before = rss_mb()
+    results = [await timed("/api/v1/file/find", {"path": tree, "glob": "**/*.py"}) for _ in range(args.iterations)]
+    report(f"/file/find {args.find_files} files", [r[0] for r in results], 0, rss_before,
+           sum(1 for r in results if r[1] != 200))
+
+
+async def bench_shell(directory: str, args: argparse.Namespace) -> None:
+    print("shell endpoints:")
+    for name, command in (("echo", "echo hello"),
+                          (f"{args.output_lines} output lines", f"seq 1 {args.output_lines}")):
+        rss_before = rss_mb()
+        results = [await timed("/api/v1/shell/exec", {"id": "bench", "exec_dir": directory, "command": command})
+                   for _ in range(args.iterations)]
+        report(f"/shell/exec {name}", [r[0] for r in results], 0, rss_before, sum(1 for r in results if r[1] != 200))
+        rss_before = rss_mb()
+        results = [await timed("/api/v1/shell/view", {"id": "bench"}) for _ in range(args.iterations)]
+        report(f"/shell/view {name}", [r[0] for r in results], sum(r[2] for r in results), rss_before,
+               sum(1 for r in results if r[1] != 200))
+
+    print("concurrent shell sessions:")
+    for sessions in args.sessions:
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            timed("/api/v1/shell/exec", {"id": f"session-{i}", "exec_dir": directory, "command": "seq 1 1000"})
+            for i in range(sessions)
+        ])
+        elapsed = time.perf_counter() - start
+        report(f"/shell/exec x{sessions}", [r[0] for r in results], 0, rss_before, sum(1 for r in results if r[1] != 200))
+        print(f"  {'':<28} {sessions / elapsed:.0f} commands/s in total")
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="sandbox-bench-") as directory:
+        await bench_files(directory, args)
+        await bench_shell(directory, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda value: [parse_size(size) for size in value.split(",")],
+                        default=[parse_size(size) for size in ("1K", "64K", "1M", "16M")],
+                        help="Comma separated file sizes, e.g. 1K,1M,1G")
+    parser.add_argument("--iterations", type=int, default=20, help="Requests per scenario")
+    parser.add_argument("--sessions", type=lambda value: [int(n) for n in value.split(",")], default=[1, 8, 32],
+                        help="Comma separated numbers of concurrent shell sessions")
+    parser.add_argument("--output-lines", type=int, default=100000, help="Output lines of the output-heavy command")
+    parser.add_argument("--find-files", type=int, default=5000, help="Files in the tree searched by /file/find")
+    args = parser.parse_args()
+    # Keep the per-request logs of the app out of the report
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()